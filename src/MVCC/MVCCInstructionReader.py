@@ -1,18 +1,60 @@
 from cores.InstructionReader import InstructionReader, InstructionLine, InstructionType
 from cores.Instruction import Instruction
-from MVCC.instructions import MVCCReadInstruction, MVCCWriteInstruction, MVCCCommitInstruction
+from MVCC.instructions import MVCCReadInstruction, MVCCWriteInstruction, MVCCCommitInstruction, MVCCReadAsOfInstruction, MVCCSnapshotReadInstruction
 from cores.exceptions import InvalidInstructionLineException
 from MVCC.VersionController import VersionController
 
 class MVCCInstructionReader(InstructionReader):
-    def __init__(self, file_path: str, version_controller: VersionController) -> None:
-        super().__init__(file_path)
+    def __init__(
+            self,
+            file_path: str,
+            version_controller: VersionController,
+            bulk: bool = False,
+            detect_read_only: bool = False
+        ) -> None:
+
+        # detect_read_only reads the schedule once beforehand, so reads of transactions that never write read a committed snapshot
+        super().__init__(file_path, bulk)
         self.__version_controller = version_controller
+        self.__writer_ids = self.__find_writer_ids(file_path, bulk) if detect_read_only else None
+
+    def __find_writer_ids(self, file_path: str, bulk: bool) -> set[str]:
+        # RETURN ID OF EVERY TRANSACTION THAT WRITES IN THE SCHEDULE
+        writer_ids: set[str] = set()
+        source = self._open_source(file_path, bulk)
+
+        try:
+            while True:
+                instruction_line = source.next_line()
+
+                if (instruction_line.instruction_type == InstructionType.W):
+                    writer_ids.add(instruction_line.transaction_id)
+
+        except (EOFError, InvalidInstructionLineException):
+            # Invalid line is reported again when the schedule itself reaches it
+            pass
+
+        finally:
+            source.close()
+
+        return writer_ids
+
+    def is_read_only(self, transaction_id: str) -> bool:
+        # CHECK IF TRANSACTION IS KNOWN TO NEVER WRITE
+        return self.__writer_ids is not None and transaction_id not in self.__writer_ids
 
     def _get_instruction_from_line(self, instruction_line: InstructionLine) -> Instruction:
         type = instruction_line.instruction_type
 
-        if (type == InstructionType.R):
+        if ((type == InstructionType.R or type == InstructionType.U) and self.is_read_only(instruction_line.transaction_id)):
+            return MVCCSnapshotReadInstruction(
+                instruction_line.transaction_id,
+                self.__version_controller,
+                instruction_line.resource_id
+            )
+
+        # Update instruction only hints a later write to lock based managers, here it is a plain read
+        if (type == InstructionType.R or type == InstructionType.U):
             return MVCCReadInstruction(
                 instruction_line.transaction_id,
                 self.__version_controller,
@@ -27,6 +69,15 @@ class MVCCInstructionReader(InstructionReader):
                 instruction_line.update_value
             )
 
+        elif (type == InstructionType.A):
+            # Timestamp of read as of instruction is kept as its update value
+            return MVCCReadAsOfInstruction(
+                instruction_line.transaction_id,
+                self.__version_controller,
+                instruction_line.resource_id,
+                instruction_line.update_value
+            )
+
         elif (type == InstructionType.C):
             return MVCCCommitInstruction(
                 instruction_line.transaction_id,
@@ -1,11 +1,32 @@
-from cores.transactions import DynamicTimestampTransaction
+from cores.transactions import DynamicTimestampTransaction, TransactionStatus
 
 class MVCCTransaction(DynamicTimestampTransaction):
     def __init__(self, id: str) -> None:
         super().__init__(id)
+        # Read-only transaction reads committed versions as of its snapshot timestamp instead of its own timestamp
+        self.__snapshot_timestamp: int | None = None
 
-    def get_timestamp(self) -> float:
+    def get_timestamp(self) -> int:
         return self._get_timestamp()
+
+    def set_snapshot_timestamp(self, snapshot_timestamp: int):
+        self.__snapshot_timestamp = snapshot_timestamp
+
+    def get_snapshot_timestamp(self) -> int | None:
+        return self.__snapshot_timestamp
+
+    def is_read_only(self) -> bool:
+        return self.__snapshot_timestamp is not None
+
+    def is_waiting(self) -> bool:
+        return self._get_status() == TransactionStatus.WAITING
+
+    def wait(self):
+        self._set_status(TransactionStatus.WAITING)
+
+    def resume(self):
+        # Unlike reset_status, resuming keeps the timestamp because nothing was rolled back
+        self._set_status(TransactionStatus.GOING)
     
 class MVCCTransactionContainer:
     def __init__(self, transaction: MVCCTransaction) -> None:
@@ -14,5 +35,8 @@ class MVCCTransactionContainer:
     def get_id(self) -> str:
         return self.__transaction.get_id()
     
-    def get_timestamp(self) -> float:
+    def get_timestamp(self) -> int:
         return self.__transaction.get_timestamp()
+
+    def get_snapshot_timestamp(self) -> int | None:
+        return self.__transaction.get_snapshot_timestamp()
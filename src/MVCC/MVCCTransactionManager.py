@@ -1,10 +1,18 @@
 from cores.TransactionManager import TransactionManager
+from cores.clocks import Clock
+from cores.Timestamp import TimeStamp
+from cores.WaitQueue import WaitQueue
+from cores.LogWriter import LogLevel
+from durability.WriteAheadLog import WriteAheadLog
+from durability.commits import DurableCommitQueue
 from MVCC.MVCCInstructionReader import MVCCInstructionReader
 from cores.Instruction import Instruction, InstructionType
 from MVCC.VersionController import VersionController
 from collections import deque
 from MVCC.MVCCTransaction import MVCCTransaction, MVCCTransactionContainer
-from MVCC.exceptions import ForbiddenTimestampWriteException
+from MVCC.exceptions import ForbiddenTimestampWriteException, UncommittedVersionReadException, CollectedVersionReadException
+from MVCC.cascades import CascadeStatistics
+from MVCC.instructions import MVCCCommitInstruction
 
 class TransactionInfo:
     def __init__(self, transaction: MVCCTransaction) -> None:
@@ -15,19 +23,54 @@ class MVCCTransactionManager(TransactionManager):
 
     # CORRECT ASSUMPTION:
 
-    # 1. MVTO doesn't ensure recoverability and cascadelessness
+    # 1. MVTO doesn't ensure recoverability and cascadelessness, unless cascadeless mode makes reads of uncommitted versions wait
     # 2. Starvation because of rollback is impossible since every instructions from rolled-back transaction will be prioritized and might commit (if last instruction of the rolled-back transaction is accepted) before new instructions are processed. (Note that it only starve if instructions of the transaction never end [infinite instructions].)
 
-    def __init__(self, file_path: str) -> None:
-
-        self.__version_controller = VersionController()
-        instruction_reader = MVCCInstructionReader(file_path, self.__version_controller)
-
-        super().__init__(instruction_reader)
+    def __init__(
+            self,
+            file_path: str,
+            clock: Clock | None = None,
+            bulk_read: bool = False,
+            write_ahead_log: WriteAheadLog | None = None,
+            gc_step_size: int | None = None,
+            retention_window: int = 0,
+            detect_read_only: bool = False,
+            cascadeless: bool = False
+        ) -> None:
+
+        # write_ahead_log records versions of every committed transaction, caller closes it after the run
+        # gc_step_size is number of versions garbage collection may remove after each commit, None keeps every version
+        if (gc_step_size is not None and gc_step_size < 1):
+            raise ValueError("Garbage collection step size must be at least 1")
+
+        # retention_window is number of timestamps before the current one that stay readable as of, garbage collection keeps their versions
+        if (retention_window < 0):
+            raise ValueError("Retention window must not be negative")
+
+        # detect_read_only makes transactions that never write read a committed snapshot, without read timestamps or cascades
+        # cascadeless makes read of version that is not committed wait until its creator commits or aborts, so rollback never cascades
+
+        self.__gc_step_size = gc_step_size
+        self.__retention_window = retention_window
+        self.__version_controller = VersionController(write_ahead_log, cascadeless)
+        self.__instruction_reader = MVCCInstructionReader(file_path, self.__version_controller, bulk_read, detect_read_only)
+
+        super().__init__(self.__instruction_reader, clock)
 
         self.__transactions: dict[str, TransactionInfo] = {}
+        # Transactions that have not committed yet, the oldest floor among them is the garbage collection watermark
+        self.__active_transactions: dict[str, MVCCTransaction] = {}
         self.__rollback_queue: deque[list[Instruction]] = deque()
         self.__done_instruction: dict[str, list[Instruction]] = {}
+        # Transactions aborted without restart because replaying them would fail the same way, their later instructions are ignored
+        self.__failed_transaction_ids: set[str] = set()
+
+        # Map creator transaction id to transactions waiting to read its versions, waiting always goes from younger to older transaction so it can not deadlock
+        self.__wait_queue = WaitQueue()
+        self.__waiting_transaction_ids: dict[str, list[str]] = {}
+        self.__resumable_transaction_ids: deque[str] = deque()
+        self.__cascade_statistics = CascadeStatistics()
+        self.__durable_commits: DurableCommitQueue[MVCCCommitInstruction] = DurableCommitQueue(write_ahead_log)
     
     def __add_to_done_list(self, instruction: Instruction) -> bool:
         # ADD INSTRUCTION TO DONE LIST FOR ROLLBACK PURPOSE
@@ -43,11 +86,37 @@ class MVCCTransactionManager(TransactionManager):
     def __is_commit_instruction(self, instruction: Instruction) -> bool:
         return instruction.get_transaction_type() == InstructionType.C
     
-    def __handle_after_commit(self, instruction: Instruction) -> bool:
-        # CLEAR DATA OF TRANSACTION AFTER COMMIT IF NECESSARY
+    def __handle_after_commit(self, instruction: MVCCCommitInstruction):
+        # ACKNOWLEDGE LOGGED COMMIT RIGHT AWAY IF ITS RECORD IS ALREADY DURABLE, OTHERWISE WAIT FOR THE LOG
         transaction_id = instruction.get_transaction_id()
+        commit_lsn = instruction.get_commit_lsn()
+        self.__transactions[transaction_id].transaction.start_commit()
+
+        if (self.__durable_commits.is_durable(commit_lsn)):
+            self.__acknowledge_commit(instruction)
+
+        else:
+            self._console_log("Transaction", transaction_id, "waits until its commit record is durable")
+            self.__durable_commits.append(commit_lsn, instruction)
+
+    def __acknowledge_commit(self, instruction: MVCCCommitInstruction):
+        # CLEAR DATA OF TRANSACTION WHOSE COMMIT RECORD IS DURABLE AND RESUME TRANSACTIONS WAITING FOR ITS VERSIONS
+        transaction_id = instruction.get_transaction_id()
+        instruction.acknowledge()
+        self.get_statistics().add_commit()
         self.__transactions[transaction_id].transaction.commit()
+        self.__active_transactions.pop(transaction_id, None)
         self.__done_instruction.pop(transaction_id)
+        self.__release_waiting_transactions(transaction_id)
+
+        # Watermark can only move when a transaction commits, so collection runs only then
+        if (self.__gc_step_size is not None):
+            self.__version_controller.collect_garbage(self.__get_watermark(), self.__gc_step_size)
+
+    def __acknowledge_durable_commits(self, force: bool = False):
+        # ACKNOWLEDGE EVERY COMMIT WHOSE RECORD IS DURABLE, FORCE FLUSHES THE LOG FIRST
+        for instruction in self.__durable_commits.pop_durable(force):
+            self.__acknowledge_commit(instruction)
 
     def __execute_instruction(self, instruction: Instruction):
         transaction_id = instruction.get_transaction_id()
@@ -61,8 +130,29 @@ class MVCCTransactionManager(TransactionManager):
         # ADD TRANSACTION TO ROLLBACK-QUEUE
         done_instructions = self.__done_instruction.pop(transaction_id, [])
         self._console_log("Transaction", transaction_id, "is aborting")
+        self.get_statistics().add_abort()
         self.__rollback_queue.append(done_instructions)
         self.__transactions[transaction_id].transaction.roll_back()
+        self.__release_waiting_transactions(transaction_id)
+
+    def __abort_without_restart(self, instruction: Instruction, exception: Exception):
+        # ABORT TRANSACTION OF INSTRUCTION FOR GOOD AND ROLL BACK TRANSACTIONS THAT READ ITS VERSIONS
+        transaction_id = instruction.get_transaction_id()
+        self._console_log(f"[ Failed executing {instruction}: {exception}, aborting transaction without restart ]")
+
+        cascading_ids = self.__version_controller.cascade_rollback(transaction_id)
+        transaction_ids = [cascading_id for level_ids in cascading_ids for cascading_id in level_ids]
+        self.__cascade_statistics.add_rollback(len(cascading_ids) - 1, len(transaction_ids) - 1)
+
+        self.__done_instruction.pop(transaction_id, None)
+        self.__failed_transaction_ids.add(transaction_id)
+        self.__active_transactions.pop(transaction_id, None)
+        self.get_statistics().add_abort()
+        self.__transactions[transaction_id].transaction.roll_back()
+        self.__release_waiting_transactions(transaction_id)
+
+        self.__abort_all(transaction_ids[1:])
+        self.__process_rollback()
 
     def __abort_all(self, transaction_ids: list[str]):
         # ADD LIST OF TRANSACTION TO ROLLBACK-QUEUE
@@ -76,7 +166,40 @@ class MVCCTransactionManager(TransactionManager):
         transaction_id = instructions[0].get_transaction_id()
         self.__transactions[transaction_id].transaction.reset_status()
         self._console_log("Trying to rollback transaction", instructions[0].get_transaction_id())
+        self.get_statistics().add_restart()
+        self.__cascade_statistics.add_replayed_instructions(len(instructions))
         return instructions
+
+    def __wait(self, instruction: Instruction):
+        # ADD INSTRUCTION TO WAIT-QUEUE
+        self.__wait_queue.append(instruction)
+        self.get_statistics().record_wait_queue_size(len(self.__wait_queue))
+        self.__transactions[instruction.get_transaction_id()].transaction.wait()
+        self._console_log("Instruction", instruction, "entered wait-queue")
+
+    def __wait_for_creator(self, instruction: Instruction, creator_transaction_id: str):
+        # ADD INSTRUCTION TO WAIT-QUEUE UNTIL CREATOR OF THE VERSION IT READS ENDS
+        self.__waiting_transaction_ids.setdefault(creator_transaction_id, []).append(instruction.get_transaction_id())
+        self.__cascade_statistics.add_read_wait()
+        self.__wait(instruction)
+
+    def __release_waiting_transactions(self, creator_transaction_id: str):
+        # MARK TRANSACTIONS WAITING FOR CREATOR TO BE RESUMED AFTER THE CURRENT INSTRUCTION
+        self.__resumable_transaction_ids.extend(self.__waiting_transaction_ids.pop(creator_transaction_id, []))
+
+    def __process_wait(self):
+        # RESUME WAITING TRANSACTIONS WHOSE CREATOR HAS ENDED
+        # If transaction waits again, the rest of its instructions go back to wait-queue in order
+        while (len(self.__resumable_transaction_ids) > 0):
+            transaction_id = self.__resumable_transaction_ids.popleft()
+            instructions = self.__wait_queue.pop_transaction(transaction_id)
+            self.__transactions[transaction_id].transaction.resume()
+
+            for instruction in instructions:
+                self._console_log("Instruction", instruction, "leave wait-queue")
+
+            for instruction in instructions:
+                self.__process_single_instruction(instruction, handle_rollback=True)
     
     def __process_rollback(self):
         # EXECUTE ALL ROLLBACK INSTRUCTIONS
@@ -92,22 +215,39 @@ class MVCCTransactionManager(TransactionManager):
             handle_rollback: bool = False
         ):
         # EXECUTE INSTRUCTION AND HANDLE ROLLBACK IF FAIL
+        transaction_id = instruction.get_transaction_id()
+
+        if (transaction_id in self.__failed_transaction_ids):
+            self._console_log("[ Transaction", transaction_id, "was aborted, ignoring", instruction, "]")
+            return
+
+        if (self.__transactions[transaction_id].transaction.is_waiting()):
+            self._console_log("[ Transaction", transaction_id, "is waiting for previous instructions ]")
+            self.__wait(instruction)
+            return
 
         try:
             self.__execute_instruction(instruction)
 
+        except UncommittedVersionReadException as e:
+            self.__wait_for_creator(instruction, e.get_creator_transaction_id())
+
+        except CollectedVersionReadException as e:
+            # Read as of has a fixed timestamp, so restarting the transaction can not make the versions come back
+            self.__abort_without_restart(instruction, e)
 
         except ForbiddenTimestampWriteException as e:
 
             if (not handle_rollback):
                 raise e
             
-            transaction_id = instruction.get_transaction_id()
             self._console_log(
                 f"[ Failed executing {instruction}, starting cascading rollback ]"
             )
             self.__add_to_done_list(instruction)
-            transaction_ids = self.__version_controller.cascade_rollback(transaction_id)
+            cascading_ids = self.__version_controller.cascade_rollback(transaction_id)
+            transaction_ids = [cascading_id for level_ids in cascading_ids for cascading_id in level_ids]
+            self.__cascade_statistics.add_rollback(len(cascading_ids) - 1, len(transaction_ids) - 1)
             self.__abort_all(transaction_ids)
             self.__process_rollback()
 
@@ -116,14 +256,51 @@ class MVCCTransactionManager(TransactionManager):
         transaction_id = instruction.get_transaction_id()
         if (self.__transactions.get(transaction_id) == None):
             transaction = MVCCTransaction(transaction_id)
+
+            if (self.__instruction_reader.is_read_only(transaction_id)):
+                # Every transaction up to the oldest floor has committed, so versions at or below it are final
+                transaction.set_snapshot_timestamp(self.__get_oldest_floor())
+
             self.__transactions[transaction_id] = TransactionInfo(transaction)
+            self.__active_transactions[transaction_id] = transaction
             
         self.__process_single_instruction(instruction, handle_rollback=True)
 
+        # Group commit delay may have passed even if nothing was logged
+        self.__acknowledge_durable_commits()
+        self.__process_wait()
+
+    def get_cascade_statistics(self) -> CascadeStatistics:
+        return self.__cascade_statistics
+
+    def __get_floor(self, transaction: MVCCTransaction) -> int:
+        # Transaction never reads a version older than the newest committed one at or below its floor
+        # Read-only transaction reads as of its snapshot, other transaction may still write at its own timestamp
+        if (transaction.is_read_only()):
+            return transaction.get_snapshot_timestamp()
+
+        return transaction.get_timestamp() - 1
+
+    def __get_oldest_floor(self) -> int:
+        # Transaction that has not started yet gets a timestamp larger than the current one
+        return min(
+            (self.__get_floor(transaction) for transaction in self.__active_transactions.values()),
+            default=TimeStamp.current()
+        )
+
+    def __get_watermark(self) -> int:
+        # Versions inside the retention window are kept for reads as of
+        return min(self.__get_oldest_floor(), TimeStamp.current() - self.__retention_window)
+
     def _get_next_remaining_instruction(self) -> Instruction | None:
         return None
     
     def _is_finish_or_stop(self) -> bool:
+        # No more instruction will come, so buffered commits are forced to disk and their waiting readers resumed
+        while (len(self.__durable_commits) > 0):
+            self.__acknowledge_durable_commits(force=True)
+            self.__process_wait()
+
         return True
     
     def __print_transaction_status(self, transaction: MVCCTransaction):
@@ -133,6 +310,9 @@ class MVCCTransactionManager(TransactionManager):
         if (transaction.is_committed()):
             status_str = "finished"
 
+        elif (transaction.get_id() in self.__failed_transaction_ids):
+            status_str = "aborted"
+
         else:
             status_str = "still going"
 
@@ -153,4 +333,26 @@ class MVCCTransactionManager(TransactionManager):
         for transaction_info in transactions:
             self.__print_transaction_status(transaction_info.transaction)
 
+        for instruction in self.__wait_queue:
+            self._console_log("Instruction", instruction, "is in wait-queue")
+
+        cascade_statistics = self.__cascade_statistics
+
+        self._console_log(
+            "Rollback happened", cascade_statistics.get_rollback_count(), "times with cascade depth up to",
+            cascade_statistics.get_max_cascade_depth(), "aborting", cascade_statistics.get_cascaded_transaction_count(),
+            "more transactions,", cascade_statistics.get_replayed_instruction_count(), "instructions were replayed and",
+            cascade_statistics.get_read_wait_count(), "reads waited for uncommitted versions",
+            level=LogLevel.DEBUG
+        )
+
+        if (self.__gc_step_size is not None):
+            garbage_statistics = self.__version_controller.get_garbage_statistics()
+
+            self._console_log(
+                "Garbage collection removed", garbage_statistics.get_reclaimed_version_count(), "versions",
+                "(about", garbage_statistics.get_reclaimed_version_memory(), "bytes) in", garbage_statistics.get_step_count(), "steps,",
+                self.__version_controller.get_version_count(), "versions are kept"
+            )
+
         self.__version_controller.print_snapshot()
\ No newline at end of file
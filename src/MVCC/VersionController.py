@@ -1,63 +1,16 @@
 from cores.LogWriter import LogWriter
-from MVCC.exceptions import ForbiddenTimestampWriteException
-
-class ResourceVersion:
-    def __init__(
-            self, 
-            resource_id: str, 
-            transaction_id: str = "",
-            read_timestamp: float = 0, 
-            write_timestamp: float = 0, 
-            initial_value: int = 0
-        ) -> None:
-
-        self.__resource_id = resource_id
-        self.__transaction_id = transaction_id
-        self.__read_timestamp = read_timestamp
-        self.__write_timestamp = write_timestamp
-        self.__value = initial_value
-        self.__is_committed = False
-
-    def get_resource_id(self) -> str:
-        return self.__resource_id
-    
-    def get_transaction_id(self) -> str:
-        return self.__transaction_id
-    
-    def get_read_timestamp(self) -> float:
-        return self.__read_timestamp
-    
-    def get_write_timestamp(self) -> float:
-        return self.__write_timestamp
-    
-    def __update_read_timestamp(self, new_timestamp: float):
-        self.__read_timestamp = max(self.__read_timestamp, new_timestamp)
-
-    def get_value(self) -> int:
-        return self.__value
-    
-    def read(self, transaction_timestamp: float) -> int:
-        self.__update_read_timestamp(transaction_timestamp)
-        return self.__value
-    
-    def update(self, value: int) -> int:
-        old_value = self.__value
-        self.__value = value
-
-        return old_value
-    
-    def commit(self):
-        self.__is_committed = True
-
-    def is_committed(self) -> bool:
-        return self.__is_committed
+from MVCC.versions import ResourceVersion, VersionChain
+from MVCC.garbage import GarbageCollectionStatistics
+from MVCC.exceptions import ForbiddenTimestampWriteException, CollectedVersionReadException, UncommittedVersionReadException
+from durability.WriteAheadLog import WriteAheadLog
+from durability.Checkpoint import ResourceSnapshot
 
 class VersionController:
-    def __init__(self) -> None:
+    def __init__(self, write_ahead_log: WriteAheadLog | None = None, cascadeless: bool = False) -> None:
         # two data structure keeping the same data for read efficiency
 
-        # 1. Map resource id to list of resource versions related to that resource id 
-        self.__resource_versions: dict[str, list[ResourceVersion]] = {}
+        # 1. Map resource id to chain of resource versions related to that resource id, ordered by write timestamp
+        self.__resource_versions: dict[str, VersionChain] = {}
         # 2. Map transaction id to list of resource versions created to that transaction
         self.__transaction_versions: dict[str, list[ResourceVersion]] = {}
 
@@ -70,6 +23,22 @@ class VersionController:
 
         self.__log_writer = LogWriter("VERSION CONTROLLER")
 
+        # Cascadeless controller refuses reads of versions that are not committed, so no transaction ever has to be rolled back with another
+        self.__cascadeless = cascadeless
+
+        # Resource ids in creation order, garbage collection goes through them round robin from the position
+        self.__collection_resource_ids: list[str] = []
+        self.__collection_position = 0
+        # Largest watermark garbage collection has used, versions read as of older timestamps may be gone
+        self.__collection_horizon = 0
+        self.__garbage_statistics = GarbageCollectionStatistics()
+
+        # Versions are logged when their transaction commits, with write timestamp so recovery keeps the newest
+        self.__write_ahead_log = write_ahead_log
+
+        if (write_ahead_log is not None):
+            write_ahead_log.set_snapshot_source(self.get_checkpoint_snapshot)
+
     def __add_reader(self, creator_transaction_id: str, reader_transaction_id: str):
         readers = self.__version_readers.get(creator_transaction_id)
 
@@ -91,12 +60,13 @@ class VersionController:
     def __get_readers(self, creator_transaction_id: str) -> set[str]:
         return self.__version_readers.get(creator_transaction_id, set())
 
-    def __get_or_create_resource_versions_if_not_exist(self, resource_id: str) -> list[ResourceVersion]:
+    def __get_or_create_resource_versions_if_not_exist(self, resource_id: str) -> VersionChain:
         versions = self.__resource_versions.get(resource_id)
 
         if (versions is None):
-            versions = [ResourceVersion(resource_id)]
+            versions = VersionChain(ResourceVersion(resource_id))
             self.__resource_versions[resource_id] = versions
+            self.__collection_resource_ids.append(resource_id)
 
         return versions
     
@@ -109,23 +79,25 @@ class VersionController:
 
         return versions
     
-    def __get_less_or_equal_largest_version(self, resource_id: str, transaction_timestamp: float):
+    def __get_less_or_equal_largest_version(self, resource_id: str, transaction_timestamp: int):
         # Return version of resource_id whose write timestamp is the largest write timestamp less than or equal to specified timestamp
 
-        versions: list[ResourceVersion] = self.__get_or_create_resource_versions_if_not_exist(resource_id)
+        version = self.__get_or_create_resource_versions_if_not_exist(resource_id).find(transaction_timestamp)
 
-        for version in versions:
-            if (version.get_write_timestamp() <= transaction_timestamp):
-                return version
-            
-        raise Exception("Initial version not found")
+        if (version is None):
+            raise Exception("Initial version not found")
+
+        return version
     
-    def read(self, resource_id: str, transaction_id: str, transaction_timestamp: float) -> int:
+    def read(self, resource_id: str, transaction_id: str, transaction_timestamp: int) -> int:
         # Return value of suitable version and update its read-timestamp
         version = self.__get_less_or_equal_largest_version(resource_id, transaction_timestamp)
 
         creator_transaction_id = version.get_transaction_id()
 
+        if (self.__cascadeless and creator_transaction_id != transaction_id and not version.is_committed() and creator_transaction_id):
+            raise UncommittedVersionReadException(creator_transaction_id)
+
         # Record reading version history for cascading rollback purpose
         # Only added for version that is not committed yet and not created by the same transaction
         if (creator_transaction_id != transaction_id and not version.is_committed() and creator_transaction_id):
@@ -144,27 +116,52 @@ class VersionController:
 
         return value
     
-    def __insert_new_version(self, resource_id: str, transaction_id: str, transaction_timestamp: float, update_value: int):
-        # Create new version of resource
-        
-        version = ResourceVersion(resource_id, transaction_id, transaction_timestamp, transaction_timestamp, update_value)
-        versions = self.__get_or_create_resource_versions_if_not_exist(resource_id)
+    def read_as_of(self, resource_id: str, timestamp: int) -> int:
+        # RETURN VALUE OF NEWEST COMMITTED VERSION WITH WRITE TIMESTAMP LESS THAN OR EQUAL TO TIMESTAMP
+        # Read timestamp and readers are not updated, so the read never makes a writer abort or a cascade
+        if (timestamp < self.__collection_horizon):
+            raise CollectedVersionReadException()
 
-        insert_point = 0
+        versions = self.__resource_versions.get(resource_id)
 
-        for i in range(len(versions)):
-            if (versions[i].get_write_timestamp() > transaction_timestamp):
-                break
+        # Resource that was never accessed only has its initial value
+        if (versions is None):
+            return 0
 
-            insert_point = i
+        version = versions.find_committed(timestamp)
 
-        versions.insert(insert_point, version)
+        # Versions below the oldest kept one are gone, or the timestamp is before the initial version
+        if (version is None):
+            raise CollectedVersionReadException()
+
+        self.__log_writer.console_log(
+            "Version of resource",
+            resource_id,
+            "with write-timestamp",
+            version.get_write_timestamp(),
+            "is read as of",
+            timestamp,
+            "with value",
+            version.get_value()
+        )
+
+        return version.get_value()
+
+    def read_many_as_of(self, resource_ids: list[str], timestamp: int) -> dict[str, int]:
+        # READ MANY RESOURCES AS OF THE SAME TIMESTAMP
+        return {resource_id: self.read_as_of(resource_id, timestamp) for resource_id in resource_ids}
+
+    def __insert_new_version(self, resource_id: str, transaction_id: str, transaction_timestamp: int, update_value: int):
+        # Create new version of resource
+        
+        version = ResourceVersion(resource_id, transaction_id, transaction_timestamp, transaction_timestamp, update_value)
+        self.__get_or_create_resource_versions_if_not_exist(resource_id).insert(version)
         
         # write redundancy for read effiency
         transaction_versions = self.__get_or_create_transaction_versions_if_not_exist(transaction_id)
         transaction_versions.append(version)
 
-    def write(self, resource_id: str, transaction_id: str, transaction_timestamp: float, update_value: int):
+    def write(self, resource_id: str, transaction_id: str, transaction_timestamp: int, update_value: int):
         # WRITE VERSION AND RETURN OLD VALUE
 
         version = self.__get_less_or_equal_largest_version(resource_id, transaction_timestamp)
@@ -190,10 +187,11 @@ class VersionController:
             self.__log_writer.console_log(
                 "New version of resource", resource_id, "is created with timestamp", transaction_timestamp)
 
-    def __get_cascading_rollback_transaction_ids(self, rollback_transaction_id: str) -> list[str]:
-        # RETURN CASCADING READER OF EVERY VERSION BY CERTAIN TRANSACTION
+    def __get_cascading_rollback_transaction_ids(self, rollback_transaction_id: str) -> list[list[str]]:
+        # RETURN CASCADING READER OF EVERY VERSION BY CERTAIN TRANSACTION, LEVEL BY LEVEL
 
-        memo: dict[str, bool] = {}
+        # Transaction is marked once it is queued, so reader of several rolled-back versions is only added once
+        memo: dict[str, bool] = {rollback_transaction_id: True}
         cascading_ids = []
         new_ids = [rollback_transaction_id]
 
@@ -204,14 +202,14 @@ class VersionController:
 
             current_new_ids = new_ids
             new_ids = []
+            cascading_ids.append(current_new_ids)
 
             for id in current_new_ids:
-                cascading_ids.append(id)
-                memo[id] = True
                 reader_ids = self.__get_readers(id)
 
                 for new_reader_id in reader_ids:
                     if (not memo.get(new_reader_id)):
+                        memo[new_reader_id] = True
                         new_ids.append(new_reader_id)
 
         return cascading_ids
@@ -234,23 +232,25 @@ class VersionController:
             readers = self.__version_readers.get(reading)
 
             if (readers is not None):
-                readings.remove(transaction_id)
+                readers.discard(transaction_id)
 
         # Only pop the reader list and not the reading counterpart because it will also be removed in the cascading process
         return self.__version_readers.pop(transaction_id, set())
     
-    def cascade_rollback(self, transaction_id: str) -> list[str]:
+    def cascade_rollback(self, transaction_id: str) -> list[list[str]]:
         # REMOVE ALL VERSIONS AND DATA OF TRANSACTION THAT IS INVOLVED IN CASCADING ROLLBACK
-        # RETURN ALL TRANSACTIONS IN THAT CASCADING ROLLBACK
+        # RETURN ALL TRANSACTIONS IN THAT CASCADING ROLLBACK, FIRST LEVEL IS THE GIVEN TRANSACTION AND EACH NEXT ONE READ FROM THE PREVIOUS
 
         cascading_ids = self.__get_cascading_rollback_transaction_ids(transaction_id)
 
-        for cascading_id in cascading_ids:
-            self.__rollback(cascading_id)
+        for level_ids in cascading_ids:
+            for cascading_id in level_ids:
+                self.__rollback(cascading_id)
 
         return cascading_ids
     
-    def commit(self, transaction_id: str):
+    def commit(self, transaction_id: str) -> int | None:
+        # RETURN LSN OF COMMIT RECORD, NONE IF NOTHING IS LOGGED
         # Remove committed transaction from reading list so it can't be rolled-back when version creator initiate cascading rollback
         readings = self.__version_readings.pop(transaction_id, set())
 
@@ -265,7 +265,70 @@ class VersionController:
 
         # Commit version created by the transaction
         for version in self.__transaction_versions.get(transaction_id, []):
-            version.commit()
+            self.__resource_versions[version.get_resource_id()].commit(version)
+
+            if (self.__write_ahead_log is not None):
+                self.__write_ahead_log.log_update(
+                    transaction_id,
+                    version.get_resource_id(),
+                    self.__get_previous_version_value(version),
+                    version.get_value(),
+                    version.get_write_timestamp()
+                )
+
+        if (self.__write_ahead_log is not None):
+            return self.__write_ahead_log.log_commit(transaction_id)
+
+        return None
+
+    def __get_previous_version_value(self, version: ResourceVersion) -> int:
+        # RETURN VALUE OF VERSION WITH THE LARGEST WRITE TIMESTAMP BELOW THE GIVEN VERSION
+        previous_version = self.__resource_versions[version.get_resource_id()].get_previous(version)
+        return 0 if previous_version is None else previous_version.get_value()
+
+    def collect_garbage(self, watermark: int, step_size: int) -> int:
+        # REMOVE VERSIONS NO TRANSACTION CAN READ ANYMORE AND RETURN NUMBER OF REMOVED VERSIONS
+        # Watermark is the smallest timestamp among transactions that have not committed, one step visits
+        # at most step_size resources and removes at most step_size versions
+        resource_count = len(self.__collection_resource_ids)
+        self.__collection_horizon = max(self.__collection_horizon, watermark)
+        removed_versions: list[ResourceVersion] = []
+
+        for _ in range(min(step_size, resource_count)):
+            if (len(removed_versions) >= step_size):
+                break
+
+            if (self.__collection_position >= resource_count):
+                self.__collection_position = 0
+
+            resource_id = self.__collection_resource_ids[self.__collection_position]
+            self.__collection_position += 1
+
+            removed_versions.extend(self.__resource_versions[resource_id].prune(watermark, step_size - len(removed_versions)))
+
+        self.__garbage_statistics.add_step(removed_versions)
+
+        return len(removed_versions)
+
+    def get_collection_horizon(self) -> int:
+        # SMALLEST TIMESTAMP THAT CAN STILL BE READ AS OF
+        return self.__collection_horizon
+
+    def get_garbage_statistics(self) -> GarbageCollectionStatistics:
+        return self.__garbage_statistics
+
+    def get_version_count(self) -> int:
+        return sum(len(versions) for versions in self.__resource_versions.values())
+
+    def get_checkpoint_snapshot(self) -> ResourceSnapshot:
+        # RETURN VALUE AND WRITE TIMESTAMP OF NEWEST COMMITTED VERSION OF EVERY RESOURCE
+        snapshot: ResourceSnapshot = {}
+
+        for resource_id, versions in self.__resource_versions.items():
+            newest_version = versions.get_newest_committed()
+            snapshot[resource_id] = (newest_version.get_value(), newest_version.get_write_timestamp())
+
+        return snapshot
 
     def __print_version(self, version: ResourceVersion):
         self.__log_writer.console_log(
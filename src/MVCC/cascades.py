@@ -0,0 +1,48 @@
+class CascadeStatistics:
+    # Work caused by rollbacks of MVCC transactions, so cascading and cascadeless mode can be compared
+
+    def __init__(self) -> None:
+        self.__rollback_count = 0
+        self.__cascaded_transaction_count = 0
+        self.__max_cascade_depth = 0
+        self.__replayed_instruction_count = 0
+        self.__read_wait_count = 0
+
+    def add_rollback(self, cascade_depth: int, cascaded_transaction_count: int):
+        # Depth 0 is a rollback that aborted only the failed transaction
+        self.__rollback_count += 1
+        self.__cascaded_transaction_count += cascaded_transaction_count
+        self.__max_cascade_depth = max(self.__max_cascade_depth, cascade_depth)
+
+    def add_replayed_instructions(self, instruction_count: int):
+        self.__replayed_instruction_count += instruction_count
+
+    def add_read_wait(self):
+        self.__read_wait_count += 1
+
+    def get_rollback_count(self) -> int:
+        # NUMBER OF FAILED WRITES THAT STARTED A ROLLBACK
+        return self.__rollback_count
+
+    def get_cascaded_transaction_count(self) -> int:
+        # NUMBER OF TRANSACTIONS ABORTED ONLY BECAUSE THEY READ A ROLLED-BACK VERSION
+        return self.__cascaded_transaction_count
+
+    def get_max_cascade_depth(self) -> int:
+        return self.__max_cascade_depth
+
+    def get_replayed_instruction_count(self) -> int:
+        return self.__replayed_instruction_count
+
+    def get_read_wait_count(self) -> int:
+        # NUMBER OF READS THAT WAITED FOR THE CREATOR OF A VERSION TO END
+        return self.__read_wait_count
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "rollbacks": self.__rollback_count,
+            "cascaded_transactions": self.__cascaded_transaction_count,
+            "max_cascade_depth": self.__max_cascade_depth,
+            "replayed_instructions": self.__replayed_instruction_count,
+            "read_waits": self.__read_wait_count
+        }
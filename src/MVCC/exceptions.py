@@ -2,3 +2,17 @@ class ForbiddenTimestampWriteException(Exception):
     def __init__(self, 
                  message="Resource to be written has read timestamp that is larger than transaction timestamp"):
         super().__init__(message)
+
+class CollectedVersionReadException(Exception):
+    def __init__(self,
+                 message="Versions at the timestamp to be read were already removed by garbage collection"):
+        super().__init__(message)
+
+class UncommittedVersionReadException(Exception):
+    def __init__(self, creator_transaction_id: str, message="Version to be read is not committed yet"):
+        self.__creator_transaction_id = creator_transaction_id
+        super().__init__(message)
+
+    def get_creator_transaction_id(self) -> str:
+        # TRANSACTION THAT CREATED THE VERSION AND HAS TO END BEFORE IT CAN BE READ
+        return self.__creator_transaction_id
@@ -0,0 +1,36 @@
+import sys
+from MVCC.versions import ResourceVersion
+
+def get_version_memory(version: ResourceVersion) -> int:
+    # ESTIMATE BYTES TAKEN BY VERSION OBJECT AND ITS ATTRIBUTES
+    return sys.getsizeof(version) + sys.getsizeof(vars(version))
+
+class GarbageCollectionStatistics:
+    # Counters of version garbage collection kept by version controller
+
+    def __init__(self) -> None:
+        self.__step_count = 0
+        self.__reclaimed_version_count = 0
+        self.__reclaimed_version_memory = 0
+
+    def add_step(self, reclaimed_versions: list[ResourceVersion]):
+        self.__step_count += 1
+        self.__reclaimed_version_count += len(reclaimed_versions)
+        self.__reclaimed_version_memory += sum(get_version_memory(version) for version in reclaimed_versions)
+
+    def get_step_count(self) -> int:
+        return self.__step_count
+
+    def get_reclaimed_version_count(self) -> int:
+        return self.__reclaimed_version_count
+
+    def get_reclaimed_version_memory(self) -> int:
+        # ESTIMATED BYTES OF VERSION OBJECTS THAT WERE DROPPED
+        return self.__reclaimed_version_memory
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "gc_steps": self.__step_count,
+            "reclaimed_versions": self.__reclaimed_version_count,
+            "reclaimed_version_memory": self.__reclaimed_version_memory
+        }
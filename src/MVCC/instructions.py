@@ -81,6 +81,51 @@ class MVCCReadInstruction(MVCCAccessInstruction):
         self._console_log("[ Transaction", transaction_id, "is reading on resource", resource_id, "]")
         version_controller.read(resource_id, transaction_id, transaction_timestamp)
 
+class MVCCSnapshotReadInstruction(MVCCAccessInstruction):
+    # Read of transaction that never writes, it reads committed versions as of the snapshot of its transaction
+
+    def get_transaction_type(self) -> InstructionType:
+        return InstructionType.R
+
+    def __str__(self) -> str:
+        return f"R({self._get_resource_id()}) from read-only transaction {self.get_transaction_id()}"
+
+    def execute(self, **kwargs):
+        transaction_id = self.get_transaction_id()
+        resource_id = self._get_resource_id()
+        snapshot_timestamp = self._get_transaction_container(**kwargs).get_snapshot_timestamp()
+        version_controller = self._get_version_controller()
+
+        self._console_log("[ Read-only transaction", transaction_id, "is reading on resource", resource_id, "]")
+        version_controller.read_as_of(resource_id, snapshot_timestamp)
+
+class MVCCReadAsOfInstruction(MVCCAccessInstruction):
+    def __init__(
+            self,
+            transaction_id: str,
+            version_controller: VersionController,
+            resource_id: str,
+            timestamp: int
+        ) -> None:
+
+        super().__init__(transaction_id, version_controller, resource_id)
+        self.__timestamp = timestamp
+
+    def get_transaction_type(self) -> InstructionType:
+        return InstructionType.A
+
+    def __str__(self) -> str:
+        return f"R({self._get_resource_id()} as of {self.__timestamp}) from transaction {self.get_transaction_id()}"
+
+    def execute(self, **kwargs):
+        transaction_id = self.get_transaction_id()
+        resource_id = self._get_resource_id()
+        version_controller = self._get_version_controller()
+
+        # Timestamp of the transaction is not used, reading committed history can not conflict with anything
+        self._console_log("[ Transaction", transaction_id, "is reading on resource", resource_id, "as of", self.__timestamp, "]")
+        version_controller.read_as_of(resource_id, self.__timestamp)
+
 class MVCCCommitInstruction(MVCCInstruction):
     def __init__(
             self, 
@@ -89,6 +134,7 @@ class MVCCCommitInstruction(MVCCInstruction):
         ) -> None:
 
         super().__init__(transaction_id, version_controller)
+        self.__commit_lsn: int | None = None
 
     def get_transaction_type(self) -> InstructionType:
         return InstructionType.C
@@ -97,6 +143,12 @@ class MVCCCommitInstruction(MVCCInstruction):
         return f"commit from transaction {self.get_transaction_id()}"
     
     def execute(self, **kwargs):
-        transaction_id = self.get_transaction_id()
-        self._get_version_controller().commit(transaction_id)
-        self._console_log("Transaction", transaction_id, "committed")
\ No newline at end of file
+        # COMMIT VERSIONS AND LOG COMMIT, TRANSACTION MANAGER ACKNOWLEDGES IT ONCE COMMIT RECORD IS DURABLE
+        self.__commit_lsn = self._get_version_controller().commit(self.get_transaction_id())
+
+    def get_commit_lsn(self) -> int | None:
+        # LSN OF COMMIT RECORD, NONE IF NOTHING IS LOGGED
+        return self.__commit_lsn
+
+    def acknowledge(self):
+        self._console_log("Transaction", self.get_transaction_id(), "committed")
\ No newline at end of file
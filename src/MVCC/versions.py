@@ -0,0 +1,134 @@
+from bisect import bisect_left, bisect_right
+
+class ResourceVersion:
+    def __init__(
+            self, 
+            resource_id: str, 
+            transaction_id: str = "",
+            read_timestamp: int = 0, 
+            write_timestamp: int = 0, 
+            initial_value: int = 0
+        ) -> None:
+
+        self.__resource_id = resource_id
+        self.__transaction_id = transaction_id
+        self.__read_timestamp = read_timestamp
+        self.__write_timestamp = write_timestamp
+        self.__value = initial_value
+        self.__is_committed = False
+
+    def get_resource_id(self) -> str:
+        return self.__resource_id
+    
+    def get_transaction_id(self) -> str:
+        return self.__transaction_id
+    
+    def get_read_timestamp(self) -> int:
+        return self.__read_timestamp
+    
+    def get_write_timestamp(self) -> int:
+        return self.__write_timestamp
+    
+    def __update_read_timestamp(self, new_timestamp: int):
+        self.__read_timestamp = max(self.__read_timestamp, new_timestamp)
+
+    def get_value(self) -> int:
+        return self.__value
+    
+    def read(self, transaction_timestamp: int) -> int:
+        self.__update_read_timestamp(transaction_timestamp)
+        return self.__value
+    
+    def update(self, value: int) -> int:
+        old_value = self.__value
+        self.__value = value
+
+        return old_value
+    
+    def commit(self):
+        self.__is_committed = True
+
+    def is_committed(self) -> bool:
+        return self.__is_committed
+
+
+class VersionChain:
+    # Versions of one resource ordered by write timestamp, with parallel list of write timestamps for bisect
+    # Committed versions are kept in a second ordered chain so the newest committed version is the last one
+
+    def __init__(self, initial_version: ResourceVersion) -> None:
+        self.__versions: list[ResourceVersion] = [initial_version]
+        self.__timestamps: list[int] = [initial_version.get_write_timestamp()]
+
+        # Initial version has no creator and counts as committed
+        self.__committed_versions: list[ResourceVersion] = [initial_version]
+        self.__committed_timestamps: list[int] = [initial_version.get_write_timestamp()]
+
+    def find(self, timestamp: int) -> ResourceVersion | None:
+        # RETURN VERSION WITH THE LARGEST WRITE TIMESTAMP LESS THAN OR EQUAL TO TIMESTAMP
+        index = bisect_right(self.__timestamps, timestamp) - 1
+        return self.__versions[index] if index >= 0 else None
+
+    def find_committed(self, timestamp: int) -> ResourceVersion | None:
+        # RETURN COMMITTED VERSION WITH THE LARGEST WRITE TIMESTAMP LESS THAN OR EQUAL TO TIMESTAMP
+        index = bisect_right(self.__committed_timestamps, timestamp) - 1
+        return self.__committed_versions[index] if index >= 0 else None
+
+    def get_previous(self, version: ResourceVersion) -> ResourceVersion | None:
+        # RETURN VERSION RIGHT BEFORE THE GIVEN VERSION
+        index = bisect_left(self.__timestamps, version.get_write_timestamp())
+        return self.__versions[index - 1] if index > 0 else None
+
+    def get_newest_committed(self) -> ResourceVersion:
+        return self.__committed_versions[-1]
+
+    def insert(self, version: ResourceVersion):
+        index = bisect_right(self.__timestamps, version.get_write_timestamp())
+        self.__versions.insert(index, version)
+        self.__timestamps.insert(index, version.get_write_timestamp())
+
+    def remove(self, version: ResourceVersion):
+        # REMOVE VERSION THAT IS NOT COMMITTED
+        index = bisect_left(self.__timestamps, version.get_write_timestamp())
+
+        if (index < len(self.__versions) and self.__versions[index] is version):
+            del self.__versions[index]
+            del self.__timestamps[index]
+
+    def commit(self, version: ResourceVersion):
+        version.commit()
+        index = bisect_right(self.__committed_timestamps, version.get_write_timestamp())
+        self.__committed_versions.insert(index, version)
+        self.__committed_timestamps.insert(index, version.get_write_timestamp())
+
+    def prune(self, watermark: int, limit: int) -> list[ResourceVersion]:
+        # REMOVE AT MOST LIMIT VERSIONS OLDER THAN THE NEWEST COMMITTED VERSION AT OR BELOW WATERMARK AND RETURN THEM
+        # No transaction reads below watermark, so that committed version hides every older one
+        base_index = bisect_right(self.__committed_timestamps, watermark) - 1
+
+        if (base_index <= 0):
+            return []
+
+        base_timestamp = self.__committed_timestamps[base_index]
+        count = min(bisect_left(self.__timestamps, base_timestamp), limit)
+
+        # Only committed versions are removed, versions of transactions that are still running stay in any case
+        removed_count = 0
+
+        while (removed_count < count and self.__versions[removed_count] is self.__committed_versions[removed_count]):
+            removed_count += 1
+
+        removed_versions = self.__versions[:removed_count]
+        del self.__versions[:removed_count]
+        del self.__timestamps[:removed_count]
+        del self.__committed_versions[:removed_count]
+        del self.__committed_timestamps[:removed_count]
+
+        return removed_versions
+
+    def __len__(self) -> int:
+        return len(self.__versions)
+
+    def __iter__(self):
+        # ITERATE FROM THE NEWEST VERSION TO THE OLDEST
+        return reversed(self.__versions)
@@ -5,14 +5,15 @@ from cores.exceptions import InvalidInstructionLineException
 from OCC.OCCResourceHandler import OCCResourceHandler
 
 class OCCInstructionReader(InstructionReader):
-    def __init__(self, file_path: str, resource_handler: OCCResourceHandler) -> None:
-        super().__init__(file_path)
+    def __init__(self, file_path: str, resource_handler: OCCResourceHandler, bulk: bool = False) -> None:
+        super().__init__(file_path, bulk)
         self.__resource_handler = resource_handler
 
     def _get_instruction_from_line(self, instruction_line: InstructionLine) -> Instruction:
         type = instruction_line.instruction_type
 
-        if (type == InstructionType.R):
+        # Update instruction only hints a later write to lock based managers, here it is a plain read
+        if (type == InstructionType.R or type == InstructionType.U):
             return OCCReadInstruction(
                 instruction_line.transaction_id,
                 self.__resource_handler,
@@ -33,4 +34,8 @@ class OCCInstructionReader(InstructionReader):
                 self.__resource_handler
             )
 
+        elif (type == InstructionType.A):
+            # Only multiversion engine keeps old values to read from
+            raise InvalidInstructionLineException("Read as of instruction is only supported by MVCC")
+
         raise InvalidInstructionLineException()
\ No newline at end of file
@@ -1,12 +1,33 @@
+from collections import deque
 from cores.ResourceManager import ResourceManager
 from cores.LogWriter import LogWriter
 from OCC.OCCTransaction import OCCTransactionContainer
+from OCC.Workspace import Workspace, OverwrittenValues
+from OCC.ValidationHistoryStatistics import ValidationHistoryStatistics
+from OCC.validation import ValidationMode
+from OCC.batching import order_commit_batch
 from OCC.exceptions import FailedOCCValidation
+from durability.WriteAheadLog import WriteAheadLog
+from durability.Checkpoint import ResourceSnapshot
+
 class OCCResourceHandler:
-    def __init__(self) -> None:
+    def __init__(
+            self,
+            write_ahead_log: WriteAheadLog | None = None,
+            validation_mode: ValidationMode = ValidationMode.BACKWARD,
+            eager_abort: bool = False
+        ) -> None:
+
         self.__resource_manager: ResourceManager = ResourceManager()
+        self.__validation_mode = validation_mode
         self.__log_writer = LogWriter("RESOURCE MANAGER")
 
+        # Only committed writes reach the resources, so nothing is logged before commit
+        self.__write_ahead_log = write_ahead_log
+
+        if (write_ahead_log is not None):
+            write_ahead_log.set_snapshot_source(self.get_checkpoint_snapshot)
+
         # Write history format for certain transaction id: 
         # list of resource id that is written
         self.__write_history: dict[str, list[str]] = {}
@@ -15,17 +36,47 @@ class OCCResourceHandler:
         # list of resource id that is read
         self.__read_history: dict[str, list[str]] = {}
 
-        # Snapshot record of certain transaction id
-        # Snapshot is in form of dict with key: resource id and value: value of the resource
-        self.__snapshots: dict[str, dict[str, int]] = {}
+        # Workspace of certain transaction id, created on its first access
+        # Dict keeps workspaces in creation order, so the first one has the oldest base version
+        self.__workspaces: dict[str, Workspace] = {}
+
+        # Number of commits that wrote resources, workspace reads resources as they were at this version when it was created
+        self.__version = 0
+        self.__overwritten_values = OverwrittenValues()
+
+        # Version stamp of every resource written by a commit, resources that were never written have version 0
+        self.__resource_versions: dict[str, int] = {}
 
         self.__transaction_containers: dict[str, OCCTransactionContainer] = {}
 
+        # Transactions that began and have not committed yet, including ones without any access and ones rolling back
+        # Oldest start timestamp among them is the watermark, committed transaction that finished before it can not
+        # overlap with any transaction that validates later, so its history is dropped
+        self.__active_containers: dict[str, OCCTransactionContainer] = {}
+
+        # Committed transactions whose history is still kept, in commit order
+        self.__committed_transaction_ids: deque[str] = deque()
+        self.__history_statistics = ValidationHistoryStatistics()
+
+        # With eager abort, commit dooms every active transaction that read a resource it wrote, because that
+        # transaction can only fail its own validation later
+        # Readers format: dictionary with key: resource id and value: ordered set of transaction id whose validation checks the read
+        self.__eager_abort = eager_abort
+        self.__resource_readers: dict[str, dict[str, None]] = {}
+        # Doomed transactions format: dictionary with key: transaction id and value: resource id that was overwritten
+        self.__doomed_transaction_ids: dict[str, str] = {}
+        self.__doomed_count = 0
+
     def __add_transaction_if_not_exist(self, transaction_container: OCCTransactionContainer):
         transaction_id = transaction_container.get_id()
         
         if (self.__transaction_containers.get(transaction_id) is None):
             self.__transaction_containers[transaction_id] = transaction_container
+            self.__history_statistics.add_transaction()
+
+    def begin(self, transaction_container: OCCTransactionContainer):
+        # REGISTER NEW TRANSACTION, HISTORY IT MAY VALIDATE AGAINST IS KEPT UNTIL IT COMMITS
+        self.__active_containers[transaction_container.get_id()] = transaction_container
 
 
     def __add_read_history(self, transaction_id: str, resource_id: str):
@@ -45,49 +96,74 @@ class OCCResourceHandler:
             self.__write_history[transaction_id] = history
         
         history.append(resource_id)
+        self.__history_statistics.add_write()
+
+    def __get_or_create_workspace(self, transaction_id) -> Workspace:
+        workspace = self.__workspaces.get(transaction_id)
+
+        if (workspace is None):
+            workspace = Workspace(self.__version)
+            self.__workspaces[transaction_id] = workspace
 
-    def __get_or_create_snapshot(self, transaction_id) -> dict[str, int]:
-        snapshot = self.__snapshots.get(transaction_id)
+        return workspace
 
-        if (snapshot is None):
-            snapshot = self.__resource_manager.get_snapshot()
-            self.__snapshots[transaction_id] = snapshot
+    def __read_base_value(self, workspace: Workspace, resource_id: str) -> tuple[int, int]:
+        # RETURN VALUE OF RESOURCE AT BASE VERSION OF WORKSPACE WITH VERSION STAMP OF THAT VALUE
+        overwritten_value = self.__overwritten_values.get(resource_id, workspace.base_version)
 
-        return snapshot
+        if (overwritten_value is not None):
+            return overwritten_value
+
+        # Resource is only created once a commit writes it
+        return self.__resource_manager.peek(resource_id), self.__resource_versions.get(resource_id, 0)
 
     def read(self, transaction_container: OCCTransactionContainer, resource_id: str) -> int:
-        # READ THE VALUE OF CERTAIN RESOURCE IN SNAPSHOT
+        # READ THE VALUE OF CERTAIN RESOURCE IN WORKSPACE
         # RETURN 0 IF RESOURCE IS NEW
 
         self.__add_transaction_if_not_exist(transaction_container)
 
         transaction_id = transaction_container.get_id()
 
-        snapshot = self.__get_or_create_snapshot(transaction_id)
+        workspace = self.__get_or_create_workspace(transaction_id)
+        snapshot = workspace.values
 
         value = snapshot.get(resource_id)
 
         if (value is None):
-            value = 0
+            value, version = self.__read_base_value(workspace, resource_id)
             snapshot[resource_id] = value
+            workspace.read_versions[resource_id] = version
+
+            if (self.__eager_abort):
+                self.__resource_readers.setdefault(resource_id, {})[transaction_id] = None
+
+                # Value older than the newest commit was already overwritten after workspace was created
+                if (version != self.__resource_versions.get(resource_id, 0)):
+                    self.__doom(transaction_id, resource_id)
+
+        elif (self.__eager_abort and self.__validation_mode == ValidationMode.BACKWARD):
+            # Backward validation also checks reads of values the transaction already has
+            self.__resource_readers.setdefault(resource_id, {})[transaction_id] = None
 
         self.__add_read_history(transaction_id, resource_id)
 
         return value
     
     def write(self, transaction_container: OCCTransactionContainer, resource_id: str, value: int) -> int:
-        # UPDATE THE VALUE OF CERTAIN RESOURCE IN SNAPSHOT AND RETURN THE OLD VALUE
+        # UPDATE THE VALUE OF CERTAIN RESOURCE IN WORKSPACE AND RETURN THE OLD VALUE
 
         self.__add_transaction_if_not_exist(transaction_container)
 
         transaction_id = transaction_container.get_id()
 
-        snapshot = self.__get_or_create_snapshot(transaction_id)
+        workspace = self.__get_or_create_workspace(transaction_id)
+        snapshot = workspace.values
 
         old_value = snapshot.get(resource_id)
 
-        if (value is None):
-            old_value = 0
+        if (old_value is None):
+            old_value, _ = self.__read_base_value(workspace, resource_id)
 
         snapshot[resource_id] = value
 
@@ -96,21 +172,122 @@ class OCCResourceHandler:
         return old_value
     
     def __clear_data(self, transaction_id: str, delete_write_history: bool = False):
-        self.__read_history.pop(transaction_id, [])
-        self.__snapshots.pop(transaction_id, [])
+        read_history = self.__read_history.pop(transaction_id, [])
+
+        if (self.__eager_abort):
+            self.__remove_reader(transaction_id, read_history)
+
+        if (self.__workspaces.pop(transaction_id, None) is not None):
+            self.__drop_unreachable_values()
 
         if (delete_write_history):
-            self.__write_history.pop(transaction_id, [])
+            self.__history_statistics.remove_writes(len(self.__write_history.pop(transaction_id, [])))
+
+    def __drop_unreachable_values(self):
+        # DROP OVERWRITTEN VALUES THAT ARE OLDER THAN BASE OF EVERY REMAINING WORKSPACE
+        if (len(self.__workspaces) == 0):
+            self.__overwritten_values.clear()
+            return
+
+        oldest_workspace = next(iter(self.__workspaces.values()))
+        self.__overwritten_values.drop_until(oldest_workspace.base_version)
+
+    def __remove_reader(self, transaction_id: str, resource_ids: list[str]):
+        for resource_id in resource_ids:
+            readers = self.__resource_readers.get(resource_id)
+
+            if (readers is not None):
+                readers.pop(transaction_id, None)
+
+                if (len(readers) == 0):
+                    del self.__resource_readers[resource_id]
+
+    def __doom(self, transaction_id: str, resource_id: str):
+        if (transaction_id not in self.__doomed_transaction_ids):
+            self.__doomed_transaction_ids[transaction_id] = resource_id
+            self.__doomed_count += 1
+
+    def __doom_readers(self, transaction_id: str, resource_ids: list[str]):
+        # MARK ACTIVE READERS OF RESOURCES WRITTEN BY COMMITTING TRANSACTION AS DOOMED
+        for resource_id in resource_ids:
+            for reader_id in self.__resource_readers.get(resource_id, ()):
+                if (reader_id != transaction_id):
+                    self.__doom(reader_id, resource_id)
+
+    def is_doomed(self, transaction_id: str) -> bool:
+        # CHECK IF TRANSACTION WILL FAIL VALIDATION BECAUSE A COMMIT OVERWROTE RESOURCE IT READ
+        return transaction_id in self.__doomed_transaction_ids
+
+    def get_doomed_resource_id(self, transaction_id: str) -> str | None:
+        # RETURN ID OF RESOURCE THAT WAS OVERWRITTEN AFTER DOOMED TRANSACTION READ IT
+        return self.__doomed_transaction_ids.get(transaction_id)
+
+    def get_doomed_count(self) -> int:
+        return self.__doomed_count
 
     def rollback(self, transaction_id: str):
         self.__clear_data(transaction_id, delete_write_history=True)
+        self.__doomed_transaction_ids.pop(transaction_id, None)
+
+    def __write_commits(self, transaction_ids: list[str]) -> dict[str, int]:
+        # APPLY WRITES OF TRANSACTIONS IN ORDER TO RESOURCES IN ONE PASS AND RETURN LSN OF EACH LOGGED COMMIT RECORD
+        # Every transaction that writes gets its own version, so version stamps stay per commit
+        other_workspace_count = len(self.__workspaces) - sum(transaction_id in self.__workspaces for transaction_id in transaction_ids)
+        new_values: dict[str, int] = {}
+        updates: list[tuple[str, str, int, int]] = []
+
+        for transaction_id in transaction_ids:
+            write_history = self.__write_history.get(transaction_id, [])
+
+            if (len(write_history) == 0):
+                continue
+
+            snapshot = self.__workspaces[transaction_id].values
+            self.__version += 1
+            replaced_resource_ids = set()
+
+            for resource_id in write_history:
+                old_value = new_values[resource_id] if resource_id in new_values else self.__resource_manager.peek(resource_id)
+                new_values[resource_id] = snapshot[resource_id]
+                updates.append((transaction_id, resource_id, old_value, snapshot[resource_id]))
 
-    def __write_commit(self, transaction_id: str):
-        snapshot = self.__get_or_create_snapshot(transaction_id)
-        write_history = self.__write_history.get(transaction_id, [])
+                # Other workspaces were created before this commit and still read the replaced values
+                if (other_workspace_count > 0 and resource_id not in replaced_resource_ids):
+                    replaced_resource_ids.add(resource_id)
+                    self.__overwritten_values.add(self.__version, resource_id, old_value, self.__resource_versions.get(resource_id, 0))
 
-        for resource_id in write_history:
-            self.__resource_manager.write(resource_id, snapshot[resource_id])
+                self.__resource_versions[resource_id] = self.__version
+
+        if (len(new_values) > 0):
+            self.__resource_manager.write_many(new_values.keys(), new_values.values())
+
+        commit_lsns: dict[str, int] = {}
+
+        if (self.__write_ahead_log is not None):
+            update_index = 0
+
+            for transaction_id in transaction_ids:
+                while (update_index < len(updates) and updates[update_index][0] == transaction_id):
+                    _, resource_id, old_value, new_value = updates[update_index]
+                    self.__write_ahead_log.log_update(transaction_id, resource_id, old_value, new_value)
+                    update_index += 1
+
+                commit_lsns[transaction_id] = self.__write_ahead_log.log_commit(transaction_id)
+
+        return commit_lsns
+
+    def __finish_commits(self, transaction_ids: list[str]):
+        for transaction_id in transaction_ids:
+            self.__clear_data(transaction_id)
+            self.__active_containers.pop(transaction_id, None)
+
+            if (transaction_id in self.__transaction_containers):
+                self.__committed_transaction_ids.append(transaction_id)
+
+        # Committed transactions are no longer readers, so only transactions that are still active are doomed
+        if (self.__eager_abort):
+            for transaction_id in transaction_ids:
+                self.__doom_readers(transaction_id, self.__write_history.get(transaction_id, []))
 
     def __validate(self, transaction_id: str):
         # VALIDATE TRANSACTION BEFORE COMMIT
@@ -126,6 +303,10 @@ class OCCResourceHandler:
         
         current_transaction.set_validate_timestamp()
 
+        if (self.__validation_mode == ValidationMode.VERSION_STAMP):
+            self.__validate_version_stamps(transaction_id)
+            return
+
         current_start_timestamp = current_transaction.get_start_timestamp()
         current_validation_timestamp = current_transaction.get_validation_timestamp()
         current_read_history = self.__read_history.get(transaction_id, [])
@@ -144,9 +325,13 @@ class OCCResourceHandler:
             ):
                 continue
             
-            # impossible to be None because validation and writing is atomic process
+            # impossible to be None because validation and writing is atomic process,
+            # except for transaction validated earlier in the same commit batch, batch order already handles it
             other_finish_timestamp = other_transaction_container.get_finish_timestamp()
 
+            if (other_finish_timestamp is None):
+                continue
+
             if (other_finish_timestamp < current_start_timestamp):
                 continue
 
@@ -165,7 +350,44 @@ class OCCResourceHandler:
         # If the loop completes without raising an exception, validation succeeds
         return
 
-    def commit(self, transaction_id: str):
+    def __validate_version_stamps(self, transaction_id: str):
+        # CHECK THAT EVERY RESOURCE READ FROM THE DATABASE STILL HAS THE VERSION THE TRANSACTION OBSERVED
+        workspace = self.__workspaces.get(transaction_id)
+
+        if (workspace is None):
+            return
+
+        for resource_id, observed_version in workspace.read_versions.items():
+            current_version = self.__resource_versions.get(resource_id, 0)
+
+            if (current_version != observed_version):
+                raise FailedOCCValidation(
+                    f"Conflict detected for resource {resource_id} in transaction {transaction_id}: "
+                    f"read version {observed_version} but version {current_version} has been committed"
+                )
+
+    def __collect_history(self):
+        # DROP HISTORY OF COMMITTED TRANSACTIONS THAT FINISHED BEFORE START OF EVERY ACTIVE TRANSACTION
+        watermark = min(
+            (container.get_start_timestamp() for container in self.__active_containers.values()),
+            default=None
+        )
+
+        while (len(self.__committed_transaction_ids) > 0):
+            transaction_id = self.__committed_transaction_ids[0]
+            finish_timestamp = self.__transaction_containers[transaction_id].get_finish_timestamp()
+
+            if (finish_timestamp is None or (watermark is not None and finish_timestamp >= watermark)):
+                break
+
+            self.__committed_transaction_ids.popleft()
+            del self.__transaction_containers[transaction_id]
+            self.__history_statistics.collect_transaction(len(self.__write_history.pop(transaction_id, [])))
+
+    def commit(self, transaction_id: str) -> int | None:
+        # RETURN LSN OF COMMIT RECORD, NONE IF NOTHING IS LOGGED
+        # Finish timestamp of the previous commit is set by now, so it can be collected
+        self.__collect_history()
 
         try:
             self.__validate(transaction_id)
@@ -174,8 +396,59 @@ class OCCResourceHandler:
             self.__log_writer.console_log(e.get_message())
             raise e
         
-        self.__write_commit(transaction_id)
-        self.__clear_data(transaction_id)
+        commit_lsns = self.__write_commits([transaction_id])
+        self.__finish_commits([transaction_id])
+
+        return commit_lsns.get(transaction_id)
+
+    def __get_validated_read_set(self, transaction_id: str) -> set[str]:
+        # RETURN RESOURCES WHOSE OVERWRITE BY ANOTHER COMMIT WOULD FAIL VALIDATION OF TRANSACTION
+        if (self.__validation_mode == ValidationMode.VERSION_STAMP):
+            workspace = self.__workspaces.get(transaction_id)
+            return set() if workspace is None else set(workspace.read_versions)
+
+        return set(self.__read_history.get(transaction_id, []))
+
+    def commit_batch(self, transaction_ids: list[str]) -> tuple[list[str], dict[str, str], dict[str, int]]:
+        # VALIDATE TRANSACTIONS TOGETHER, COMMIT READERS BEFORE WRITERS THAT WOULD INVALIDATE THEM AND APPLY ALL WRITES IN ONE PASS
+        # RETURN IDS OF COMMITTED TRANSACTIONS IN COMMIT ORDER, FAILED TRANSACTION IDS WITH THEIR VALIDATION MESSAGE
+        # AND LSN OF EACH LOGGED COMMIT RECORD
+        self.__collect_history()
+
+        failed_transactions: dict[str, str] = {}
+        valid_transaction_ids: list[str] = []
+
+        for transaction_id in transaction_ids:
+            try:
+                self.__validate(transaction_id)
+                valid_transaction_ids.append(transaction_id)
+
+            except FailedOCCValidation as e:
+                self.__log_writer.console_log(e.get_message())
+                failed_transactions[transaction_id] = e.get_message()
+
+        commit_order, conflicted_transaction_ids = order_commit_batch(
+            valid_transaction_ids,
+            {transaction_id: self.__get_validated_read_set(transaction_id) for transaction_id in valid_transaction_ids},
+            {transaction_id: set(self.__write_history.get(transaction_id, [])) for transaction_id in valid_transaction_ids}
+        )
+
+        for transaction_id in conflicted_transaction_ids:
+            message = f"Transaction {transaction_id} is in a cycle of conflicting transactions in commit batch"
+            self.__log_writer.console_log(message)
+            failed_transactions[transaction_id] = message
+
+        commit_lsns = self.__write_commits(commit_order)
+        self.__finish_commits(commit_order)
+
+        return commit_order, failed_transactions, commit_lsns
+
+    def get_history_statistics(self) -> ValidationHistoryStatistics:
+        return self.__history_statistics
+
+    def get_checkpoint_snapshot(self) -> ResourceSnapshot:
+        # RETURN CURRENT VALUE OF EVERY RESOURCE, SINGLE VERSION RESOURCES HAVE TIMESTAMP 0
+        return {resource_id: (value, 0) for resource_id, value in self.__resource_manager.get_snapshot().items()}
 
     def print_snapshot(self):
         # PRINT ALL RESOURCE VALUE AT THIS MOMENT
@@ -4,16 +4,16 @@ from cores.Timestamp import TimeStamp
 class OCCTransaction(DynamicTimestampTransaction):
     def __init__(self, id: str) -> None:
         super().__init__(id)
-        self.__validation_timestamp: float | None = None
-        self.__finish_timestamp: float | None = None
+        self.__validation_timestamp: int | None = None
+        self.__finish_timestamp: int | None = None
 
-    def get_start_timestamp(self) -> float:
+    def get_start_timestamp(self) -> int:
         return self._get_timestamp()
     
-    def get_validation_timestamp(self) -> float | None:
+    def get_validation_timestamp(self) -> int | None:
         return self.__validation_timestamp
     
-    def get_finish_timestamp(self) -> float | None:
+    def get_finish_timestamp(self) -> int | None:
         return self.__finish_timestamp
     
     def set_validate_timestamp(self):
@@ -24,8 +24,9 @@ class OCCTransaction(DynamicTimestampTransaction):
         self.__validation_timestamp = None
         self.__finish_timestamp = None
     
-    def commit(self):
-        super().commit()
+    def start_commit(self):
+        # Writes are applied when commit is logged, so later validations see finish timestamp before commit is durable
+        super().start_commit()
         self.__finish_timestamp = TimeStamp.time()
 
 class OCCTransactionContainer:
@@ -35,13 +36,13 @@ class OCCTransactionContainer:
     def get_id(self) -> str:
         return self.__transaction.get_id()
     
-    def get_start_timestamp(self) -> float:
+    def get_start_timestamp(self) -> int:
         return self.__transaction.get_start_timestamp()
     
-    def get_validation_timestamp(self) -> float | None:
+    def get_validation_timestamp(self) -> int | None:
         return self.__transaction.get_validation_timestamp()
     
-    def get_finish_timestamp(self) -> float | None:
+    def get_finish_timestamp(self) -> int | None:
         return self.__transaction.get_finish_timestamp()
 
     def set_validate_timestamp(self):
@@ -1,10 +1,16 @@
 from cores.TransactionManager import TransactionManager
+from cores.clocks import Clock
+from cores.LogWriter import LogLevel
+from durability.WriteAheadLog import WriteAheadLog
+from durability.commits import DurableCommitQueue
 from OCC.OCCInstructionReader import OCCInstructionReader
 from cores.Instruction import Instruction, InstructionType
 from OCC.OCCResourceHandler import OCCResourceHandler
 from collections import deque
 from OCC.OCCTransaction import OCCTransaction, OCCTransactionContainer
 from OCC.exceptions import FailedOCCValidation
+from OCC.validation import ValidationMode
+from OCC.instructions import OCCCommitInstruction
 
 class TransactionInfo:
     def __init__(self, transaction: OCCTransaction) -> None:
@@ -13,16 +19,36 @@ class TransactionInfo:
 
 class OCCTransactionManager(TransactionManager):
 
-    def __init__(self, file_path: str) -> None:
-
-        self.__resource_handler = OCCResourceHandler()
-        instruction_reader = OCCInstructionReader(file_path, self.__resource_handler)
-
-        super().__init__(instruction_reader)
+    def __init__(
+            self,
+            file_path: str,
+            clock: Clock | None = None,
+            bulk_read: bool = False,
+            write_ahead_log: WriteAheadLog | None = None,
+            validation_mode: ValidationMode = ValidationMode.BACKWARD,
+            eager_abort: bool = False,
+            commit_batch_size: int | None = None
+        ) -> None:
+
+        # write_ahead_log records writes of every committed transaction, caller closes it after the run
+        # validation_mode VERSION_STAMP validates in time proportional to the read set only
+        # eager_abort restarts transaction at its next instruction once a commit overwrote resource it read, instead of at its commit
+        # commit_batch_size is number of commit requests that are validated and applied together, None commits each one right away
+        if (commit_batch_size is not None and commit_batch_size < 1):
+            raise ValueError("Commit batch size must be at least 1")
+
+        self.__eager_abort = eager_abort
+        self.__commit_batch_size = commit_batch_size
+        self.__commit_batch: list[Instruction] = []
+        self.__resource_handler = OCCResourceHandler(write_ahead_log, validation_mode, eager_abort)
+        instruction_reader = OCCInstructionReader(file_path, self.__resource_handler, bulk_read)
+
+        super().__init__(instruction_reader, clock)
 
         self.__transactions: dict[str, TransactionInfo] = {}
         self.__rollback_queue: deque[list[Instruction]] = deque()
         self.__done_instruction: dict[str, list[Instruction]] = {}
+        self.__durable_commits: DurableCommitQueue[OCCCommitInstruction] = DurableCommitQueue(write_ahead_log)
     
     def __add_to_done_list(self, instruction: Instruction) -> bool:
         # ADD INSTRUCTION TO DONE LIST FOR ROLLBACK PURPOSE
@@ -38,12 +64,32 @@ class OCCTransactionManager(TransactionManager):
     def __is_commit_instruction(self, instruction: Instruction) -> bool:
         return instruction.get_transaction_type() == InstructionType.C
     
-    def __handle_after_commit(self, instruction: Instruction) -> bool:
-        # CLEAR DATA OF TRANSACTION AFTER COMMIT IF NECESSARY
+    def __handle_after_commit(self, instruction: OCCCommitInstruction):
+        # ACKNOWLEDGE LOGGED COMMIT RIGHT AWAY IF ITS RECORD IS ALREADY DURABLE, OTHERWISE WAIT FOR THE LOG
         transaction_id = instruction.get_transaction_id()
+        commit_lsn = instruction.get_commit_lsn()
+        self.__transactions[transaction_id].transaction.start_commit()
+
+        if (self.__durable_commits.is_durable(commit_lsn)):
+            self.__acknowledge_commit(instruction)
+
+        else:
+            self._console_log("Transaction", transaction_id, "waits until its commit record is durable")
+            self.__durable_commits.append(commit_lsn, instruction)
+
+    def __acknowledge_commit(self, instruction: OCCCommitInstruction):
+        # CLEAR DATA OF TRANSACTION WHOSE COMMIT RECORD IS DURABLE
+        transaction_id = instruction.get_transaction_id()
+        instruction.acknowledge()
+        self.get_statistics().add_commit()
         self.__transactions[transaction_id].transaction.commit()
         self.__done_instruction.pop(transaction_id)
 
+    def __acknowledge_durable_commits(self, force: bool = False):
+        # ACKNOWLEDGE EVERY COMMIT WHOSE RECORD IS DURABLE, FORCE FLUSHES THE LOG FIRST
+        for instruction in self.__durable_commits.pop_durable(force):
+            self.__acknowledge_commit(instruction)
+
     def __execute_instruction(self, instruction: Instruction):
         transaction_id = instruction.get_transaction_id()
         instruction.execute(transaction_container=self.__transactions[transaction_id].transaction_container)
@@ -57,6 +103,7 @@ class OCCTransactionManager(TransactionManager):
         self.__resource_handler.rollback(transaction_id)
         done_instructions = self.__done_instruction.pop(transaction_id, [])
         self._console_log("Transaction", transaction_id, "is aborting")
+        self.get_statistics().add_abort()
         self.__rollback_queue.append(done_instructions)
         self.__transactions[transaction_id].transaction.roll_back()
 
@@ -66,6 +113,7 @@ class OCCTransactionManager(TransactionManager):
         transaction_id = instructions[0].get_transaction_id()
         self.__transactions[transaction_id].transaction.reset_status()
         self._console_log("Trying to rollback transaction", instructions[0].get_transaction_id())
+        self.get_statistics().add_restart()
         return instructions
     
     def __process_rollback(self):
@@ -83,6 +131,18 @@ class OCCTransactionManager(TransactionManager):
         ):
         # EXECUTE INSTRUCTION AND HANDLE ROLLBACK IF FAIL
 
+        if (handle_rollback and self.__resource_handler.is_doomed(instruction.get_transaction_id())):
+            self.__abort_doomed(instruction)
+            return
+
+        if (handle_rollback and self.__commit_batch_size is not None and self.__is_commit_instruction(instruction)):
+            self.__commit_batch.append(instruction)
+
+            if (len(self.__commit_batch) >= self.__commit_batch_size):
+                self.__process_commit_batch()
+
+            return
+
         try:
             self.__execute_instruction(instruction)
 
@@ -101,18 +161,66 @@ class OCCTransactionManager(TransactionManager):
             self.__process_rollback()
 
 
+    def __process_commit_batch(self):
+        # COMMIT ALL BATCHED TRANSACTIONS THAT PASS VALIDATION TOGETHER AND ROLL BACK THE REST
+        instructions = self.__commit_batch
+        self.__commit_batch = []
+
+        self._console_log(f"[ Committing batch of {len(instructions)} transactions ]")
+
+        commit_order, failed_transactions, commit_lsns = self.__resource_handler.commit_batch(
+            [instruction.get_transaction_id() for instruction in instructions]
+        )
+        commit_instructions = {instruction.get_transaction_id(): instruction for instruction in instructions}
+
+        for transaction_id in commit_order:
+            commit_instructions[transaction_id].set_commit_lsn(commit_lsns.get(transaction_id))
+            self.__add_to_done_list(commit_instructions[transaction_id])
+            self.__handle_after_commit(commit_instructions[transaction_id])
+
+        for transaction_id in failed_transactions:
+            self._console_log(f"[ OCC Validation failed, starting rollback ]")
+            self.__add_to_done_list(commit_instructions[transaction_id])
+            self.__abort(transaction_id)
+
+        # Failed transactions are replayed one by one, their commit is not batched again
+        self.__process_rollback()
+
+    def __abort_doomed(self, instruction: Instruction):
+        # ROLL BACK DOOMED TRANSACTION BEFORE ITS NEXT INSTRUCTION, THE INSTRUCTION RUNS AGAIN WITH THE RESTART
+        transaction_id = instruction.get_transaction_id()
+
+        self._console_log(
+            f"[ Transaction {transaction_id} read resource {self.__resource_handler.get_doomed_resource_id(transaction_id)}",
+            "that a committed transaction overwrote, starting rollback ]"
+        )
+        self.__add_to_done_list(instruction)
+        self.__abort(transaction_id)
+        self.__process_rollback()
+
     def _process_instruction(self, instruction: Instruction):
         transaction_id = instruction.get_transaction_id()
         if (self.__transactions.get(transaction_id) == None):
             transaction = OCCTransaction(transaction_id)
-            self.__transactions[transaction_id] = TransactionInfo(transaction)
+            transaction_info = TransactionInfo(transaction)
+            self.__transactions[transaction_id] = transaction_info
+            self.__resource_handler.begin(transaction_info.transaction_container)
             
         self.__process_single_instruction(instruction, handle_rollback=True)
 
+        # Group commit delay may have passed even if nothing was logged
+        self.__acknowledge_durable_commits()
+
     def _get_next_remaining_instruction(self) -> Instruction | None:
         return None
     
     def _is_finish_or_stop(self) -> bool:
+        if (len(self.__commit_batch) > 0):
+            # Last batch is not full, but no more commit requests will come
+            self.__process_commit_batch()
+
+        # No more instruction will come, so buffered commits are forced to disk
+        self.__acknowledge_durable_commits(force=True)
         return True
     
     def __print_transaction_status(self, transaction: OCCTransaction):
@@ -147,4 +255,16 @@ class OCCTransactionManager(TransactionManager):
         for transaction_info in transactions:
             self.__print_transaction_status(transaction_info.transaction)
 
+        history_statistics = self.__resource_handler.get_history_statistics()
+
+        self._console_log(
+            "Validation history kept", history_statistics.get_retained_transaction_count(), "transactions with",
+            history_statistics.get_retained_write_count(), "writes, peak", history_statistics.get_retained_transaction_peak(),
+            "transactions, collected", history_statistics.get_collected_transaction_count(),
+            level=LogLevel.DEBUG
+        )
+
+        if (self.__eager_abort):
+            self._console_log("Eager abort doomed", self.__resource_handler.get_doomed_count(), "transactions")
+
         self.__resource_handler.print_snapshot()
\ No newline at end of file
@@ -0,0 +1,46 @@
+class ValidationHistoryStatistics:
+    # Size of validation history kept by OCC resource handler and how much of it was collected
+
+    def __init__(self) -> None:
+        self.__retained_transaction_count = 0
+        self.__retained_write_count = 0
+        self.__retained_transaction_peak = 0
+        self.__collected_transaction_count = 0
+
+    def add_write(self):
+        self.__retained_write_count += 1
+
+    def remove_writes(self, write_count: int):
+        self.__retained_write_count -= write_count
+
+    def add_transaction(self):
+        self.__retained_transaction_count += 1
+        self.__retained_transaction_peak = max(self.__retained_transaction_peak, self.__retained_transaction_count)
+
+    def collect_transaction(self, write_count: int):
+        self.__retained_transaction_count -= 1
+        self.__collected_transaction_count += 1
+        self.remove_writes(write_count)
+
+    def get_retained_transaction_count(self) -> int:
+        # NUMBER OF TRANSACTIONS VALIDATION STILL LOOKS AT
+        return self.__retained_transaction_count
+
+    def get_retained_write_count(self) -> int:
+        # NUMBER OF WRITE HISTORY ENTRIES STILL KEPT
+        return self.__retained_write_count
+
+    def get_retained_transaction_peak(self) -> int:
+        return self.__retained_transaction_peak
+
+    def get_collected_transaction_count(self) -> int:
+        # NUMBER OF COMMITTED TRANSACTIONS DROPPED BELOW THE WATERMARK
+        return self.__collected_transaction_count
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "retained_transactions": self.__retained_transaction_count,
+            "retained_writes": self.__retained_write_count,
+            "retained_transaction_peak": self.__retained_transaction_peak,
+            "collected_transactions": self.__collected_transaction_count
+        }
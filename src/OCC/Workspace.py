@@ -0,0 +1,50 @@
+from collections import deque
+
+class Workspace:
+    # Private values of one transaction, only resources it read or wrote are kept
+    # Resources it has not touched yet are read as they were at base version
+
+    def __init__(self, base_version: int) -> None:
+        self.base_version = base_version
+        self.values: dict[str, int] = {}
+
+        # Version stamp of every resource read from the database, reads of its own writes are not included
+        self.read_versions: dict[str, int] = {}
+
+class OverwrittenValues:
+    # Values that commits replaced, kept while a workspace with an older base version may still read them
+    # Commit with version v that replaced value x written by version u is kept as (v, x, u), x is the value at every version from u to v
+
+    def __init__(self) -> None:
+        self.__resource_values: dict[str, deque[tuple[int, int, int]]] = {}
+        # (version, resource id) of every kept value in version order, so the oldest ones are dropped first
+        self.__order: deque[tuple[int, str]] = deque()
+
+    def add(self, version: int, resource_id: str, value: int, value_version: int):
+        self.__resource_values.setdefault(resource_id, deque()).append((version, value, value_version))
+        self.__order.append((version, resource_id))
+
+    def get(self, resource_id: str, base_version: int) -> tuple[int, int] | None:
+        # RETURN VALUE OF RESOURCE AT BASE VERSION WITH VERSION THAT WROTE IT, NONE IF IT HAS NOT BEEN OVERWRITTEN SINCE
+        for version, value, value_version in self.__resource_values.get(resource_id, ()):
+            if (version > base_version):
+                return value, value_version
+
+        return None
+
+    def drop_until(self, version: int):
+        # DROP VALUES OF COMMITS UP TO VERSION, NO WORKSPACE READS BEFORE THEM ANYMORE
+        while (len(self.__order) > 0 and self.__order[0][0] <= version):
+            _, resource_id = self.__order.popleft()
+            values = self.__resource_values[resource_id]
+            values.popleft()
+
+            if (len(values) == 0):
+                del self.__resource_values[resource_id]
+
+    def clear(self):
+        self.__resource_values.clear()
+        self.__order.clear()
+
+    def __len__(self) -> int:
+        return len(self.__order)
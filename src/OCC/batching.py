@@ -0,0 +1,85 @@
+def is_in_cycle(edges: dict[str, list[str]], target_id: str, remaining_ids: dict[str, None]) -> bool:
+    # CHECK IF TRANSACTION CAN REACH ITSELF THROUGH REMAINING TRANSACTIONS
+    stack = list(edges[target_id])
+    visited: set[str] = set()
+
+    while (len(stack) > 0):
+        transaction_id = stack.pop()
+
+        if (transaction_id == target_id):
+            return True
+
+        if (transaction_id in visited or transaction_id not in remaining_ids):
+            continue
+
+        visited.add(transaction_id)
+        stack.extend(edges[transaction_id])
+
+    return False
+
+def order_commit_batch(
+        transaction_ids: list[str],
+        read_sets: dict[str, set[str]],
+        write_sets: dict[str, set[str]]
+    ) -> tuple[list[str], list[str]]:
+
+    # RETURN COMMIT ORDER OF VALIDATED TRANSACTIONS AND TRANSACTIONS THAT HAVE TO ABORT
+    # Transaction that read a resource commits before every transaction of the batch that writes it, otherwise its read is stale
+    # Cycle of such transactions can not be ordered, the transaction with most conflicts in it aborts until no cycle is left
+
+    # Edge A -> B means A has to commit before B, dicts are used as ordered sets so order is deterministic
+    writer_ids: dict[str, list[str]] = {}
+
+    for transaction_id in transaction_ids:
+        for resource_id in write_sets[transaction_id]:
+            writer_ids.setdefault(resource_id, []).append(transaction_id)
+
+    edges: dict[str, list[str]] = {transaction_id: [] for transaction_id in transaction_ids}
+    in_degrees: dict[str, int] = dict.fromkeys(transaction_ids, 0)
+
+    for transaction_id in transaction_ids:
+        successor_ids: dict[str, None] = {}
+
+        for resource_id in read_sets[transaction_id]:
+            for writer_id in writer_ids.get(resource_id, ()):
+                if (writer_id != transaction_id):
+                    successor_ids[writer_id] = None
+
+        edges[transaction_id] = list(successor_ids)
+
+        for successor_id in successor_ids:
+            in_degrees[successor_id] += 1
+
+    remaining_ids: dict[str, None] = dict.fromkeys(transaction_ids)
+    commit_order: list[str] = []
+    aborted_ids: list[str] = []
+
+    def remove(transaction_id: str):
+        del remaining_ids[transaction_id]
+
+        for successor_id in edges[transaction_id]:
+            if (successor_id in remaining_ids):
+                in_degrees[successor_id] -= 1
+
+    while (len(remaining_ids) > 0):
+        ready_ids = [transaction_id for transaction_id in remaining_ids if (in_degrees[transaction_id] == 0)]
+
+        if (len(ready_ids) > 0):
+            for transaction_id in ready_ids:
+                # Ready transactions do not depend on each other, so they commit in batch order
+                commit_order.append(transaction_id)
+                remove(transaction_id)
+
+            continue
+
+        # Every remaining transaction waits for another one, abort the one in a cycle with most conflicts
+        cycle_ids = [transaction_id for transaction_id in remaining_ids if is_in_cycle(edges, transaction_id, remaining_ids)]
+        victim_id = max(
+            cycle_ids,
+            key=lambda transaction_id: in_degrees[transaction_id] + sum(successor_id in remaining_ids for successor_id in edges[transaction_id])
+        )
+
+        aborted_ids.append(victim_id)
+        remove(victim_id)
+
+    return commit_order, aborted_ids
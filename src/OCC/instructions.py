@@ -82,6 +82,7 @@ class OCCReadInstruction(OCCAccessTransaction):
 class OCCCommitInstruction(OCCInstruction):
     def __init__(self, transaction_id: str, resource_handler: OCCResourceHandler) -> None:
         super().__init__(transaction_id, resource_handler)
+        self.__commit_lsn: int | None = None
 
     def get_transaction_type(self) -> InstructionType:
         return InstructionType.C
@@ -90,6 +91,16 @@ class OCCCommitInstruction(OCCInstruction):
         return f"commit from transaction {self.get_transaction_id()}"
     
     def execute(self, **kwargs):
-        transaction_id = self.get_transaction_id()
-        self._get_resource_handler().commit(transaction_id)
-        self._console_log("Transaction", transaction_id, "committed")
\ No newline at end of file
+        # VALIDATE, WRITE AND LOG COMMIT, TRANSACTION MANAGER ACKNOWLEDGES IT ONCE COMMIT RECORD IS DURABLE
+        self.__commit_lsn = self._get_resource_handler().commit(self.get_transaction_id())
+
+    def set_commit_lsn(self, commit_lsn: int | None):
+        # USE THIS WHEN TRANSACTION IS COMMITTED AS PART OF A BATCH
+        self.__commit_lsn = commit_lsn
+
+    def get_commit_lsn(self) -> int | None:
+        # LSN OF COMMIT RECORD, NONE IF NOTHING IS LOGGED
+        return self.__commit_lsn
+
+    def acknowledge(self):
+        self._console_log("Transaction", self.get_transaction_id(), "committed")
\ No newline at end of file
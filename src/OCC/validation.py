@@ -0,0 +1,7 @@
+from enum import Enum
+
+class ValidationMode(Enum):
+    # BACKWARD: read set is checked against write sets of transactions that committed since this transaction started
+    # VERSION_STAMP: every resource keeps version of the commit that last wrote it, read set is checked against the versions it observed
+    BACKWARD = 0
+    VERSION_STAMP = 1
@@ -0,0 +1,142 @@
+import csv
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+from cores.LogWriter import LogWriter, LogLevel
+from cores.TransactionManager import TransactionManager
+from twophase.TwoPhaseTransactionManager import TwoPhaseTransactionManager
+from twophase.deadlocks import DeadlockPolicy
+from OCC.OCCTransactionManager import OCCTransactionManager
+from OCC.validation import ValidationMode
+from MVCC.MVCCTransactionManager import MVCCTransactionManager
+from benchmark.WorkloadGenerator import WorkloadGenerator, WorkloadParameters
+
+# Engine factory receives schedule path and returns transaction manager ready to run
+EngineFactory = Callable[[str], TransactionManager]
+
+DEFAULT_ENGINES: dict[str, EngineFactory] = {
+    "2PL": TwoPhaseTransactionManager,
+    "2PL-DETECT": lambda file_path: TwoPhaseTransactionManager(file_path, deadlock_policy=DeadlockPolicy.DETECT),
+    "OCC": OCCTransactionManager,
+    "OCC-STAMP": lambda file_path: OCCTransactionManager(file_path, validation_mode=ValidationMode.VERSION_STAMP),
+    "MVCC": MVCCTransactionManager,
+    "MVCC-CASCADELESS": lambda file_path: MVCCTransactionManager(file_path, cascadeless=True)
+}
+
+class BenchmarkResult:
+    def __init__(
+            self,
+            workload: str,
+            engine: str,
+            parameters: WorkloadParameters | None,
+            wall_time: float,
+            statistics: dict[str, int],
+            peak_memory: int | None
+        ) -> None:
+
+        self.workload = workload
+        self.engine = engine
+        self.parameters = parameters
+        self.wall_time = wall_time
+        self.statistics = statistics
+        self.peak_memory = peak_memory
+
+    def get_instructions_per_second(self) -> float:
+        if (self.wall_time <= 0):
+            return 0.0
+
+        return self.statistics["instructions"] / self.wall_time
+
+    def to_dict(self) -> dict[str, str | int | float | None]:
+        row: dict[str, str | int | float | None] = {"workload": self.workload, "engine": self.engine}
+
+        if (self.parameters is not None):
+            row.update(self.parameters.to_dict())
+
+        else:
+            # Schedule file has no workload parameters but keeps the same columns
+            row.update(dict.fromkeys(WorkloadParameters().to_dict()))
+
+        row["wall_time"] = self.wall_time
+        row["instructions_per_second"] = self.get_instructions_per_second()
+        row.update(self.statistics)
+        row["peak_memory"] = self.peak_memory
+
+        return row
+
+class BenchmarkRunner:
+    def __init__(self, engines: dict[str, EngineFactory] | None = None, measure_memory: bool = True) -> None:
+        self.__engines = engines if engines is not None else DEFAULT_ENGINES
+        self.__measure_memory = measure_memory
+        self.__results: list[BenchmarkResult] = []
+
+    def __run_engine(self, factory: EngineFactory, file_path: str) -> tuple[float, dict[str, int]]:
+        transaction_manager = factory(file_path)
+
+        start = time.perf_counter()
+        transaction_manager.run()
+        wall_time = time.perf_counter() - start
+
+        return wall_time, transaction_manager.get_statistics().to_dict()
+
+    def __measure_peak_memory(self, factory: EngineFactory, file_path: str) -> int:
+        # Memory is traced on a separate run so tracing overhead does not affect wall time
+        tracemalloc.start()
+
+        try:
+            factory(file_path).run()
+            return tracemalloc.get_traced_memory()[1]
+
+        finally:
+            tracemalloc.stop()
+
+    def run_schedule(self, file_path: str, workload: str | None = None, parameters: WorkloadParameters | None = None) -> list[BenchmarkResult]:
+        # RUN SCHEDULE FILE THROUGH EVERY ENGINE WITH LOGGING DISABLED
+        workload = workload if workload is not None else os.path.basename(file_path)
+        results: list[BenchmarkResult] = []
+        previous_level = LogWriter.get_level()
+        LogWriter.configure(level=LogLevel.SILENT)
+
+        try:
+            for engine, factory in self.__engines.items():
+                wall_time, statistics = self.__run_engine(factory, file_path)
+                peak_memory = self.__measure_peak_memory(factory, file_path) if self.__measure_memory else None
+
+                results.append(BenchmarkResult(workload, engine, parameters, wall_time, statistics, peak_memory))
+
+        finally:
+            LogWriter.configure(level=previous_level)
+
+        self.__results.extend(results)
+        return results
+
+    def run_workload(self, parameters: WorkloadParameters, workload: str | None = None) -> list[BenchmarkResult]:
+        # GENERATE SCHEDULE FROM PARAMETERS AND RUN IT THROUGH EVERY ENGINE
+        file_descriptor, file_path = tempfile.mkstemp(prefix="workload_", suffix=".txt")
+        os.close(file_descriptor)
+
+        try:
+            WorkloadGenerator(parameters).generate(file_path)
+            return self.run_schedule(file_path, workload if workload is not None else "generated", parameters)
+
+        finally:
+            os.remove(file_path)
+
+    def get_results(self) -> list[BenchmarkResult]:
+        return self.__results
+
+    def write_csv(self, file_path: str):
+        rows = [result.to_dict() for result in self.__results]
+        field_names = list(dict.fromkeys(key for row in rows for key in row))
+
+        with open(file_path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=field_names)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def write_json(self, file_path: str):
+        with open(file_path, 'w') as file:
+            json.dump([result.to_dict() for result in self.__results], file, indent=2)
@@ -0,0 +1,102 @@
+import random
+from bisect import bisect_left
+from itertools import accumulate
+
+class WorkloadParameters:
+    def __init__(
+            self,
+            transaction_count: int = 100,
+            operations_per_transaction: int = 5,
+            read_ratio: float = 0.5,
+            zipf_skew: float = 0.0,
+            interleaving: int = 4,
+            resource_count: int = 100,
+            seed: int = 0
+        ) -> None:
+
+        # zipf_skew 0 picks resources uniformly, larger value concentrates accesses on few hot resources
+        # interleaving is the number of transactions that are open at the same time (1 is serial schedule)
+        self.transaction_count = transaction_count
+        self.operations_per_transaction = operations_per_transaction
+        self.read_ratio = read_ratio
+        self.zipf_skew = zipf_skew
+        self.interleaving = interleaving
+        self.resource_count = resource_count
+        self.seed = seed
+
+    def to_dict(self) -> dict[str, int | float]:
+        return {
+            "transaction_count": self.transaction_count,
+            "operations_per_transaction": self.operations_per_transaction,
+            "read_ratio": self.read_ratio,
+            "zipf_skew": self.zipf_skew,
+            "interleaving": self.interleaving,
+            "resource_count": self.resource_count,
+            "seed": self.seed
+        }
+
+class WorkloadGenerator:
+    def __init__(self, parameters: WorkloadParameters) -> None:
+        if (parameters.interleaving < 1):
+            raise ValueError("Interleaving degree must be at least 1")
+
+        if (parameters.resource_count < 1):
+            raise ValueError("Resource count must be at least 1")
+
+        self.__parameters = parameters
+        self.__random = random.Random(parameters.seed)
+
+        # Cumulative zipf weight of resource rank i is sum of 1 / (k + 1) ^ skew for k <= i
+        self.__cumulative_weights = list(accumulate(
+            1 / (rank + 1) ** parameters.zipf_skew for rank in range(parameters.resource_count)
+        ))
+
+    def __pick_resource(self) -> str:
+        point = self.__random.random() * self.__cumulative_weights[-1]
+        rank = min(bisect_left(self.__cumulative_weights, point), len(self.__cumulative_weights) - 1)
+        return f"X{rank}"
+
+    def __generate_operation(self, transaction_id: str) -> str:
+        resource_id = self.__pick_resource()
+
+        if (self.__random.random() < self.__parameters.read_ratio):
+            return f"R {transaction_id} {resource_id}"
+
+        return f"W {transaction_id} {resource_id}={self.__random.randrange(1000)}"
+
+    def generate_lines(self):
+        # YIELD SCHEDULE LINES, EVERY TRANSACTION ENDS WITH ITS COMMIT
+        parameters = self.__parameters
+        next_transaction = 0
+        remaining_operations: dict[str, int] = {}
+
+        while (next_transaction < parameters.transaction_count or remaining_operations):
+
+            while (len(remaining_operations) < parameters.interleaving and next_transaction < parameters.transaction_count):
+                next_transaction += 1
+                remaining_operations[f"T{next_transaction}"] = parameters.operations_per_transaction
+
+            transaction_id = self.__random.choice(list(remaining_operations))
+            remaining = remaining_operations[transaction_id]
+
+            if (remaining == 0):
+                remaining_operations.pop(transaction_id)
+                yield f"C {transaction_id}"
+
+            else:
+                remaining_operations[transaction_id] = remaining - 1
+                yield self.__generate_operation(transaction_id)
+
+    def generate(self, file_path: str) -> int:
+        # WRITE SCHEDULE TO FILE AND RETURN NUMBER OF INSTRUCTIONS
+        count = 0
+
+        with open(file_path, 'w') as file:
+            file.write(f"# Generated workload: {self.__parameters.to_dict()}\n")
+
+            for line in self.generate_lines():
+                file.write(line)
+                file.write('\n')
+                count += 1
+
+        return count
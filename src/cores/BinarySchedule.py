@@ -0,0 +1,104 @@
+import gzip
+import lzma
+import struct
+from enum import Enum
+from typing import BinaryIO
+from cores.exceptions import InvalidScheduleFileException
+
+class ScheduleCompression(Enum):
+    NONE = 0
+    GZIP = 1
+    XZ = 2
+
+class BinarySchedule:
+    # Layout of compiled schedule file (little endian)
+    # 1. Header, never compressed: magic, format version, compression, record count, transaction id count, resource id count
+    # 2. Body, compressed as a whole if compression is set:
+    #    transaction id table then resource id table, every id is stored as u32 byte length followed by utf-8 bytes
+    #    fixed-width op records: u8 op code, u32 transaction slot, i32 resource slot (-1 if none), i64 value
+
+    MAGIC = b"TXSCHED\0"
+    VERSION = 1
+    EXTENSION = ".bin"
+
+    HEADER = struct.Struct("<8sHBxQII4x")
+    RECORD = struct.Struct("<BxxxIiq")
+    STRING_LENGTH = struct.Struct("<I")
+
+    @staticmethod
+    def is_binary_schedule(file_path: str) -> bool:
+        # CHECK MAGIC BYTES OF FILE
+        with open(file_path, 'rb') as file:
+            return file.read(len(BinarySchedule.MAGIC)) == BinarySchedule.MAGIC
+
+    @staticmethod
+    def pack_header(compression: ScheduleCompression, record_count: int, transaction_count: int, resource_count: int) -> bytes:
+        return BinarySchedule.HEADER.pack(
+            BinarySchedule.MAGIC,
+            BinarySchedule.VERSION,
+            compression.value,
+            record_count,
+            transaction_count,
+            resource_count
+        )
+
+    @staticmethod
+    def unpack_header(data: bytes) -> tuple[ScheduleCompression, int, int, int]:
+        # RETURN COMPRESSION, RECORD COUNT, TRANSACTION ID COUNT AND RESOURCE ID COUNT
+        if (len(data) < BinarySchedule.HEADER.size):
+            raise InvalidScheduleFileException("Compiled schedule header is truncated")
+
+        magic, version, compression, record_count, transaction_count, resource_count = BinarySchedule.HEADER.unpack_from(data)
+
+        if (magic != BinarySchedule.MAGIC):
+            raise InvalidScheduleFileException("File is not a compiled schedule")
+
+        if (version != BinarySchedule.VERSION):
+            raise InvalidScheduleFileException(f"Unsupported compiled schedule version {version}")
+
+        try:
+            compression = ScheduleCompression(compression)
+
+        except ValueError:
+            raise InvalidScheduleFileException(f"Unknown compression {compression}")
+
+        return compression, record_count, transaction_count, resource_count
+
+    @staticmethod
+    def wrap_body(file: BinaryIO, compression: ScheduleCompression, mode: str) -> BinaryIO:
+        # WRAP FILE POSITIONED AT BODY START WITH DECOMPRESSOR ('rb') OR COMPRESSOR ('wb')
+        if (compression == ScheduleCompression.GZIP):
+            return gzip.GzipFile(fileobj=file, mode=mode)
+
+        if (compression == ScheduleCompression.XZ):
+            return lzma.LZMAFile(file, mode=mode)
+
+        return file
+
+    @staticmethod
+    def write_string_table(body: BinaryIO, ids: list[str]):
+        for id in ids:
+            data = id.encode('utf-8')
+            body.write(BinarySchedule.STRING_LENGTH.pack(len(data)))
+            body.write(data)
+
+    @staticmethod
+    def read_string_table(body: BinaryIO, count: int) -> list[str]:
+        ids: list[str] = []
+        length_size = BinarySchedule.STRING_LENGTH.size
+
+        for _ in range(count):
+            length_data = body.read(length_size)
+
+            if (len(length_data) < length_size):
+                raise InvalidScheduleFileException("Compiled schedule string table is truncated")
+
+            (length,) = BinarySchedule.STRING_LENGTH.unpack(length_data)
+            data = body.read(length)
+
+            if (len(data) < length):
+                raise InvalidScheduleFileException("Compiled schedule string table is truncated")
+
+            ids.append(data.decode('utf-8'))
+
+        return ids
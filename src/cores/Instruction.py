@@ -6,6 +6,8 @@ class InstructionType(Enum):
     R = "READ"
     W = "WRITE"
     C = "COMMIT"
+    U = "UPDATE"
+    A = "READ AS OF"
 
 class Instruction(ABC):
 
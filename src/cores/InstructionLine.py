@@ -0,0 +1,134 @@
+from cores.Instruction import InstructionType
+from cores.exceptions import InvalidInstructionLineException
+
+class InstructionLine:
+    # Values are stored as signed 64-bit integers by schedule columns, compiled schedules and resource store
+    MIN_VALUE = -(1 << 63)
+    MAX_VALUE = (1 << 63) - 1
+
+    def __init__(
+            self,
+            instruction_type: InstructionType,
+            transaction_id: str,
+            resource_id: str | None = None,
+            update_value: int | None = None
+        ) -> None:
+
+        self.instruction_type = instruction_type
+        self.transaction_id = transaction_id
+        self.resource_id = resource_id
+        self.update_value = update_value
+
+    @staticmethod
+    def is_skipped(line: str) -> bool:
+        # CHECK IF STRIPPED LINE IS EMPTY OR COMMENT
+        return not line or line.startswith("#")
+
+    @staticmethod
+    def parse(line: str) -> 'InstructionLine':
+        # PARSE 1 LINE OF INPUT FILE
+
+        line = line.strip()
+
+        # Extracting information based on the format
+        parts = line.split()
+
+        if not parts:
+            # Empty line
+            raise InvalidInstructionLineException("Empty line found")
+
+        if len(parts) == 1:
+            raise InvalidInstructionLineException("Missing transaction id")
+
+        instruction_type_str = parts[0].upper()
+        instruction_type = InstructionType[instruction_type_str] if instruction_type_str in InstructionType.__members__ else None
+
+        if not instruction_type:
+            # Invalid instruction type
+            raise InvalidInstructionLineException("Invalid instruction type found")
+
+        transaction_id = parts[1]
+        resource_id = None
+        update_value = None
+
+        if instruction_type == InstructionType.R or instruction_type == InstructionType.U:
+            instruction_name = "read" if instruction_type == InstructionType.R else "update"
+
+            if len(parts) == 2:
+                raise InvalidInstructionLineException("Missing resource id")
+
+            if len(parts) > 3:
+                raise InvalidInstructionLineException(f"Too many arguments for {instruction_name} instruction")
+
+            if '=' in parts[2]:
+                raise InvalidInstructionLineException(f"Forbidden character in resource id for {instruction_name} instruction: '='")
+
+            # Read instruction, update instruction is a read that announces a later write
+            resource_id = parts[2]
+
+        elif instruction_type == InstructionType.A:
+            if len(parts) < 4:
+                raise InvalidInstructionLineException("Missing resource id or timestamp for read as of instruction")
+
+            if len(parts) > 4:
+                raise InvalidInstructionLineException("Too many arguments for read as of instruction")
+
+            if '=' in parts[2]:
+                raise InvalidInstructionLineException("Forbidden character in resource id for read as of instruction: '='")
+
+            # Read as of instruction, its timestamp is kept as update value
+            resource_id = parts[2]
+
+            try:
+                update_value = int(parts[3])
+
+            except ValueError:
+                raise InvalidInstructionLineException("Timestamp on read as of instruction must be integer")
+
+            if update_value < 0:
+                raise InvalidInstructionLineException("Timestamp on read as of instruction must not be negative")
+
+            if update_value > InstructionLine.MAX_VALUE:
+                raise InvalidInstructionLineException("Timestamp on read as of instruction is out of 64-bit range")
+
+        elif instruction_type == InstructionType.W:
+            if len(parts) == 2:
+                raise InvalidInstructionLineException("Missing resource id")
+
+            if len(parts) > 3:
+                raise InvalidInstructionLineException("Too many arguments for write instruction")
+
+            if '=' not in parts[2]:
+                raise InvalidInstructionLineException("Missing update value on write instruction")
+
+            resource_part = parts[2].split('=')
+
+            if len(resource_part) > 2:
+                raise InvalidInstructionLineException("Too many '=' character in write instruction")
+
+            # Write instruction
+            resource_id, update_value = resource_part
+
+            try:
+                update_value = int(update_value)
+
+            except ValueError:
+                raise InvalidInstructionLineException("Update value on write instruction must be integer")
+
+            if not (InstructionLine.MIN_VALUE <= update_value <= InstructionLine.MAX_VALUE):
+                raise InvalidInstructionLineException("Update value on write instruction is out of 64-bit range")
+
+        return InstructionLine(instruction_type, transaction_id, resource_id, update_value)
+
+    def to_text(self) -> str:
+        # FORMAT INSTRUCTION LINE BACK TO INPUT FILE SYNTAX
+        if (self.instruction_type == InstructionType.W):
+            return f"{self.instruction_type.name} {self.transaction_id} {self.resource_id}={self.update_value}"
+
+        if (self.instruction_type == InstructionType.A):
+            return f"{self.instruction_type.name} {self.transaction_id} {self.resource_id} {self.update_value}"
+
+        if (self.resource_id is not None):
+            return f"{self.instruction_type.name} {self.transaction_id} {self.resource_id}"
+
+        return f"{self.instruction_type.name} {self.transaction_id}"
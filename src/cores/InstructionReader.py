@@ -1,103 +1,30 @@
 from abc import ABC, abstractmethod
 from cores.Instruction import InstructionType
-from cores.exceptions import InvalidInstructionLineException
+from cores.InstructionLine import InstructionLine
 from cores.Instruction import Instruction
-
-class InstructionLine:
-    def __init__(
-            self, 
-            instruction_type: InstructionType, 
-            transaction_id: str, 
-            resource_id: str | None = None,
-            update_value: int | None = None
-        ) -> None:
-
-        self.instruction_type = instruction_type
-        self.transaction_id = transaction_id
-        self.resource_id = resource_id
-        self.update_value = update_value
+from cores.sources import ScheduleSource, TextScheduleSource, BulkTextScheduleSource, BinaryScheduleSource
+from cores.BinarySchedule import BinarySchedule
 
 class InstructionReader(ABC):
-    def __init__(self, file_path: str) -> None:
-        self.__file = open(file_path, 'r')
+    def __init__(self, file_path: str, bulk: bool = False) -> None:
+        self.__source = self._open_source(file_path, bulk)
         self.__is_closed = False
 
-    def __parse_line(self, line: str) -> InstructionLine:
-        # PARSE 1 LINE OF INPUT FILE
-
-        line = line.strip()
-
-        # Extracting information based on the format
-        parts = line.split()
-
-        if not parts:
-            # Empty line
-            raise InvalidInstructionLineException("Empty line found")
-
-        if len(parts) == 1:
-            raise InvalidInstructionLineException("Missing transaction id")
-
-        instruction_type_str = parts[0].upper()
-        instruction_type = InstructionType[instruction_type_str] if instruction_type_str in InstructionType.__members__ else None
-
-        if not instruction_type:
-            # Invalid instruction type
-            raise InvalidInstructionLineException("Invalid instruction type found")
-
-        transaction_id = parts[1]
-        resource_id = None
-        update_value = None
-
-        if instruction_type == InstructionType.R:
-            if len(parts) == 2:
-                raise InvalidInstructionLineException("Missing resource id")
-            
-            if len(parts) > 3:
-                raise InvalidInstructionLineException("Too many arguments for read instruction")
+    @staticmethod
+    def _open_source(file_path: str, bulk: bool = False) -> ScheduleSource:
+        # Compiled schedule is always streamed from its records
+        # Bulk mode parses text file in large blocks instead of line by line
+        if (BinarySchedule.is_binary_schedule(file_path)):
+            return BinaryScheduleSource(file_path)
 
-            if '=' in parts[2]:
-                raise InvalidInstructionLineException("Forbidden character in resource id for read instruction: '='")
-            
-            # Read instruction
-            resource_id = parts[2]
+        if (bulk):
+            return BulkTextScheduleSource(file_path)
 
-        elif instruction_type == InstructionType.W:
-
-            if len(parts) > 3:
-                raise InvalidInstructionLineException("Too many arguments for write instruction")
-            
-            if '=' not in parts[2]:
-                raise InvalidInstructionLineException("Missing update value on write instruction")
-            
-            resource_part = parts[2].split('=')
-
-            if len(resource_part) > 2:
-                raise InvalidInstructionLineException("Too many '=' character in write instruction")
-
-            # Write instruction
-            resource_id, update_value = resource_part
-            update_value = int(update_value)
-
-        return InstructionLine(instruction_type, transaction_id, resource_id, update_value)
+        return TextScheduleSource(file_path)
 
     def _read_line(self) -> InstructionLine:
-        # READ 1 LINE OF INPUT FILE
-
-        line = ""
-
-        while True: 
-            line = self.__file.readline()
-
-            if not line:
-                # End-of-file reached
-                raise EOFError("End of file reached")
-            
-            line = line.strip()
-
-            if (not line.startswith("#") and len(line)):
-                break
-
-        return self.__parse_line(line)
+        # READ NEXT INSTRUCTION LINE OF INPUT FILE
+        return self.__source.next_line()
     
     @abstractmethod
     def _get_instruction_from_line(self, instruction_line: InstructionLine) -> Instruction:
@@ -110,7 +37,7 @@ class InstructionReader(ABC):
 
     def close(self):
         # CLOSE FILE READ
-        self.__file.close()
+        self.__source.close()
         self.__is_closed = True
 
     def is_closed(self):
@@ -118,6 +45,6 @@ class InstructionReader(ABC):
         return self.__is_closed
 
     def __del__(self):
-        if hasattr(self, '__file') and self.__file is not None:
-            self.__file.close()
+        if (hasattr(self, '_InstructionReader__source') and not self.__is_closed):
+            self.__source.close()
     
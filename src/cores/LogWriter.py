@@ -1,10 +1,195 @@
+import atexit
+import sys
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import TextIO
+
+class LogLevel(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    SUMMARY = 30
+    SILENT = 100
+
+# Log record format: tuple of writer name and message arguments
+# Writer name None means arguments is a raw line that is printed as is
+LogRecord = tuple[str | None, tuple]
+
+def format_log_record(record: LogRecord) -> str:
+    name, args = record
+
+    if (name is None):
+        return args[0]
+
+    return f"[{name}] " + ' '.join(map(str, args))
+
+class LogSink(ABC):
+
+    @abstractmethod
+    def emit(self, record: LogRecord):
+        # RECEIVE ONE LOG RECORD THAT PASSED LEVEL CHECK
+        pass
+
+    def flush(self):
+        # WRITE EVERY PENDING RECORD
+        pass
+
+    def close(self):
+        self.flush()
+
+class ConsoleLogSink(LogSink):
+    # Print every record synchronously (default behaviour)
+
+    def emit(self, record: LogRecord):
+        print(format_log_record(record))
+
+class BufferedLogSink(LogSink):
+    # Collect records and write them in batches from a background thread
+    # Records are formatted in the calling thread, so logged arguments may be mutated right after logging
+
+    def __init__(self, stream: TextIO | None = None, batch_size: int = 4096, flush_interval: float = 0.05) -> None:
+        self.__stream = stream if stream is not None else sys.stdout
+        self.__batch_size = batch_size
+        self.__flush_interval = flush_interval
+        self.__lines: list[str] = []
+        self.__condition = threading.Condition()
+        self.__pending_flush = 0
+        self.__is_closed = False
+
+        self.__thread = threading.Thread(target=self.__run, name="BufferedLogSink", daemon=True)
+        self.__thread.start()
+        atexit.register(self.close)
+
+    def __write_batch(self, lines: list[str]):
+        if (lines):
+            self.__stream.write('\n'.join(lines) + '\n')
+            self.__stream.flush()
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                if (not self.__is_closed and not self.__pending_flush and len(self.__lines) < self.__batch_size):
+                    self.__condition.wait(self.__flush_interval)
+
+                lines = self.__lines
+                self.__lines = []
+                flush_requests = self.__pending_flush
+                is_closed = self.__is_closed
+
+            self.__write_batch(lines)
+
+            with self.__condition:
+                self.__pending_flush -= flush_requests
+                self.__condition.notify_all()
+
+            if (is_closed):
+                break
+
+    def emit(self, record: LogRecord):
+        line = format_log_record(record)
+
+        with self.__condition:
+            if (self.__is_closed):
+                self.__write_batch([line])
+                return
+
+            self.__lines.append(line)
+
+            if (len(self.__lines) >= self.__batch_size):
+                self.__condition.notify_all()
+
+    def flush(self):
+        # BLOCK UNTIL EVERY RECORD EMITTED BEFORE THIS CALL IS WRITTEN
+        with self.__condition:
+            if (self.__is_closed):
+                return
+
+            self.__pending_flush += 1
+            self.__condition.notify_all()
+
+            while (self.__pending_flush > 0 and self.__thread.is_alive()):
+                self.__condition.wait(self.__flush_interval)
+
+    def close(self):
+        with self.__condition:
+            if (self.__is_closed):
+                return
+
+            self.__is_closed = True
+            self.__condition.notify_all()
+
+        self.__thread.join()
+        atexit.unregister(self.close)
+
 class LogWriter:
+    # Level and sink are shared by every log writer
+    __level: LogLevel = LogLevel.INFO
+    __threshold: int = LogLevel.INFO
+    __is_in_summary: bool = False
+    __sink: LogSink = ConsoleLogSink()
+
     def __init__(self, name: str) -> None:
         self.__name = name
 
-    def console_log(self, *args):
-        formatted_message = f"[{self.__name}] " + ' '.join(map(str, args))
-        print(formatted_message)
+    @staticmethod
+    def __update_threshold():
+        # Summary section shows normal messages unless logging is fully silenced
+        if (LogWriter.__is_in_summary and LogWriter.__level <= LogLevel.SUMMARY):
+            LogWriter.__threshold = min(LogWriter.__level, LogLevel.INFO)
+        else:
+            LogWriter.__threshold = LogWriter.__level
+
+    @staticmethod
+    def configure(level: LogLevel | None = None, sink: LogSink | None = None):
+        # SET MINIMUM LEVEL AND/OR OUTPUT SINK OF ALL LOG WRITERS
+        # LEVEL SUMMARY IS QUIET MODE: ONLY THE END SUMMARY IS PRINTED
+        if (sink is not None and sink is not LogWriter.__sink):
+            LogWriter.__sink.close()
+            LogWriter.__sink = sink
+
+        if (level is not None):
+            LogWriter.__level = level
+
+        LogWriter.__update_threshold()
+
+    @staticmethod
+    def get_level() -> LogLevel:
+        return LogWriter.__level
+
+    @staticmethod
+    def is_enabled(level: LogLevel = LogLevel.INFO) -> bool:
+        # USE THIS TO SKIP BUILDING EXPENSIVE LOG ARGUMENTS
+        return level >= LogWriter.__threshold
+
+    @staticmethod
+    @contextmanager
+    def summary():
+        # EVERY MESSAGE LOGGED INSIDE THIS CONTEXT IS PART OF THE SUMMARY
+        previous = LogWriter.__is_in_summary
+        LogWriter.__is_in_summary = True
+        LogWriter.__update_threshold()
+
+        try:
+            yield
+
+        finally:
+            LogWriter.__is_in_summary = previous
+            LogWriter.__update_threshold()
+
+    @staticmethod
+    def flush():
+        LogWriter.__sink.flush()
+
+    def console_log(self, *args, level: LogLevel = LogLevel.INFO):
+        # Formatting is left to the sink so disabled messages cost only this comparison
+        if (level < LogWriter.__threshold):
+            return
+
+        LogWriter.__sink.emit((self.__name, args))
+
+    def console_log_separator(self, level: LogLevel = LogLevel.INFO):
+        if (level < LogWriter.__threshold):
+            return
 
-    def console_log_separator(self):
-        print("===============================================================")
\ No newline at end of file
+        LogWriter.__sink.emit((None, ("===============================================================",)))
@@ -1,51 +1,107 @@
-from cores.Resource import Resource
+from array import array
+from typing import Iterable
 from cores.LogWriter import LogWriter
 
 class ResourceManager:
+    # Resource ids are interned to dense slots and values are kept in one typed array
+    # Value of resource with slot i is values[i], values are signed 64-bit like values of compiled schedules
+
     def __init__(self) -> None:
-        self.__resources: dict[str, Resource] = {}
+        self.__resource_ids: list[str] = []
+        self.__resource_slots: dict[str, int] = {}
+        self.__values = array('q')
         self.__log_writer = LogWriter("RESOURCE MANAGER")
 
     def _console_log(self, *args):
         # USE THIS FOR PRINTING FROM RESOURCE MANAGER PERSPECTIVE
         self.__log_writer.console_log(*args)
 
-    def __is_resource_exist(self, id: str) -> bool:
-        return self.__resources.get(id) is not None
-    
-    def __create_resource_if_not_exist(self, id: str, value: int = 0):
-        # RESOURCE HAS VALUE 0 BY DEFAULT
-        if not self.__is_resource_exist(id):
-            self.__resources[id] = Resource(id, value)
+    def intern_resource(self, id: str, value: int = 0) -> int:
+        # RETURN SLOT OF RESOURCE, NEW RESOURCE GETS THE NEXT SLOT AND VALUE 0 BY DEFAULT
+        slot = self.__resource_slots.get(id)
+
+        if (slot is None):
+            slot = len(self.__resource_ids)
+            self.__resource_slots[id] = slot
+            self.__resource_ids.append(id)
+            self.__values.append(value)
+
+        return slot
 
     def read(self, id: str) -> int:
         # READ THE VALUE OF CERTAIN RESOURCE
         # RETURN 0 IF RESOURCE IS NEW
-        self.__create_resource_if_not_exist(id)
-        resource = self.__resources.get(id)
-        return resource.get_value()
-    
+        slot = self.__resource_slots.get(id)
+
+        if (slot is None):
+            slot = self.intern_resource(id)
+
+        return self.__values[slot]
+
+    def peek(self, id: str) -> int:
+        # READ THE VALUE OF CERTAIN RESOURCE WITHOUT CREATING IT
+        # RETURN 0 IF RESOURCE DOES NOT EXIST
+        slot = self.__resource_slots.get(id)
+        return 0 if slot is None else self.__values[slot]
+
     def write(self, id: str, value: int) -> int:
         # UPDATE THE VALUE OF CERTAIN RESOURCE AND RETURN THE OLD VALUE
-        self.__create_resource_if_not_exist(id)
-        resource = self.__resources.get(id)
-        old_value = resource.get_value()
-        resource.set_value(value)
+        slot = self.__resource_slots.get(id)
+
+        if (slot is None):
+            slot = self.intern_resource(id)
+
+        old_value = self.__values[slot]
+        self.__values[slot] = value
         return old_value
 
+    def read_many(self, ids: Iterable[str]) -> array:
+        # READ VALUES OF MANY RESOURCES AT ONCE, IN ORDER OF IDS
+        intern_resource = self.intern_resource
+        values = self.__values
+        return array('q', [values[intern_resource(id)] for id in ids])
+
+    def write_many(self, ids: Iterable[str], values: Iterable[int]) -> array:
+        # UPDATE VALUES OF MANY RESOURCES AT ONCE AND RETURN THEIR OLD VALUES
+        # Same id given twice is written in order, so the last value stays
+        slots = [self.intern_resource(id) for id in ids]
+        new_values = array('q', values)
+
+        if (len(slots) != len(new_values)):
+            raise ValueError("Number of resource ids and values must be the same")
+
+        current_values = self.__values
+        old_values = array('q')
+
+        for slot, value in zip(slots, new_values):
+            old_values.append(current_values[slot])
+            current_values[slot] = value
+
+        return old_values
+
+    def get_resource_ids(self) -> list[str]:
+        # RESOURCE IDS IN SLOT ORDER
+        return self.__resource_ids
+
+    def get_values(self) -> array:
+        # COPY OF VALUES IN SLOT ORDER, COPYING IS ONE MEMORY COPY OF THE WHOLE BUFFER
+        return array('q', self.__values)
+
+    def get_resource_count(self) -> int:
+        return len(self.__resource_ids)
+
+    def get_memory_size(self) -> int:
+        # BYTES TAKEN BY THE VALUE BUFFER, NOT COUNTING INTERNED ID STRINGS
+        return self.__values.buffer_info()[1] * self.__values.itemsize
+
     def print_snapshot(self):
         # PRINT ALL RESOURCE VALUE AT THIS MOMENT
         self.__log_writer.console_log("[ Resource snapshot ]")
-        for key, value in self.__resources.items():
-            self.__log_writer.console_log("Resource", key, "=", value.get_value())
+        for key, value in zip(self.__resource_ids, self.__values):
+            self.__log_writer.console_log("Resource", key, "=", value)
 
-        if (not bool(self.__resources)):
+        if (not bool(self.__resource_ids)):
             self.__log_writer.console_log("No resource data")
 
     def get_snapshot(self) -> dict[str, int]:
-        snapshot: dict[str, int] = {}
-
-        for resource_id, resource in self.__resources.items():
-            snapshot[resource_id] = resource.get_value()
-
-        return snapshot
\ No newline at end of file
+        return dict(zip(self.__resource_ids, self.__values))
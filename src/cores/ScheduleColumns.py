@@ -0,0 +1,121 @@
+from array import array
+from cores.Instruction import InstructionType
+from cores.InstructionLine import InstructionLine
+
+class ScheduleColumns:
+    # Columnar storage of parsed instructions
+    # Instruction i is (op_codes[i], transaction_slots[i], resource_slots[i], values[i])
+    # Transaction and resource ids are interned, so every column is a compact typed array
+
+    # New types are appended so op codes of compiled schedules stay valid
+    OP_TYPES: list[InstructionType] = [InstructionType.R, InstructionType.W, InstructionType.C, InstructionType.U, InstructionType.A]
+    OP_CODES: dict[InstructionType, int] = {type: code for code, type in enumerate(OP_TYPES)}
+
+    # Instruction types whose value column is given back as update value, read as of keeps its timestamp there
+    VALUE_TYPES: set[InstructionType] = {InstructionType.W, InstructionType.A}
+
+    # Resource slot of instruction without resource (commit)
+    NO_RESOURCE = -1
+
+    def __init__(self) -> None:
+        self.__transaction_ids: list[str] = []
+        self.__transaction_slots: dict[str, int] = {}
+        self.__resource_ids: list[str] = []
+        # None maps to NO_RESOURCE so raw resource columns can be mapped directly
+        self.__resource_slots: dict[str | None, int] = {None: self.NO_RESOURCE}
+
+        self.__op_code_column = array('B')
+        self.__transaction_column = array('i')
+        self.__resource_column = array('i')
+        self.__value_column = array('q')
+
+    def intern_transaction(self, transaction_id: str) -> int:
+        slot = self.__transaction_slots.get(transaction_id)
+
+        if (slot is None):
+            slot = len(self.__transaction_ids)
+            self.__transaction_slots[transaction_id] = slot
+            self.__transaction_ids.append(transaction_id)
+
+        return slot
+
+    def intern_resource(self, resource_id: str) -> int:
+        slot = self.__resource_slots.get(resource_id)
+
+        if (slot is None):
+            slot = len(self.__resource_ids)
+            self.__resource_slots[resource_id] = slot
+            self.__resource_ids.append(resource_id)
+
+        return slot
+
+    def append(self, op_code: int, transaction_slot: int, resource_slot: int = NO_RESOURCE, value: int = 0):
+        self.__op_code_column.append(op_code)
+        self.__transaction_column.append(transaction_slot)
+        self.__resource_column.append(resource_slot)
+        self.__value_column.append(value)
+
+    def append_line(self, instruction_line: InstructionLine):
+        resource_id = instruction_line.resource_id
+        update_value = instruction_line.update_value
+
+        self.append(
+            self.OP_CODES[instruction_line.instruction_type],
+            self.intern_transaction(instruction_line.transaction_id),
+            self.NO_RESOURCE if resource_id is None else self.intern_resource(resource_id),
+            0 if update_value is None else update_value
+        )
+
+    def extend(self, op_codes: array, transaction_ids: list[str], resource_ids: list[str | None], values: array):
+        # APPEND MANY INSTRUCTIONS GIVEN AS RAW COLUMNS AND INTERN ALL OF THEIR IDS AT ONCE
+        for transaction_id in dict.fromkeys(transaction_ids):
+            self.intern_transaction(transaction_id)
+
+        for resource_id in dict.fromkeys(resource_ids):
+            if (resource_id is not None):
+                self.intern_resource(resource_id)
+
+        self.__op_code_column.extend(op_codes)
+        self.__transaction_column.extend(map(self.__transaction_slots.__getitem__, transaction_ids))
+        self.__resource_column.extend(map(self.__resource_slots.__getitem__, resource_ids))
+        self.__value_column.extend(values)
+
+    def get_line(self, index: int) -> InstructionLine:
+        # BUILD INSTRUCTION LINE OF CERTAIN INDEX ON DEMAND
+        instruction_type = self.OP_TYPES[self.__op_code_column[index]]
+        resource_slot = self.__resource_column[index]
+
+        return InstructionLine(
+            instruction_type,
+            self.__transaction_ids[self.__transaction_column[index]],
+            None if resource_slot == self.NO_RESOURCE else self.__resource_ids[resource_slot],
+            self.__value_column[index] if instruction_type in self.VALUE_TYPES else None
+        )
+
+    def clear(self):
+        # REMOVE ALL INSTRUCTIONS BUT KEEP INTERNED IDS
+        del self.__op_code_column[:]
+        del self.__transaction_column[:]
+        del self.__resource_column[:]
+        del self.__value_column[:]
+
+    def get_transaction_ids(self) -> list[str]:
+        return self.__transaction_ids
+
+    def get_resource_ids(self) -> list[str]:
+        return self.__resource_ids
+
+    def get_op_code_column(self) -> array:
+        return self.__op_code_column
+
+    def get_transaction_column(self) -> array:
+        return self.__transaction_column
+
+    def get_resource_column(self) -> array:
+        return self.__resource_column
+
+    def get_value_column(self) -> array:
+        return self.__value_column
+
+    def __len__(self) -> int:
+        return len(self.__op_code_column)
@@ -0,0 +1,75 @@
+from array import array
+from cores.BinarySchedule import BinarySchedule, ScheduleCompression
+from cores.sources import BulkTextScheduleSource, BinaryScheduleSource
+
+class ScheduleCompiler:
+
+    @staticmethod
+    def compile(text_path: str, binary_path: str, compression: ScheduleCompression = ScheduleCompression.NONE) -> int:
+        # COMPILE TEXT SCHEDULE INTO BINARY SCHEDULE AND RETURN NUMBER OF INSTRUCTIONS
+        source = BulkTextScheduleSource(text_path)
+
+        op_codes = array('B')
+        transaction_slots = array('i')
+        resource_slots = array('i')
+        values = array('q')
+        columns = None
+
+        try:
+            while True:
+                block = source.next_block()
+
+                if (block is None):
+                    break
+
+                columns = block
+                op_codes.extend(block.get_op_code_column())
+                transaction_slots.extend(block.get_transaction_column())
+                resource_slots.extend(block.get_resource_column())
+                values.extend(block.get_value_column())
+
+        finally:
+            source.close()
+
+        transaction_ids = columns.get_transaction_ids() if columns is not None else []
+        resource_ids = columns.get_resource_ids() if columns is not None else []
+        record_count = len(op_codes)
+
+        with open(binary_path, 'wb') as file:
+            file.write(BinarySchedule.pack_header(compression, record_count, len(transaction_ids), len(resource_ids)))
+            body = BinarySchedule.wrap_body(file, compression, 'wb')
+
+            BinarySchedule.write_string_table(body, transaction_ids)
+            BinarySchedule.write_string_table(body, resource_ids)
+
+            pack = BinarySchedule.RECORD.pack
+            body.write(b''.join(map(pack, op_codes, transaction_slots, resource_slots, values)))
+
+            if (body is not file):
+                body.close()
+
+        return record_count
+
+    @staticmethod
+    def decompile(binary_path: str, text_path: str) -> int:
+        # WRITE BINARY SCHEDULE BACK AS TEXT SCHEDULE AND RETURN NUMBER OF INSTRUCTIONS
+        source = BinaryScheduleSource(binary_path)
+        count = 0
+
+        try:
+            with open(text_path, 'w') as file:
+                while True:
+                    try:
+                        instruction_line = source.next_line()
+
+                    except EOFError:
+                        break
+
+                    file.write(instruction_line.to_text())
+                    file.write('\n')
+                    count += 1
+
+        finally:
+            source.close()
+
+        return count
@@ -1,8 +1,24 @@
-import time
+from cores.clocks import Clock, LogicalClock
 
 class TimeStamp:
+    # Clock used by every transaction and resource version
+    # Logical clock by default so runs are reproducible and timestamps never collide
+    __clock: Clock = LogicalClock()
+
+    @staticmethod
+    def time() -> int:
+        return TimeStamp.__clock.next()
+
+    @staticmethod
+    def current() -> int:
+        # RETURN LAST ISSUED TIMESTAMP WITHOUT ISSUING A NEW ONE
+        return TimeStamp.__clock.current()
+
+    @staticmethod
+    def get_clock() -> Clock:
+        return TimeStamp.__clock
+
     @staticmethod
-    def time():
-        # solve bug when timestamp for 2 transaction is equal
-        time.sleep(1e-7)
-        return time.time()
\ No newline at end of file
+    def set_clock(clock: Clock):
+        # REPLACE CLOCK USED BY ALL TRANSACTIONS CREATED AFTER THIS CALL
+        TimeStamp.__clock = clock
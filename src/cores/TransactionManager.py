@@ -2,21 +2,31 @@ from abc import ABC, abstractmethod
 from typing import TypeVar
 from cores.InstructionReader import InstructionReader
 from cores.Instruction import Instruction
-from cores.LogWriter import LogWriter
+from cores.LogWriter import LogWriter, LogLevel
+from cores.Timestamp import TimeStamp
+from cores.clocks import Clock, LogicalClock
+from cores.TransactionStatistics import TransactionStatistics
 
 Reader = TypeVar('Reader', bound=InstructionReader)
 
 class TransactionManager(ABC):
-    def __init__(self, instruction_reader: Reader) -> None:
+    def __init__(self, instruction_reader: Reader, clock: Clock | None = None) -> None:
         super().__init__()
 
+        # Every run starts from fresh clock so timestamps are reproducible
+        TimeStamp.set_clock(clock if clock is not None else LogicalClock())
+
         self.__instruction_reader: Reader = instruction_reader
         self.__log_writer = LogWriter("TRANSACTION MANAGER")
+        self.__statistics = TransactionStatistics()
 
-    def _console_log(self, *args):
+    def _console_log(self, *args, level: LogLevel = LogLevel.INFO):
         # USE THIS FOR PRINTING FROM TRANSACTION MANAGER PERSPECTIVE
-        self.__log_writer.console_log(*args)
+        self.__log_writer.console_log(*args, level=level)
     
+    def get_statistics(self) -> TransactionStatistics:
+        return self.__statistics
+
     def _is_reader_closed(self) -> bool:
         return self.__instruction_reader.is_closed()
     
@@ -51,6 +61,7 @@ class TransactionManager(ABC):
 
                 if (not self._is_reader_closed()):
                     instruction = self._get_next_instruction_from_file()
+                    self.__statistics.add_instruction()
                     
                 else:
                     instruction = self._get_next_remaining_instruction()
@@ -63,9 +74,12 @@ class TransactionManager(ABC):
                 self.__instruction_reader.close()
 
                 if (self._is_finish_or_stop()):
-                    self.__log_writer.console_log_separator()
-                    self.__log_writer.console_log("[ No more instruction received ]")
-                    self._print_all_transactions_status()
-                    self.__log_writer.console_log_separator()
+                    with LogWriter.summary():
+                        self.__log_writer.console_log_separator()
+                        self.__log_writer.console_log("[ No more instruction received ]")
+                        self._print_all_transactions_status()
+                        self.__log_writer.console_log_separator()
                     break
 
+        LogWriter.flush()
+
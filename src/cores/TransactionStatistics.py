@@ -0,0 +1,58 @@
+class TransactionStatistics:
+    # Counters collected by transaction manager while running a schedule
+
+    def __init__(self) -> None:
+        self.__instruction_count = 0
+        self.__commit_count = 0
+        self.__abort_count = 0
+        self.__restart_count = 0
+        self.__wait_queue_peak = 0
+        self.__deadlock_count = 0
+
+    def add_instruction(self):
+        self.__instruction_count += 1
+
+    def add_commit(self):
+        self.__commit_count += 1
+
+    def add_abort(self):
+        self.__abort_count += 1
+
+    def add_restart(self):
+        self.__restart_count += 1
+
+    def add_deadlock(self):
+        self.__deadlock_count += 1
+
+    def record_wait_queue_size(self, size: int):
+        if (size > self.__wait_queue_peak):
+            self.__wait_queue_peak = size
+
+    def get_instruction_count(self) -> int:
+        # NUMBER OF INSTRUCTIONS READ FROM SCHEDULE
+        return self.__instruction_count
+
+    def get_commit_count(self) -> int:
+        return self.__commit_count
+
+    def get_abort_count(self) -> int:
+        return self.__abort_count
+
+    def get_restart_count(self) -> int:
+        return self.__restart_count
+
+    def get_wait_queue_peak(self) -> int:
+        return self.__wait_queue_peak
+
+    def get_deadlock_count(self) -> int:
+        return self.__deadlock_count
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "instructions": self.__instruction_count,
+            "commits": self.__commit_count,
+            "aborts": self.__abort_count,
+            "restarts": self.__restart_count,
+            "wait_queue_peak": self.__wait_queue_peak,
+            "deadlocks": self.__deadlock_count
+        }
@@ -0,0 +1,28 @@
+from cores.Instruction import Instruction
+
+class WaitQueue:
+    # Instructions waiting in arrival order, indexed by transaction id
+    # Each instruction gets a sequence number, dict keeps them in arrival order and removes any of them in constant time
+
+    def __init__(self) -> None:
+        self.__instructions: dict[int, Instruction] = {}
+        self.__transaction_sequences: dict[str, list[int]] = {}
+        self.__next_sequence = 0
+
+    def append(self, instruction: Instruction):
+        sequence = self.__next_sequence
+        self.__next_sequence += 1
+
+        self.__instructions[sequence] = instruction
+        self.__transaction_sequences.setdefault(instruction.get_transaction_id(), []).append(sequence)
+
+    def pop_transaction(self, transaction_id: str) -> list[Instruction]:
+        # REMOVE ALL INSTRUCTIONS OF TRANSACTION AND RETURN THEM IN ARRIVAL ORDER
+        sequences = self.__transaction_sequences.pop(transaction_id, [])
+        return [self.__instructions.pop(sequence) for sequence in sequences]
+
+    def __len__(self) -> int:
+        return len(self.__instructions)
+
+    def __iter__(self):
+        return iter(self.__instructions.values())
@@ -0,0 +1,140 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+
+class Clock(ABC):
+
+    @abstractmethod
+    def next(self) -> int:
+        # RETURN NEW TIMESTAMP THAT IS STRICTLY LARGER THAN EVERY TIMESTAMP ISSUED BEFORE
+        pass
+
+    @abstractmethod
+    def reserve(self, count: int) -> range:
+        # RESERVE COUNT CONSECUTIVE TIMESTAMPS AT ONCE AND RETURN THEM AS A RANGE
+        pass
+
+    @abstractmethod
+    def current(self) -> int:
+        # RETURN LAST ISSUED TIMESTAMP WITHOUT ISSUING A NEW ONE
+        pass
+
+class LogicalClock(Clock):
+    # Strictly monotonic integer counter, timestamps start from start + 1
+    # Timestamp 0 is never issued so it can be used as "before every transaction"
+
+    def __init__(self, start: int = 0) -> None:
+        self.__value = start
+        self.__lock = threading.Lock()
+
+    def next(self) -> int:
+        with self.__lock:
+            self.__value += 1
+            return self.__value
+
+    def reserve(self, count: int) -> range:
+        if (count < 1):
+            raise ValueError("Reserved timestamp count must be positive")
+
+        with self.__lock:
+            start = self.__value + 1
+            self.__value += count
+            return range(start, self.__value + 1)
+
+    def current(self) -> int:
+        return self.__value
+
+class HybridLogicalClock(Clock):
+    # Hybrid logical clock: physical milliseconds in the high bits and logical counter in the low bits
+    # Timestamp stays close to wall time but is still strictly monotonic when wall time stalls or goes back
+
+    LOGICAL_BITS = 16
+    LOGICAL_MASK = (1 << LOGICAL_BITS) - 1
+
+    def __init__(self) -> None:
+        self.__physical = 0
+        self.__logical = 0
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def __wall_time() -> int:
+        return time.time_ns() // 1_000_000
+
+    def __encode(self) -> int:
+        return (self.__physical << self.LOGICAL_BITS) | self.__logical
+
+    def __advance(self, count: int) -> int:
+        # MOVE CLOCK FORWARD BY COUNT TICKS AND RETURN THE FIRST NEW TIMESTAMP
+        wall_time = self.__wall_time()
+
+        if (wall_time > self.__physical):
+            start = wall_time << self.LOGICAL_BITS
+        else:
+            start = self.__encode() + 1
+
+        last = start + count - 1
+        self.__physical = last >> self.LOGICAL_BITS
+        self.__logical = last & self.LOGICAL_MASK
+
+        return start
+
+    def next(self) -> int:
+        with self.__lock:
+            return self.__advance(1)
+
+    def reserve(self, count: int) -> range:
+        if (count < 1):
+            raise ValueError("Reserved timestamp count must be positive")
+
+        with self.__lock:
+            start = self.__advance(count)
+            return range(start, start + count)
+
+    def current(self) -> int:
+        return self.__encode()
+
+    def observe(self, timestamp: int):
+        # MERGE TIMESTAMP RECEIVED FROM OTHER CLOCK SO NEXT TIMESTAMP IS LARGER THAN IT
+        with self.__lock:
+            if (timestamp > self.__encode()):
+                self.__physical = timestamp >> self.LOGICAL_BITS
+                self.__logical = timestamp & self.LOGICAL_MASK
+
+    @classmethod
+    def to_wall_time(cls, timestamp: int) -> float:
+        # CONVERT HYBRID TIMESTAMP TO WALL TIME IN SECONDS
+        return (timestamp >> cls.LOGICAL_BITS) / 1000
+
+class BlockClock(Clock):
+    # Hand out timestamps from blocks reserved from a shared source clock
+    # Only one call to the source clock is made for every block_size timestamps
+
+    def __init__(self, source: Clock, block_size: int = 1024) -> None:
+        if (block_size < 1):
+            raise ValueError("Block size must be positive")
+
+        self.__source = source
+        self.__block_size = block_size
+        self.__next_value = 0
+        self.__block_end = 0
+        self.__last_value = 0
+
+    def next(self) -> int:
+        if (self.__next_value >= self.__block_end):
+            block = self.__source.reserve(self.__block_size)
+            self.__next_value = block.start
+            self.__block_end = block.stop
+
+        self.__last_value = self.__next_value
+        self.__next_value += 1
+        return self.__last_value
+
+    def reserve(self, count: int) -> range:
+        # Drop the rest of current block so next timestamp is still larger than the reserved ones
+        timestamps = self.__source.reserve(count)
+        self.__next_value = self.__block_end
+        self.__last_value = timestamps[-1]
+        return timestamps
+
+    def current(self) -> int:
+        return self.__last_value
@@ -3,5 +3,17 @@
 #         super().__init__(message)
 
 class InvalidInstructionLineException(Exception):
-    def __init__(self, message="Invalid instruction line found in input file"):
-        super().__init__(message)
\ No newline at end of file
+    def __init__(self, message="Invalid instruction line found in input file", line_number: int | None = None):
+        self.__line_number = line_number
+
+        if (line_number is not None):
+            message = f"{message} (line {line_number})"
+
+        super().__init__(message)
+
+    def get_line_number(self) -> int | None:
+        return self.__line_number
+
+class InvalidScheduleFileException(Exception):
+    def __init__(self, message="Invalid compiled schedule file"):
+        super().__init__(message)
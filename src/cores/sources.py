@@ -0,0 +1,322 @@
+from abc import ABC, abstractmethod
+from array import array
+from cores.Instruction import InstructionType
+from cores.InstructionLine import InstructionLine
+from cores.ScheduleColumns import ScheduleColumns
+from cores.exceptions import InvalidInstructionLineException, InvalidScheduleFileException
+from cores.BinarySchedule import BinarySchedule, ScheduleCompression
+import mmap
+
+class ScheduleSource(ABC):
+
+    @abstractmethod
+    def next_line(self) -> InstructionLine:
+        # RETURN NEXT INSTRUCTION LINE OF THE SCHEDULE
+        # RAISE EOFError IF THERE IS NO MORE INSTRUCTION
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+class TextScheduleSource(ScheduleSource):
+    # Read and parse text schedule one line at a time
+
+    def __init__(self, file_path: str) -> None:
+        self.__file = open(file_path, 'r')
+        self.__line_number = 0
+
+    def next_line(self) -> InstructionLine:
+        line = ""
+
+        while True:
+            line = self.__file.readline()
+
+            if not line:
+                # End-of-file reached
+                raise EOFError("End of file reached")
+
+            self.__line_number += 1
+            line = line.strip()
+
+            if (not InstructionLine.is_skipped(line)):
+                break
+
+        try:
+            return InstructionLine.parse(line)
+
+        except InvalidInstructionLineException as e:
+            raise InvalidInstructionLineException(str(e), self.__line_number) from None
+
+    def close(self):
+        self.__file.close()
+
+class BulkTextScheduleSource(ScheduleSource):
+    # Read text schedule in large chunks and tokenize every chunk at once into schedule columns
+    # Instruction lines are only created when they are requested
+
+    DEFAULT_CHUNK_SIZE = 1 << 20
+
+    # Op code of every accepted instruction type token
+    OP_CODE_TOKENS: dict[str, int] = {
+        **{type.name: code for type, code in ScheduleColumns.OP_CODES.items()},
+        **{type.name.lower(): code for type, code in ScheduleColumns.OP_CODES.items()}
+    }
+
+    def __init__(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.__file = open(file_path, 'r')
+        self.__chunk_size = chunk_size
+        self.__columns = ScheduleColumns()
+        self.__position = 0
+        self.__line_number = 0
+        self.__remainder = ""
+        self.__is_file_finished = False
+        self.__pending_error: InvalidInstructionLineException | None = None
+
+    def __tokenize(self, text: str):
+        # PARSE COMPLETE LINES OF TEXT INTO SCHEDULE COLUMNS
+        # STOP AT FIRST INVALID LINE AND KEEP ITS ERROR UNTIL PREVIOUS INSTRUCTIONS ARE CONSUMED
+
+        op_codes = array('B')
+        transaction_ids: list[str] = []
+        resource_ids: list[str | None] = []
+        values = array('q')
+
+        append_op_code = op_codes.append
+        append_transaction_id = transaction_ids.append
+        append_resource_id = resource_ids.append
+        append_value = values.append
+        op_code_tokens = self.OP_CODE_TOKENS
+
+        read_code = ScheduleColumns.OP_CODES[InstructionType.R]
+        write_code = ScheduleColumns.OP_CODES[InstructionType.W]
+        commit_code = ScheduleColumns.OP_CODES[InstructionType.C]
+        update_code = ScheduleColumns.OP_CODES[InstructionType.U]
+        min_value = InstructionLine.MIN_VALUE
+        max_value = InstructionLine.MAX_VALUE
+
+        line_number = self.__line_number
+
+        for parts in map(str.split, text.split('\n')):
+            line_number += 1
+
+            if (not parts or parts[0][0] == '#'):
+                continue
+
+            code = op_code_tokens.get(parts[0])
+            count = len(parts)
+
+            # Fast path for well-formed lines, every other line is handled by the line parser
+            if ((code == read_code or code == update_code) and count == 3 and '=' not in parts[2]):
+                append_op_code(code)
+                append_transaction_id(parts[1])
+                append_resource_id(parts[2])
+                append_value(0)
+                continue
+
+            if (code == write_code and count == 3 and parts[2].count('=') == 1):
+                resource_id, _, value = parts[2].partition('=')
+
+                if (value.isdecimal() or (value[:1] in '+-' and value[1:].isdecimal())):
+                    int_value = int(value)
+
+                    # Value out of 64-bit range is reported by the line parser with its line number
+                    if (min_value <= int_value <= max_value):
+                        append_op_code(code)
+                        append_transaction_id(parts[1])
+                        append_resource_id(resource_id)
+                        append_value(int_value)
+                        continue
+
+            if (code == commit_code and count >= 2):
+                append_op_code(code)
+                append_transaction_id(parts[1])
+                append_resource_id(None)
+                append_value(0)
+                continue
+
+            try:
+                instruction_line = InstructionLine.parse(' '.join(parts))
+
+            except InvalidInstructionLineException as e:
+                self.__pending_error = InvalidInstructionLineException(str(e), line_number)
+                break
+
+            update_value = instruction_line.update_value
+
+            append_op_code(ScheduleColumns.OP_CODES[instruction_line.instruction_type])
+            append_transaction_id(instruction_line.transaction_id)
+            append_resource_id(instruction_line.resource_id)
+            append_value(0 if update_value is None else update_value)
+
+        self.__line_number = line_number
+        self.__columns.extend(op_codes, transaction_ids, resource_ids, values)
+
+    def __parse_next_block(self):
+        self.__columns.clear()
+        self.__position = 0
+
+        while (len(self.__columns) == 0 and self.__pending_error is None and not self.__is_file_finished):
+            chunk = self.__file.read(self.__chunk_size)
+            text = self.__remainder + chunk
+
+            if (not chunk):
+                self.__is_file_finished = True
+                self.__remainder = ""
+
+                if (not text):
+                    break
+
+            else:
+                # Keep incomplete last line for next chunk
+                cut = text.rfind('\n')
+
+                if (cut < 0):
+                    self.__remainder = text
+                    continue
+
+                self.__remainder = text[cut + 1:]
+                text = text[:cut]
+
+            self.__tokenize(text)
+
+    def next_block(self) -> ScheduleColumns | None:
+        # PARSE AND RETURN NEXT BLOCK OF INSTRUCTIONS, RETURN None IF THERE IS NO MORE INSTRUCTION
+        # RETURNED COLUMNS ARE REUSED BY NEXT BLOCK BUT ITS ID TABLES ARE SHARED BY ALL BLOCKS
+        self.__parse_next_block()
+
+        if (len(self.__columns) == 0):
+            if (self.__pending_error is not None):
+                raise self.__pending_error
+
+            return None
+
+        # Every instruction of the block is handed out at once
+        self.__position = len(self.__columns)
+
+        return self.__columns
+
+    def next_line(self) -> InstructionLine:
+        if (self.__position >= len(self.__columns)):
+            self.__parse_next_block()
+
+            if (len(self.__columns) == 0):
+                if (self.__pending_error is not None):
+                    raise self.__pending_error
+
+                raise EOFError("End of file reached")
+
+        instruction_line = self.__columns.get_line(self.__position)
+        self.__position += 1
+
+        return instruction_line
+
+    def close(self):
+        self.__file.close()
+
+class BinaryScheduleSource(ScheduleSource):
+    # Stream instructions from compiled schedule file
+    # Uncompressed file is memory-mapped and records are unpacked straight from the mapping
+
+    RECORDS_PER_READ = 4096
+
+    def __init__(self, file_path: str) -> None:
+        self.__file = open(file_path, 'rb')
+        self.__mapping: mmap.mmap | None = None
+        self.__view: memoryview | None = None
+
+        compression, self.__record_count, transaction_count, resource_count = BinarySchedule.unpack_header(
+            self.__file.read(BinarySchedule.HEADER.size)
+        )
+
+        if (compression == ScheduleCompression.NONE):
+            self.__mapping = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.__mapping.seek(BinarySchedule.HEADER.size)
+            body = self.__mapping
+
+        else:
+            body = BinarySchedule.wrap_body(self.__file, compression, 'rb')
+
+        self.__body = body
+        self.__transaction_ids = BinarySchedule.read_string_table(body, transaction_count)
+        self.__resource_ids = BinarySchedule.read_string_table(body, resource_count)
+
+        if (self.__mapping is not None):
+            start = self.__mapping.tell()
+            end = start + self.__record_count * BinarySchedule.RECORD.size
+
+            if (end > len(self.__mapping)):
+                raise InvalidScheduleFileException("Compiled schedule records are truncated")
+
+            self.__view = memoryview(self.__mapping)[start:end]
+            self.__records = BinarySchedule.RECORD.iter_unpack(self.__view)
+
+        else:
+            self.__records = self.__iterate_compressed_records()
+
+    def __iterate_compressed_records(self):
+        # DECOMPRESS AND UNPACK RECORDS IN CHUNKS
+        remaining = self.__record_count
+
+        while (remaining > 0):
+            count = min(remaining, self.RECORDS_PER_READ)
+            data = self.__body.read(count * BinarySchedule.RECORD.size)
+
+            if (len(data) < count * BinarySchedule.RECORD.size):
+                raise InvalidScheduleFileException("Compiled schedule records are truncated")
+
+            yield from BinarySchedule.RECORD.iter_unpack(data)
+            remaining -= count
+
+    def get_transaction_ids(self) -> list[str]:
+        return self.__transaction_ids
+
+    def get_resource_ids(self) -> list[str]:
+        return self.__resource_ids
+
+    def get_record_count(self) -> int:
+        return self.__record_count
+
+    def next_line(self) -> InstructionLine:
+        record = next(self.__records, None)
+
+        if (record is None):
+            raise EOFError("End of file reached")
+
+        op_code, transaction_slot, resource_slot, value = record
+
+        # Corrupt record would otherwise fail with index error, or silently pick a wrong id for negative resource slot
+        if (op_code >= len(ScheduleColumns.OP_TYPES)):
+            raise InvalidScheduleFileException(f"Unknown op code {op_code} in compiled schedule")
+
+        if (transaction_slot >= len(self.__transaction_ids)):
+            raise InvalidScheduleFileException(f"Transaction slot {transaction_slot} is outside compiled schedule string table")
+
+        if (resource_slot != ScheduleColumns.NO_RESOURCE and not 0 <= resource_slot < len(self.__resource_ids)):
+            raise InvalidScheduleFileException(f"Resource slot {resource_slot} is outside compiled schedule string table")
+
+        instruction_type = ScheduleColumns.OP_TYPES[op_code]
+
+        return InstructionLine(
+            instruction_type,
+            self.__transaction_ids[transaction_slot],
+            None if resource_slot == ScheduleColumns.NO_RESOURCE else self.__resource_ids[resource_slot],
+            value if instruction_type in ScheduleColumns.VALUE_TYPES else None
+        )
+
+    def close(self):
+        # Record iterator holds the mapped buffer, so it is dropped before the mapping is closed
+        self.__records = iter(())
+
+        if (self.__view is not None):
+            self.__view.release()
+            self.__view = None
+
+        if (self.__mapping is not None):
+            self.__mapping.close()
+            self.__mapping = None
+
+        elif (self.__body is not self.__file):
+            self.__body.close()
+
+        self.__file.close()
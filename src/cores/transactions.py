@@ -6,6 +6,8 @@ class TransactionStatus(Enum):
     WAITING = 1
     ROLLINGBACK = 2
     COMMITTED = 3
+    # Commit is logged but not acknowledged until its log record is durable
+    COMMITTING = 4
 
 class Transaction:
     def __init__(self, id: str) -> None:
@@ -30,6 +32,12 @@ class Transaction:
     def commit(self):
         self.__status = TransactionStatus.COMMITTED
 
+    def is_committing(self) -> bool:
+        return self.__status == TransactionStatus.COMMITTING
+
+    def start_commit(self):
+        self.__status = TransactionStatus.COMMITTING
+
     def _set_status(self, new_status: TransactionStatus):
         self.__status = new_status
 
@@ -41,7 +49,7 @@ class StaticTimestampTransaction(Transaction):
         super().__init__(id)
         self.__timestamp = TimeStamp.time()
 
-    def _get_timestamp(self) -> float:
+    def _get_timestamp(self) -> int:
         return self.__timestamp
     
 class DynamicTimestampTransaction(Transaction):
@@ -53,7 +61,7 @@ class DynamicTimestampTransaction(Transaction):
     def __reset_timestamp(self):
         self.__timestamp = TimeStamp.time()
 
-    def _get_timestamp(self) -> float:
+    def _get_timestamp(self) -> int:
         return self.__timestamp
     
     def reset_status(self):
@@ -0,0 +1,93 @@
+import os
+from durability.exceptions import InvalidLogRecordException
+
+# Snapshot of resources as resource id -> (value, write timestamp), timestamp is 0 for single version engines
+ResourceSnapshot = dict[str, tuple[int, int]]
+
+class Checkpoint:
+    # Resource values taken while transactions keep running, together with transactions that were active at that moment
+    # Snapshot contains every update up to checkpoint LSN, including updates of active transactions that may still be undone
+
+    PREFIX = "checkpoint_"
+    EXTENSION = ".chk"
+
+    def __init__(self, lsn: int, active_transactions: dict[str, int], snapshot: ResourceSnapshot) -> None:
+        # active_transactions maps transaction id to LSN of its first update that is not committed or aborted yet
+        self.lsn = lsn
+        self.active_transactions = active_transactions
+        self.snapshot = snapshot
+
+    def get_redo_lsn(self) -> int:
+        # FIRST LSN RECOVERY HAS TO READ, LOG BEFORE IT IS NOT NEEDED ANYMORE
+        return min([self.lsn + 1, *self.active_transactions.values()])
+
+    def write(self, directory: str) -> str:
+        # WRITE CHECKPOINT FILE ATOMICALLY AND RETURN ITS PATH
+        path = os.path.join(directory, f"{self.PREFIX}{self.lsn:020d}{self.EXTENSION}")
+        temporary_path = path + ".tmp"
+
+        with open(temporary_path, 'w') as file:
+            file.write(f"checkpoint {self.lsn}\n")
+
+            for transaction_id, first_lsn in self.active_transactions.items():
+                file.write(f"active {transaction_id} {first_lsn}\n")
+
+            for resource_id, (value, timestamp) in self.snapshot.items():
+                file.write(f"resource {resource_id} {value} {timestamp}\n")
+
+            # Closing line tells checkpoint was written completely
+            file.write("end\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, path)
+        return path
+
+    @staticmethod
+    def read(path: str) -> 'Checkpoint':
+        lsn: int | None = None
+        active_transactions: dict[str, int] = {}
+        snapshot: ResourceSnapshot = {}
+        is_complete = False
+
+        with open(path, 'r') as file:
+            for line in file:
+                parts = line.split()
+
+                if (not parts):
+                    continue
+
+                try:
+                    if (parts[0] == "checkpoint"):
+                        lsn = int(parts[1])
+
+                    elif (parts[0] == "active"):
+                        active_transactions[parts[1]] = int(parts[2])
+
+                    elif (parts[0] == "resource"):
+                        snapshot[parts[1]] = (int(parts[2]), int(parts[3]))
+
+                    elif (parts[0] == "end"):
+                        is_complete = True
+
+                except (IndexError, ValueError):
+                    raise InvalidLogRecordException(f"Invalid checkpoint line: {line.strip()}")
+
+        if (lsn is None or not is_complete):
+            raise InvalidLogRecordException(f"Incomplete checkpoint file {path}")
+
+        return Checkpoint(lsn, active_transactions, snapshot)
+
+    @staticmethod
+    def get_paths(directory: str) -> list[str]:
+        # RETURN PATHS OF ALL CHECKPOINT FILES FROM OLDEST TO LATEST
+        if (not os.path.isdir(directory)):
+            return []
+
+        names = [name for name in os.listdir(directory) if (name.startswith(Checkpoint.PREFIX) and name.endswith(Checkpoint.EXTENSION))]
+        return [os.path.join(directory, name) for name in sorted(names)]
+
+    @staticmethod
+    def read_latest(directory: str) -> 'Checkpoint | None':
+        paths = Checkpoint.get_paths(directory)
+        return Checkpoint.read(paths[-1]) if (len(paths) > 0) else None
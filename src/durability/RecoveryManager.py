@@ -0,0 +1,125 @@
+import os
+import time
+from cores.LogWriter import LogWriter
+from durability.Checkpoint import Checkpoint
+from durability.records import WALRecord, WALRecordType
+from durability.WriteAheadLog import WriteAheadLog
+
+class RecoveryResult:
+    def __init__(
+            self,
+            values: dict[str, int],
+            timestamps: dict[str, int],
+            checkpoint_lsn: int,
+            redo_count: int,
+            undo_count: int,
+            loser_transaction_ids: list[str],
+            recovery_time: float
+        ) -> None:
+
+        self.values = values
+        self.timestamps = timestamps
+        self.checkpoint_lsn = checkpoint_lsn
+        self.redo_count = redo_count
+        self.undo_count = undo_count
+        self.loser_transaction_ids = loser_transaction_ids
+        self.recovery_time = recovery_time
+
+class RecoveryManager:
+    # Rebuild resource values after a crash from the latest checkpoint and the log written after it
+    # Redo repeats every update after the checkpoint, then undo takes back updates of transactions that never ended
+
+    def __init__(self, directory: str) -> None:
+        self.__directory = directory
+        self.__log_writer = LogWriter("RECOVERY MANAGER")
+
+    def __read_tail(self, start_lsn: int):
+        # YIELD RECORDS FROM START_LSN ON, SEGMENTS THAT END BEFORE IT ARE NOT OPENED
+        paths = WriteAheadLog.get_segment_paths(self.__directory)
+
+        for index, path in enumerate(paths):
+            if (index + 1 < len(paths) and WriteAheadLog.get_segment_first_lsn(paths[index + 1]) <= start_lsn):
+                continue
+
+            for record in WriteAheadLog.read_segment(path):
+                if (record.lsn >= start_lsn):
+                    yield record
+
+    def recover(self, write_ahead_log: WriteAheadLog | None = None) -> RecoveryResult:
+        # RETURN RESOURCE VALUES OF EVERY COMMITTED TRANSACTION AT THE MOMENT OF CRASH
+        # Undo is logged to write_ahead_log if given, so crash during later run does not undo it twice
+        start = time.perf_counter()
+
+        checkpoint = Checkpoint.read_latest(self.__directory) if os.path.isdir(self.__directory) else None
+
+        if (checkpoint is None):
+            checkpoint = Checkpoint(0, {}, {})
+
+        values = {resource_id: value for resource_id, (value, _) in checkpoint.snapshot.items()}
+        timestamps = {resource_id: timestamp for resource_id, (_, timestamp) in checkpoint.snapshot.items()}
+
+        # Updates of transactions that have not ended yet, only from their first update on
+        transaction_updates: dict[str, list[WALRecord]] = {}
+        first_lsns = checkpoint.active_transactions
+        redo_count = 0
+
+        for record in self.__read_tail(checkpoint.get_redo_lsn()):
+            transaction_id = record.transaction_id
+
+            if (record.lsn <= checkpoint.lsn):
+                # Update is already in the snapshot, it is only read to be undone if its transaction never ends
+                if (record.type == WALRecordType.UPDATE and transaction_id in first_lsns and record.lsn >= first_lsns[transaction_id]):
+                    transaction_updates.setdefault(transaction_id, []).append(record)
+
+                continue
+
+            if (record.type != WALRecordType.UPDATE):
+                transaction_updates.pop(transaction_id, None)
+                continue
+
+            # Multiversion engine may commit older version after newer one, newest write timestamp stays
+            if (record.timestamp >= timestamps.get(record.resource_id, 0)):
+                values[record.resource_id] = record.after_value
+                timestamps[record.resource_id] = record.timestamp
+                redo_count += 1
+
+            transaction_updates.setdefault(transaction_id, []).append(record)
+
+        loser_updates = sorted(
+            (record for records in transaction_updates.values() for record in records),
+            key=lambda record: record.lsn,
+            reverse=True
+        )
+
+        for record in loser_updates:
+            if (timestamps.get(record.resource_id, 0) == record.timestamp):
+                if (write_ahead_log is not None):
+                    write_ahead_log.log_update(record.transaction_id, record.resource_id, values[record.resource_id], record.before_value, record.timestamp)
+
+                values[record.resource_id] = record.before_value
+
+        loser_transaction_ids = list(transaction_updates)
+
+        if (write_ahead_log is not None):
+            for transaction_id in loser_transaction_ids:
+                write_ahead_log.log_abort(transaction_id)
+
+            write_ahead_log.flush()
+
+        result = RecoveryResult(
+            values,
+            timestamps,
+            checkpoint.lsn,
+            redo_count,
+            len(loser_updates),
+            loser_transaction_ids,
+            time.perf_counter() - start
+        )
+
+        self.__log_writer.console_log(
+            "Recovered", len(values), "resources from checkpoint at LSN", checkpoint.lsn,
+            "with", redo_count, "redo and", len(loser_updates), "undo records",
+            "in", f"{result.recovery_time:.6f}", "seconds"
+        )
+
+        return result
@@ -0,0 +1,343 @@
+import os
+import time
+from enum import Enum
+from typing import Callable, Iterator
+from durability.records import WALRecord, WALRecordType
+from durability.Checkpoint import Checkpoint, ResourceSnapshot
+from durability.exceptions import LogClosedException
+
+class SyncMode(Enum):
+    # EVERY_COMMIT: every commit record is forced to disk on its own
+    # GROUP: commit records are batched and one fsync makes the whole batch durable
+    # NONE: records are handed to the operating system but never forced to disk, for benchmarks only
+    EVERY_COMMIT = 0
+    GROUP = 1
+    NONE = 2
+
+class WriteAheadLog:
+    # Append-only log of before and after images and transaction ends, split into segment files
+    # Segment file is named by LSN of its first record, so segments sort in log order
+
+    SEGMENT_PREFIX = "wal_"
+    SEGMENT_EXTENSION = ".log"
+    DEFAULT_SEGMENT_SIZE = 4 * 1024 * 1024
+
+    def __init__(
+            self,
+            directory: str,
+            sync_mode: SyncMode = SyncMode.GROUP,
+            group_commit_size: int = 32,
+            group_commit_delay: float = 0.005,
+            segment_size: int = DEFAULT_SEGMENT_SIZE,
+            checkpoint_interval: int | None = None
+        ) -> None:
+
+        # group_commit_size is number of commits that forces a flush, group_commit_delay is the longest time in seconds
+        # a commit stays buffered, it is checked whenever a record is logged and after every instruction
+        # Transaction managers acknowledge a commit only once its record is durable
+        # segment_size is number of bytes after which the next record starts a new segment
+        # checkpoint_interval is number of records between checkpoints, None only checkpoints when asked
+        if (group_commit_size < 1):
+            raise ValueError("Group commit size must be at least 1")
+
+        if (group_commit_delay < 0):
+            raise ValueError("Group commit delay can not be negative")
+
+        if (segment_size < 1):
+            raise ValueError("Segment size must be positive")
+
+        if (checkpoint_interval is not None and checkpoint_interval < 1):
+            raise ValueError("Checkpoint interval must be at least 1")
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.__directory = directory
+        self.__sync_mode = sync_mode
+        self.__group_commit_size = group_commit_size
+        self.__group_commit_delay = group_commit_delay
+        self.__segment_size = segment_size
+        self.__checkpoint_interval = checkpoint_interval
+
+        # Records are buffered as (lsn, line) until the next flush
+        self.__buffer: list[tuple[int, str]] = []
+        self.__pending_commit_count = 0
+        self.__first_pending_commit_time = 0.0
+
+        # Log continues after records that are already in the directory
+        self.__last_lsn = self.__find_last_lsn()
+        self.__durable_lsn = self.__last_lsn
+
+        self.__file = None
+        self.__segment_bytes = 0
+        self.__is_closed = False
+
+        # Transactions with updates that are not committed or aborted yet, with LSN of their first update
+        self.__active_transactions: dict[str, int] = {}
+        self.__snapshot_source: Callable[[], ResourceSnapshot] | None = None
+        self.__records_since_checkpoint = 0
+        self.__checkpoint_count = 0
+
+        self.__record_count = 0
+        self.__commit_count = 0
+        self.__sync_count = 0
+        self.__segment_count = 0
+
+    @staticmethod
+    def get_segment_paths(directory: str) -> list[str]:
+        # RETURN PATHS OF ALL SEGMENT FILES IN LOG ORDER
+        if (not os.path.isdir(directory)):
+            return []
+
+        names = [
+            name for name in os.listdir(directory)
+            if (name.startswith(WriteAheadLog.SEGMENT_PREFIX) and name.endswith(WriteAheadLog.SEGMENT_EXTENSION))
+        ]
+
+        return [os.path.join(directory, name) for name in sorted(names, key=WriteAheadLog.get_segment_first_lsn)]
+
+    @staticmethod
+    def get_segment_first_lsn(path: str) -> int:
+        name = os.path.basename(path)
+        return int(name[len(WriteAheadLog.SEGMENT_PREFIX):-len(WriteAheadLog.SEGMENT_EXTENSION)])
+
+    @staticmethod
+    def read_segment(path: str) -> Iterator[WALRecord]:
+        # YIELD RECORDS OF ONE SEGMENT
+        # Last line without newline was torn by a crash in the middle of a write, so it is ignored
+        with open(path, 'r') as file:
+            for line in file:
+                if (not line.endswith('\n')):
+                    break
+
+                if (line.strip()):
+                    yield WALRecord.parse(line)
+
+    @staticmethod
+    def read_records(directory: str) -> Iterator[WALRecord]:
+        # YIELD EVERY RECORD OF THE LOG IN LSN ORDER
+        for path in WriteAheadLog.get_segment_paths(directory):
+            yield from WriteAheadLog.read_segment(path)
+
+    def __find_last_lsn(self) -> int:
+        for path in reversed(self.get_segment_paths(self.__directory)):
+            last_lsn: int | None = None
+
+            for record in self.read_segment(path):
+                last_lsn = record.lsn
+
+            if (last_lsn is not None):
+                return last_lsn
+
+            # Empty segment still tells where the log was
+            return self.get_segment_first_lsn(path) - 1
+
+        return 0
+
+    def __open_segment(self, first_lsn: int):
+        path = os.path.join(self.__directory, f"{self.SEGMENT_PREFIX}{first_lsn:020d}{self.SEGMENT_EXTENSION}")
+        self.__file = open(path, 'a')
+        self.__segment_bytes = self.__file.tell()
+        self.__segment_count += 1
+
+        if (self.__sync_mode != SyncMode.NONE):
+            self.__sync_directory()
+
+    def __sync_directory(self):
+        # New segment file is only durable once its directory entry is
+        if (not hasattr(os, "O_DIRECTORY")):
+            return
+
+        directory_descriptor = os.open(self.__directory, os.O_RDONLY | os.O_DIRECTORY)
+
+        try:
+            os.fsync(directory_descriptor)
+
+        finally:
+            os.close(directory_descriptor)
+
+    def __sync_file(self):
+        self.__file.flush()
+
+        if (self.__sync_mode != SyncMode.NONE):
+            os.fsync(self.__file.fileno())
+            self.__sync_count += 1
+
+    def __close_segment(self):
+        self.__sync_file()
+        self.__file.close()
+        self.__file = None
+
+    def __append(self, record: WALRecord) -> int:
+        if (self.__is_closed):
+            raise LogClosedException()
+
+        self.__buffer.append((record.lsn, record.to_line()))
+        self.__last_lsn = record.lsn
+        self.__record_count += 1
+        self.__records_since_checkpoint += 1
+
+        if (record.type == WALRecordType.UPDATE):
+            self.__active_transactions.setdefault(record.transaction_id, record.lsn)
+
+        else:
+            self.__active_transactions.pop(record.transaction_id, None)
+
+        return record.lsn
+
+    def flush_if_due(self):
+        # FLUSH WHEN OLDEST BUFFERED COMMIT HAS WAITED FOR GROUP COMMIT DELAY
+        # Transaction managers call this after every instruction, so buffered commits are forced even if nothing else is logged
+        if (self.__pending_commit_count > 0 and time.monotonic() - self.__first_pending_commit_time >= self.__group_commit_delay):
+            self.flush()
+
+    def log_update(self, transaction_id: str, resource_id: str, before_value: int, after_value: int, timestamp: int = 0) -> int:
+        # BUFFER BEFORE AND AFTER IMAGE OF RESOURCE AND RETURN ITS LSN
+        lsn = self.__append(WALRecord(
+            self.__last_lsn + 1,
+            WALRecordType.UPDATE,
+            transaction_id,
+            resource_id,
+            before_value,
+            after_value,
+            timestamp
+        ))
+
+        self.flush_if_due()
+        return lsn
+
+    def log_abort(self, transaction_id: str) -> int:
+        # BUFFER END OF ABORTED TRANSACTION, IT DOES NOT NEED TO BE FORCED
+        lsn = self.__append(WALRecord(self.__last_lsn + 1, WALRecordType.ABORT, transaction_id))
+
+        self.flush_if_due()
+        self.__checkpoint_if_due()
+        return lsn
+
+    def log_commit(self, transaction_id: str) -> int:
+        # BUFFER COMMIT RECORD AND FORCE IT WHEN GROUP IS FULL OR ITS DELAY IS OVER, RETURN ITS LSN
+        lsn = self.__append(WALRecord(self.__last_lsn + 1, WALRecordType.COMMIT, transaction_id))
+        self.__commit_count += 1
+
+        if (self.__pending_commit_count == 0):
+            self.__first_pending_commit_time = time.monotonic()
+
+        self.__pending_commit_count += 1
+
+        if (self.__sync_mode == SyncMode.EVERY_COMMIT or self.__pending_commit_count >= self.__group_commit_size):
+            self.flush()
+
+        else:
+            self.flush_if_due()
+
+        self.__checkpoint_if_due()
+        return lsn
+
+    def flush(self):
+        # WRITE BUFFERED RECORDS TO SEGMENT FILES AND FORCE THEM TO DISK WITH ONE FSYNC
+        if (self.__is_closed):
+            raise LogClosedException()
+
+        for lsn, line in self.__buffer:
+            if (self.__file is not None and self.__segment_bytes >= self.__segment_size):
+                self.__close_segment()
+
+            if (self.__file is None):
+                self.__open_segment(lsn)
+
+            self.__file.write(line)
+            self.__segment_bytes += len(line)
+
+        if (self.__file is not None and len(self.__buffer) > 0):
+            self.__sync_file()
+
+        self.__buffer.clear()
+        self.__pending_commit_count = 0
+        self.__durable_lsn = self.__last_lsn
+
+    def set_snapshot_source(self, snapshot_source: Callable[[], ResourceSnapshot]):
+        # SET FUNCTION THAT RETURNS CURRENT RESOURCE VALUES FOR CHECKPOINTS
+        self.__snapshot_source = snapshot_source
+
+    def __checkpoint_if_due(self):
+        # Checkpoint is only taken right after a transaction ends, so no engine is in the middle of writing its updates
+        if (self.__checkpoint_interval is not None and self.__snapshot_source is not None
+                and self.__records_since_checkpoint >= self.__checkpoint_interval):
+            self.checkpoint()
+
+    def checkpoint(self) -> int:
+        # WRITE SNAPSHOT OF RESOURCES WITHOUT WAITING FOR ACTIVE TRANSACTIONS, DROP LOG THAT RECOVERY NO LONGER NEEDS
+        # RETURN LSN OF THE CHECKPOINT
+        if (self.__snapshot_source is None):
+            raise ValueError("Write-ahead log has no snapshot source to checkpoint")
+
+        # Snapshot may only contain updates whose records are already durable
+        self.flush()
+
+        checkpoint = Checkpoint(self.__last_lsn, dict(self.__active_transactions), self.__snapshot_source())
+        checkpoint_path = checkpoint.write(self.__directory)
+
+        for path in Checkpoint.get_paths(self.__directory):
+            if (path != checkpoint_path):
+                os.remove(path)
+
+        self.truncate(checkpoint.get_redo_lsn())
+
+        self.__records_since_checkpoint = 0
+        self.__checkpoint_count += 1
+
+        return checkpoint.lsn
+
+    def truncate(self, lsn: int):
+        # REMOVE SEGMENTS THAT ONLY HOLD RECORDS BEFORE LSN, CURRENT SEGMENT IS ALWAYS KEPT
+        paths = self.get_segment_paths(self.__directory)
+
+        for path, next_path in zip(paths, paths[1:]):
+            if (self.get_segment_first_lsn(next_path) <= lsn):
+                os.remove(path)
+
+    def close(self):
+        if (self.__is_closed):
+            return
+
+        self.flush()
+
+        if (self.__file is not None):
+            self.__close_segment()
+
+        self.__is_closed = True
+
+    def __enter__(self) -> 'WriteAheadLog':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def is_durable(self, lsn: int) -> bool:
+        # CHECK IF RECORD WITH LSN IS ALREADY FLUSHED
+        return lsn <= self.__durable_lsn
+
+    def get_directory(self) -> str:
+        return self.__directory
+
+    def get_last_lsn(self) -> int:
+        return self.__last_lsn
+
+    def get_durable_lsn(self) -> int:
+        return self.__durable_lsn
+
+    def get_record_count(self) -> int:
+        return self.__record_count
+
+    def get_commit_count(self) -> int:
+        return self.__commit_count
+
+    def get_sync_count(self) -> int:
+        # NUMBER OF FSYNC CALLS ON SEGMENT FILES
+        return self.__sync_count
+
+    def get_checkpoint_count(self) -> int:
+        return self.__checkpoint_count
+
+    def get_segment_count(self) -> int:
+        # NUMBER OF SEGMENTS OPENED BY THIS LOG
+        return self.__segment_count
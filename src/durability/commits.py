@@ -0,0 +1,43 @@
+from collections import deque
+from typing import Generic, TypeVar
+from durability.WriteAheadLog import WriteAheadLog
+
+Commit = TypeVar('Commit')
+
+class DurableCommitQueue(Generic[Commit]):
+    # Commits whose record is logged but may still be only in the log buffer, in LSN order
+    # Transaction manager acknowledges a commit only once its record is durable, so a crash never loses a reported commit
+
+    def __init__(self, write_ahead_log: WriteAheadLog | None = None) -> None:
+        self.__write_ahead_log = write_ahead_log
+        self.__commits: deque[tuple[int, Commit]] = deque()
+
+    def is_durable(self, commit_lsn: int | None) -> bool:
+        # Commit without log record, e.g. without write-ahead log, is acknowledged right away
+        return commit_lsn is None or self.__write_ahead_log.is_durable(commit_lsn)
+
+    def append(self, commit_lsn: int, commit: Commit):
+        # Commit records are logged in LSN order, so queue stays sorted
+        self.__commits.append((commit_lsn, commit))
+
+    def pop_durable(self, force: bool = False) -> list[Commit]:
+        # FLUSH LOG ONCE THE OLDEST COMMIT HAS WAITED FOR GROUP COMMIT DELAY, OR RIGHT AWAY IF FORCED
+        # RETURN COMMITS THAT ARE DURABLE NOW IN LSN ORDER
+        if (len(self.__commits) == 0):
+            return []
+
+        if (force):
+            self.__write_ahead_log.flush()
+
+        else:
+            self.__write_ahead_log.flush_if_due()
+
+        durable_commits = []
+
+        while (len(self.__commits) > 0 and self.__write_ahead_log.is_durable(self.__commits[0][0])):
+            durable_commits.append(self.__commits.popleft()[1])
+
+        return durable_commits
+
+    def __len__(self) -> int:
+        return len(self.__commits)
@@ -0,0 +1,7 @@
+class InvalidLogRecordException(Exception):
+    def __init__(self, message="Invalid write-ahead log record"):
+        super().__init__(message)
+
+class LogClosedException(Exception):
+    def __init__(self, message="Write-ahead log is already closed"):
+        super().__init__(message)
@@ -0,0 +1,62 @@
+from enum import Enum
+from durability.exceptions import InvalidLogRecordException
+
+class WALRecordType(Enum):
+    # UPDATE: before and after image of one resource written by transaction
+    # COMMIT and ABORT: end of transaction, updates of aborted transaction are already undone by later update records
+    UPDATE = "U"
+    COMMIT = "C"
+    ABORT = "A"
+
+class WALRecord:
+    # One line of write-ahead log: "<lsn> <type> <transaction id> [<resource id> <before> <after> <timestamp>]"
+    # Timestamp is write timestamp of the version for multiversion engine and 0 otherwise
+
+    def __init__(
+            self,
+            lsn: int,
+            type: WALRecordType,
+            transaction_id: str,
+            resource_id: str | None = None,
+            before_value: int | None = None,
+            after_value: int | None = None,
+            timestamp: int = 0
+        ) -> None:
+
+        self.lsn = lsn
+        self.type = type
+        self.transaction_id = transaction_id
+        self.resource_id = resource_id
+        self.before_value = before_value
+        self.after_value = after_value
+        self.timestamp = timestamp
+
+    def to_line(self) -> str:
+        if (self.type == WALRecordType.UPDATE):
+            return f"{self.lsn} {self.type.value} {self.transaction_id} {self.resource_id} {self.before_value} {self.after_value} {self.timestamp}\n"
+
+        return f"{self.lsn} {self.type.value} {self.transaction_id}\n"
+
+    @staticmethod
+    def parse(line: str) -> 'WALRecord':
+        # PARSE 1 COMPLETE LINE OF LOG SEGMENT
+        parts = line.split()
+
+        try:
+            lsn = int(parts[0])
+            type = WALRecordType(parts[1])
+            transaction_id = parts[2]
+
+            if (type != WALRecordType.UPDATE):
+                if (len(parts) != 3):
+                    raise InvalidLogRecordException(f"Too many fields in log record {lsn}")
+
+                return WALRecord(lsn, type, transaction_id)
+
+            if (len(parts) != 7):
+                raise InvalidLogRecordException(f"Update log record {lsn} must have 7 fields")
+
+            return WALRecord(lsn, type, transaction_id, parts[3], int(parts[4]), int(parts[5]), int(parts[6]))
+
+        except (IndexError, ValueError):
+            raise InvalidLogRecordException(f"Invalid write-ahead log record: {line.strip()}")
@@ -2,6 +2,7 @@ from twophase.TwoPhaseTransactionManager import TwoPhaseTransactionManager
 from MVCC.MVCCTransactionManager import MVCCTransactionManager
 from OCC.OCCTransactionManager import OCCTransactionManager
 from cores.TransactionManager import TransactionManager
+from cores.BinarySchedule import BinarySchedule
 import os 
 
 def get_algorithm_choice() -> int:
@@ -34,6 +35,10 @@ def main():
     transaction_manager: TransactionManager | None = None
     file_path = os.path.join("input", file_name + ".txt")
 
+    if (file_name.endswith(BinarySchedule.EXTENSION)):
+        # Compiled schedule keeps its own extension
+        file_path = os.path.join("input", file_name)
+
     if (choice == 1):
         transaction_manager = TwoPhaseTransactionManager(file_path)
     
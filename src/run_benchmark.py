@@ -0,0 +1,53 @@
+from benchmark.BenchmarkRunner import BenchmarkRunner
+from benchmark.WorkloadGenerator import WorkloadParameters
+from itertools import product
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser(description="Run generated workloads through every concurrency control engine")
+    parser.add_argument("--transactions", type=int, nargs="+", default=[100])
+    parser.add_argument("--operations", type=int, nargs="+", default=[5], help="Operations per transaction")
+    parser.add_argument("--read-ratio", type=float, nargs="+", default=[0.5])
+    parser.add_argument("--zipf", type=float, nargs="+", default=[0.0], help="Zipfian skew of resource accesses")
+    parser.add_argument("--interleaving", type=int, nargs="+", default=[4], help="Number of concurrently open transactions")
+    parser.add_argument("--resources", type=int, nargs="+", default=[100])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--schedule", nargs="*", default=[], help="Existing schedule files to run as well")
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak memory measurement")
+    parser.add_argument("--csv", help="Write results to CSV file")
+    parser.add_argument("--json", help="Write results to JSON file")
+    args = parser.parse_args()
+
+    runner = BenchmarkRunner(measure_memory=not args.no_memory)
+
+    for schedule in args.schedule:
+        runner.run_schedule(schedule)
+
+    for transactions, operations, read_ratio, zipf, interleaving, resources in product(
+        args.transactions, args.operations, args.read_ratio, args.zipf, args.interleaving, args.resources
+    ):
+        parameters = WorkloadParameters(transactions, operations, read_ratio, zipf, interleaving, resources, args.seed)
+        runner.run_workload(parameters)
+
+    rows = [result.to_dict() for result in runner.get_results()]
+
+    # Engine column is as wide as the longest engine name, so long names keep the other columns aligned
+    engine_width = max([len('engine')] + [len(row['engine']) for row in rows])
+
+    print(f"{'workload':<12} {'engine':<{engine_width}} {'time (s)':>10} {'instr/s':>12} {'commits':>8} {'aborts':>8} {'restarts':>9} {'wait peak':>10} {'memory (B)':>12}")
+
+    for row in rows:
+        print(
+            f"{row['workload']:<12} {row['engine']:<{engine_width}} {row['wall_time']:>10.4f} {row['instructions_per_second']:>12.0f} "
+            f"{row['commits']:>8} {row['aborts']:>8} {row['restarts']:>9} {row['wait_queue_peak']:>10} "
+            f"{'-' if row['peak_memory'] is None else row['peak_memory']:>12}"
+        )
+
+    if (args.csv):
+        runner.write_csv(args.csv)
+
+    if (args.json):
+        runner.write_json(args.json)
+
+if __name__ == "__main__":
+    main()
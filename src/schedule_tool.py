@@ -0,0 +1,33 @@
+from cores.BinarySchedule import ScheduleCompression
+from cores.ScheduleCompiler import ScheduleCompiler
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile text schedule to binary schedule and back")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = subparsers.add_parser("compile", help="Compile text schedule to binary schedule")
+    compile_parser.add_argument("input", help="Text schedule path")
+    compile_parser.add_argument("output", help="Binary schedule path")
+    compile_parser.add_argument(
+        "--compression",
+        choices=[compression.name.lower() for compression in ScheduleCompression],
+        default=ScheduleCompression.NONE.name.lower()
+    )
+
+    decompile_parser = subparsers.add_parser("decompile", help="Write binary schedule back as text schedule")
+    decompile_parser.add_argument("input", help="Binary schedule path")
+    decompile_parser.add_argument("output", help="Text schedule path")
+
+    args = parser.parse_args()
+
+    if (args.command == "compile"):
+        count = ScheduleCompiler.compile(args.input, args.output, ScheduleCompression[args.compression.upper()])
+        print(f"Compiled {count} instructions to {args.output}")
+
+    else:
+        count = ScheduleCompiler.decompile(args.input, args.output)
+        print(f"Decompiled {count} instructions to {args.output}")
+
+if __name__ == "__main__":
+    main()
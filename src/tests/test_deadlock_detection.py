@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from cores.LogWriter import LogWriter, LogLevel, LogSink, LogRecord, ConsoleLogSink, format_log_record
+from twophase.TwoPhaseTransactionManager import TwoPhaseTransactionManager
+from twophase.deadlocks import DeadlockPolicy
+from benchmark.WorkloadGenerator import WorkloadGenerator, WorkloadParameters
+
+class CollectingLogSink(LogSink):
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def emit(self, record: LogRecord):
+        self.lines.append(format_log_record(record))
+
+class DeadlockDetectionTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__level = LogWriter.get_level()
+        self.__sink = CollectingLogSink()
+        LogWriter.configure(level=LogLevel.INFO, sink=self.__sink)
+
+        # T2 has more done instructions than T1 when the cycle T1 -> T2 -> T1 forms
+        file = tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False)
+        file.write("R T1 X\nR T2 A\nR T2 B\nR T2 Y\nW T1 Y=1\nW T2 X=2\nC T1\nC T2\n")
+        file.close()
+        self.__file_path = file.name
+
+    def tearDown(self) -> None:
+        LogWriter.configure(level=self.__level, sink=ConsoleLogSink())
+        os.remove(self.__file_path)
+
+    def test_two_transaction_cycle_aborts_one_victim(self):
+        transaction_manager = TwoPhaseTransactionManager(self.__file_path, deadlock_policy=DeadlockPolicy.DETECT)
+        transaction_manager.run()
+
+        statistics = transaction_manager.get_statistics()
+        self.assertEqual(statistics.get_deadlock_count(), 1)
+        self.assertEqual(statistics.get_abort_count(), 1)
+        self.assertEqual(statistics.get_commit_count(), 2)
+
+    def test_youngest_transaction_of_cycle_is_victim(self):
+        TwoPhaseTransactionManager(self.__file_path, deadlock_policy=DeadlockPolicy.DETECT).run()
+
+        victim_lines = [line for line in self.__sink.lines if "as victim" in line]
+        self.assertEqual(len(victim_lines), 1)
+        self.assertIn("choosing T2 as victim", victim_lines[0])
+
+class SkewedWorkloadTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__level = LogWriter.get_level()
+        LogWriter.configure(level=LogLevel.SILENT)
+
+        file = tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False)
+        file.close()
+        self.__file_path = file.name
+
+    def tearDown(self) -> None:
+        LogWriter.configure(level=self.__level)
+        os.remove(self.__file_path)
+
+    def __run(self, deadlock_policy: DeadlockPolicy) -> int:
+        transaction_manager = TwoPhaseTransactionManager(self.__file_path, deadlock_policy=deadlock_policy)
+        transaction_manager.run()
+
+        self.assertEqual(transaction_manager.get_statistics().get_commit_count(), 300)
+        return transaction_manager.get_statistics().get_abort_count()
+
+    def test_detection_does_not_abort_more_than_wound_wait(self):
+        # Benchmark workload where most accesses go to a few hot resources
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                WorkloadGenerator(WorkloadParameters(
+                    transaction_count=300,
+                    zipf_skew=1.1,
+                    interleaving=8,
+                    resource_count=20,
+                    seed=seed
+                )).generate(self.__file_path)
+
+                self.assertLessEqual(self.__run(DeadlockPolicy.DETECT), self.__run(DeadlockPolicy.WOUND_WAIT))
+
+if __name__ == "__main__":
+    unittest.main()
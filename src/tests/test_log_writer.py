@@ -0,0 +1,38 @@
+import io
+import unittest
+from cores.LogWriter import LogWriter, LogLevel, BufferedLogSink, ConsoleLogSink
+
+class BufferedLogSinkTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__level = LogWriter.get_level()
+        self.__stream = io.StringIO()
+        # Long flush interval keeps the record queued until flush is called
+        self.__sink = BufferedLogSink(stream=self.__stream, flush_interval=10)
+        LogWriter.configure(level=LogLevel.INFO, sink=self.__sink)
+
+    def tearDown(self) -> None:
+        LogWriter.configure(level=self.__level, sink=ConsoleLogSink())
+
+    def test_argument_mutated_after_log_keeps_logged_state(self):
+        values = [1, 2]
+        LogWriter("Test").console_log("Values", values)
+        values.append(3)
+        LogWriter.flush()
+
+        self.assertEqual(self.__stream.getvalue(), "[Test] Values [1, 2]\n")
+
+    def test_records_are_written_in_order_after_close(self):
+        writer = LogWriter("Test")
+        writer.console_log("First")
+        writer.console_log_separator()
+        self.__sink.close()
+        writer.console_log("Last")
+
+        lines = self.__stream.getvalue().splitlines()
+        self.assertEqual(lines[0], "[Test] First")
+        self.assertTrue(lines[1].startswith("===="))
+        self.assertEqual(lines[2], "[Test] Last")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from cores.LogWriter import LogWriter, LogLevel
+from MVCC.MVCCTransactionManager import MVCCTransactionManager
+from MVCC.VersionController import VersionController
+from MVCC.exceptions import CollectedVersionReadException
+
+class ReadAsOfCollectedTimestampTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__level = LogWriter.get_level()
+        LogWriter.configure(level=LogLevel.SILENT)
+
+        file = tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False)
+        file.write("W T1 X=1\nC T1\nW T2 X=2\nC T2\nW T3 X=3\nC T3\nA T4 X 1\nC T4\n")
+        file.close()
+        self.__file_path = file.name
+
+    def tearDown(self) -> None:
+        LogWriter.configure(level=self.__level)
+        os.remove(self.__file_path)
+
+    def test_read_of_collected_timestamp_aborts_transaction(self):
+        transaction_manager = MVCCTransactionManager(self.__file_path, gc_step_size=4)
+        transaction_manager.run()
+
+        statistics = transaction_manager.get_statistics()
+        self.assertEqual(statistics.get_commit_count(), 3)
+        self.assertEqual(statistics.get_abort_count(), 1)
+        self.assertEqual(statistics.get_restart_count(), 0)
+
+    def test_read_inside_retention_window_succeeds(self):
+        transaction_manager = MVCCTransactionManager(self.__file_path, gc_step_size=4, retention_window=10)
+        transaction_manager.run()
+
+        self.assertEqual(transaction_manager.get_statistics().get_commit_count(), 4)
+
+    def test_version_controller_refuses_collected_timestamp(self):
+        version_controller = VersionController()
+
+        for timestamp in range(1, 4):
+            transaction_id = f"T{timestamp}"
+            version_controller.write("X", transaction_id, timestamp, timestamp)
+            version_controller.commit(transaction_id)
+
+        version_controller.collect_garbage(3, 4)
+
+        self.assertEqual(version_controller.read_as_of("X", 3), 3)
+
+        with self.assertRaises(CollectedVersionReadException):
+            version_controller.read_as_of("X", 1)
+
+    def test_version_controller_refuses_timestamp_before_initial_version(self):
+        version_controller = VersionController()
+        version_controller.write("X", "T1", 1, 1)
+        version_controller.commit("T1")
+
+        with self.assertRaises(CollectedVersionReadException):
+            version_controller.read_as_of("X", -1)
+
+if __name__ == "__main__":
+    unittest.main()
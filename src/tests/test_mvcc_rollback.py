@@ -0,0 +1,33 @@
+import unittest
+from cores.LogWriter import LogWriter, LogLevel
+from MVCC.VersionController import VersionController
+from MVCC.exceptions import ForbiddenTimestampWriteException
+
+class RollbackReaderCleanupTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__level = LogWriter.get_level()
+        LogWriter.configure(level=LogLevel.SILENT)
+
+    def tearDown(self) -> None:
+        LogWriter.configure(level=self.__level)
+
+    def test_rollback_of_reader_leaves_creator_that_is_not_rolled_back(self):
+        version_controller = VersionController()
+
+        # T2 reads version of T1 that is not committed, then fails its own write
+        version_controller.write("X", "T1", 1, 1)
+        version_controller.read("X", "T2", 2)
+        version_controller.read("Y", "T3", 3)
+
+        with self.assertRaises(ForbiddenTimestampWriteException):
+            version_controller.write("Y", "T2", 2, 2)
+
+        # Rolling back the reader used to raise KeyError while removing it from the readers of T1
+        self.assertEqual(version_controller.cascade_rollback("T2"), [["T2"]])
+
+        # T2 is no longer a reader of T1, so rolling back T1 does not cascade to it again
+        self.assertEqual(version_controller.cascade_rollback("T1"), [["T1"]])
+
+if __name__ == "__main__":
+    unittest.main()
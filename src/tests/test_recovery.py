@@ -0,0 +1,194 @@
+import os
+import shutil
+import tempfile
+import unittest
+from cores.LogWriter import LogWriter, LogLevel
+from durability.WriteAheadLog import WriteAheadLog, SyncMode
+from durability.RecoveryManager import RecoveryManager
+from durability.records import WALRecordType
+from twophase.TwoPhaseTransactionManager import TwoPhaseTransactionManager
+from OCC.OCCTransactionManager import OCCTransactionManager
+from MVCC.MVCCTransactionManager import MVCCTransactionManager
+
+class RecoveryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__level = LogWriter.get_level()
+        LogWriter.configure(level=LogLevel.SILENT)
+
+        self.__directory = tempfile.mkdtemp()
+        # Resource values as an engine would hold them, checkpoints take their snapshot from here
+        self.__values: dict[str, int] = {}
+        self.__write_ahead_logs: list[WriteAheadLog] = []
+
+    def tearDown(self) -> None:
+        # Logs are left open by the simulated crash
+        for write_ahead_log in self.__write_ahead_logs:
+            write_ahead_log.close()
+
+        LogWriter.configure(level=self.__level)
+        shutil.rmtree(self.__directory)
+
+    def __open_log(self, **kwargs) -> WriteAheadLog:
+        write_ahead_log = WriteAheadLog(self.__directory, **kwargs)
+        write_ahead_log.set_snapshot_source(lambda: {resource_id: (value, 0) for resource_id, value in self.__values.items()})
+        self.__write_ahead_logs.append(write_ahead_log)
+        return write_ahead_log
+
+    def __write(self, write_ahead_log: WriteAheadLog, transaction_id: str, resource_id: str, value: int):
+        write_ahead_log.log_update(transaction_id, resource_id, self.__values.get(resource_id, 0), value)
+        self.__values[resource_id] = value
+
+    def test_crash_before_commit_undoes_loser(self):
+        write_ahead_log = self.__open_log()
+        self.__write(write_ahead_log, "T1", "X", 1)
+        write_ahead_log.log_commit("T1")
+        self.__write(write_ahead_log, "T2", "X", 5)
+        self.__write(write_ahead_log, "T2", "Y", 3)
+        # Updates reach disk, but the crash comes before T2 commits
+        write_ahead_log.flush()
+
+        result = RecoveryManager(self.__directory).recover()
+
+        self.assertEqual(result.values, {"X": 1, "Y": 0})
+        self.assertEqual(result.loser_transaction_ids, ["T2"])
+        self.assertEqual(result.undo_count, 2)
+
+    def test_loser_updates_straddling_checkpoint_are_undone(self):
+        write_ahead_log = self.__open_log()
+        self.__write(write_ahead_log, "T1", "X", 1)
+        write_ahead_log.log_commit("T1")
+        self.__write(write_ahead_log, "T2", "X", 5)
+        checkpoint_lsn = write_ahead_log.checkpoint()
+
+        self.__write(write_ahead_log, "T2", "Y", 7)
+        self.__write(write_ahead_log, "T3", "Z", 2)
+        write_ahead_log.log_commit("T3")
+        write_ahead_log.flush()
+
+        result = RecoveryManager(self.__directory).recover()
+
+        # Snapshot already holds T2's write of X, it is undone from the record before the checkpoint
+        self.assertEqual(result.checkpoint_lsn, checkpoint_lsn)
+        self.assertEqual(result.values, {"X": 1, "Y": 0, "Z": 2})
+        self.assertEqual(result.loser_transaction_ids, ["T2"])
+        self.assertEqual(result.redo_count, 2)
+        self.assertEqual(result.undo_count, 2)
+
+    def test_recovery_after_truncated_segments(self):
+        write_ahead_log = self.__open_log(segment_size=1)
+
+        for index in range(10):
+            self.__write(write_ahead_log, f"T{index}", f"R{index % 3}", index + 1)
+            write_ahead_log.log_commit(f"T{index}")
+
+        self.__write(write_ahead_log, "T10", "R0", 100)
+        write_ahead_log.checkpoint()
+        self.__write(write_ahead_log, "T11", "R1", 200)
+        write_ahead_log.log_commit("T11")
+        write_ahead_log.flush()
+
+        # Only segments from the first update of T10 on are kept
+        segment_paths = WriteAheadLog.get_segment_paths(self.__directory)
+        self.assertEqual(WriteAheadLog.get_segment_first_lsn(segment_paths[0]), 21)
+
+        result = RecoveryManager(self.__directory).recover()
+
+        self.assertEqual(result.values, {"R0": 10, "R1": 200, "R2": 9})
+        self.assertEqual(result.loser_transaction_ids, ["T10"])
+
+    def test_second_recovery_does_not_undo_again(self):
+        write_ahead_log = self.__open_log()
+        self.__write(write_ahead_log, "T1", "X", 1)
+        write_ahead_log.log_commit("T1")
+        self.__write(write_ahead_log, "T2", "X", 5)
+        write_ahead_log.flush()
+
+        with WriteAheadLog(self.__directory) as recovery_log:
+            first_result = RecoveryManager(self.__directory).recover(recovery_log)
+
+        second_result = RecoveryManager(self.__directory).recover()
+
+        self.assertEqual(first_result.values, {"X": 1})
+        self.assertEqual(second_result.values, {"X": 1})
+        self.assertEqual(second_result.loser_transaction_ids, [])
+        self.assertEqual(second_result.undo_count, 0)
+
+    def test_older_version_committed_later_does_not_overwrite_newer(self):
+        write_ahead_log = self.__open_log()
+        write_ahead_log.log_update("T5", "X", 0, 50, 5)
+        write_ahead_log.log_commit("T5")
+        write_ahead_log.log_update("T3", "X", 0, 30, 3)
+        write_ahead_log.log_commit("T3")
+        write_ahead_log.flush()
+
+        result = RecoveryManager(self.__directory).recover()
+
+        self.assertEqual(result.values, {"X": 50})
+        self.assertEqual(result.timestamps, {"X": 5})
+        self.assertEqual(result.redo_count, 1)
+
+class DurableCommitTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.__level = LogWriter.get_level()
+        LogWriter.configure(level=LogLevel.SILENT)
+
+        self.__directory = tempfile.mkdtemp()
+        self.__write_ahead_log: WriteAheadLog | None = None
+
+        # T2 needs the lock T1 holds until its commit is durable
+        file = tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False)
+        file.write("W T1 X=1\nC T1\nW T2 X=5\nW T3 Y=2\nC T3\nC T2\n")
+        file.close()
+        self.__file_path = file.name
+
+    def tearDown(self) -> None:
+        if (self.__write_ahead_log is not None):
+            self.__write_ahead_log.close()
+
+        LogWriter.configure(level=self.__level)
+        shutil.rmtree(self.__directory)
+        os.remove(self.__file_path)
+
+    def __assert_commits_survive_crash(self, transaction_manager_class):
+        # Group commit delay never passes during the run, log is not closed to simulate a crash right after it
+        write_ahead_log = WriteAheadLog(self.__directory, sync_mode=SyncMode.GROUP, group_commit_delay=60)
+        self.__write_ahead_log = write_ahead_log
+        transaction_manager = transaction_manager_class(self.__file_path, write_ahead_log=write_ahead_log)
+        transaction_manager.run()
+
+        commit_lsns = [record.lsn for record in WriteAheadLog.read_records(self.__directory) if record.type == WALRecordType.COMMIT]
+
+        self.assertEqual(transaction_manager.get_statistics().get_commit_count(), 3)
+        self.assertEqual(len(commit_lsns), 3)
+        self.assertTrue(all(write_ahead_log.is_durable(lsn) for lsn in commit_lsns))
+        self.assertEqual(RecoveryManager(self.__directory).recover().values, {"X": 5, "Y": 2})
+
+        return transaction_manager
+
+    def test_two_phase_commits_survive_crash(self):
+        transaction_manager = self.__assert_commits_survive_crash(TwoPhaseTransactionManager)
+
+        # T2 waited for the lock until T1's commit was flushed
+        self.assertGreater(transaction_manager.get_statistics().get_wait_queue_peak(), 0)
+
+    def test_optimistic_commits_survive_crash(self):
+        self.__assert_commits_survive_crash(OCCTransactionManager)
+
+    def test_multiversion_commits_survive_crash(self):
+        self.__assert_commits_survive_crash(MVCCTransactionManager)
+
+    def test_commit_is_acknowledged_once_its_record_is_durable(self):
+        write_ahead_log = WriteAheadLog(self.__directory, sync_mode=SyncMode.GROUP, group_commit_delay=0)
+        self.__write_ahead_log = write_ahead_log
+        transaction_manager = TwoPhaseTransactionManager(self.__file_path, write_ahead_log=write_ahead_log)
+        transaction_manager.run()
+
+        # Every commit is flushed after its own instruction, so no transaction waits for a lock
+        self.assertEqual(transaction_manager.get_statistics().get_commit_count(), 3)
+        self.assertEqual(transaction_manager.get_statistics().get_wait_queue_peak(), 0)
+        self.assertEqual(write_ahead_log.get_durable_lsn(), write_ahead_log.get_last_lsn())
+
+if __name__ == "__main__":
+    unittest.main()
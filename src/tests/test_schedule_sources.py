@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from cores.exceptions import InvalidInstructionLineException, InvalidScheduleFileException
+from cores.sources import ScheduleSource, TextScheduleSource, BulkTextScheduleSource, BinaryScheduleSource
+from cores.BinarySchedule import BinarySchedule
+from cores.ScheduleCompiler import ScheduleCompiler
+from cores.ScheduleColumns import ScheduleColumns
+
+class WriteValueRangeTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        file = tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False)
+        file.write("W T1 X=9223372036854775807\nW T1 Y=-9223372036854775808\nW T1 Z=99999999999999999999\nC T1\n")
+        file.close()
+        self.__file_path = file.name
+
+    def tearDown(self) -> None:
+        os.remove(self.__file_path)
+
+    def __read_until_error(self, source: ScheduleSource) -> tuple[list[int], InvalidInstructionLineException]:
+        values = []
+
+        try:
+            while True:
+                values.append(source.next_line().update_value)
+
+        except InvalidInstructionLineException as e:
+            return values, e
+
+        finally:
+            source.close()
+
+    def test_sources_agree_on_out_of_range_value(self):
+        text_values, text_error = self.__read_until_error(TextScheduleSource(self.__file_path))
+        bulk_values, bulk_error = self.__read_until_error(BulkTextScheduleSource(self.__file_path))
+
+        # Lines before the invalid one are still given out
+        self.assertEqual(text_values, [9223372036854775807, -9223372036854775808])
+        self.assertEqual(bulk_values, text_values)
+
+        self.assertEqual(text_error.get_line_number(), 3)
+        self.assertEqual(bulk_error.get_line_number(), 3)
+        self.assertEqual(str(bulk_error), str(text_error))
+
+class CorruptBinaryScheduleTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        file = tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False)
+        file.write("R T1 X\nW T2 Y=5\nC T1\n")
+        file.close()
+        self.__text_path = file.name
+        self.__binary_path = self.__text_path + BinarySchedule.EXTENSION
+        ScheduleCompiler.compile(self.__text_path, self.__binary_path)
+
+    def tearDown(self) -> None:
+        os.remove(self.__text_path)
+        os.remove(self.__binary_path)
+
+    def __corrupt_second_record(self, op_code: int, transaction_slot: int, resource_slot: int):
+        # Records are the last part of an uncompressed compiled schedule
+        with open(self.__binary_path, 'r+b') as file:
+            file.seek(-2 * BinarySchedule.RECORD.size, os.SEEK_END)
+            file.write(BinarySchedule.RECORD.pack(op_code, transaction_slot, resource_slot, 0))
+
+    def test_corrupt_record_raises_invalid_schedule_file(self):
+        corrupt_records = {
+            "op code": (len(ScheduleColumns.OP_TYPES), 0, 0),
+            "transaction slot": (0, 2, 0),
+            "resource slot": (0, 0, 2),
+            "negative resource slot": (0, 0, -2)
+        }
+
+        for field, record in corrupt_records.items():
+            with self.subTest(field=field):
+                self.__corrupt_second_record(*record)
+                source = BinaryScheduleSource(self.__binary_path)
+
+                try:
+                    # Record before the corrupt one is still given out
+                    self.assertEqual(source.next_line().resource_id, "X")
+
+                    with self.assertRaises(InvalidScheduleFileException):
+                        source.next_line()
+
+                finally:
+                    source.close()
+
+if __name__ == "__main__":
+    unittest.main()
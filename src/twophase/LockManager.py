@@ -1,144 +1,553 @@
-
-from twophase.locks import Lock, LockType
-from twophase.exceptions import LockNotFoundException, LockAlreadyExistException, LockUpgradeException, LockSharingException
+from collections import deque
+from itertools import islice
+from twophase.locks import Lock, LockType, ResourceLocks, LOCK_TYPE_NAMES, INTENTION_LOCK_TYPES, SUBTREE_LOCK_TYPES, RESOURCE_SEPARATOR
+from twophase.locks import is_compatible, is_covering, get_combined_type, get_resource_path
+from twophase.deadlocks import WaitsForGraph
+from twophase.escalation import EscalatedLock, EscalationStatistics
+from twophase.exceptions import LockAlreadyExistException, LockSharingException
 from cores.LogWriter import LogWriter
 
 class LockManager:
 
-    def __init__(self) -> None:
-        self.__resource_locks: dict[str, list[Lock]] = {}
-        self.__transaction_locks: dict[str, list[Lock]] = {}
+    def __init__(self, detect_deadlock: bool = False, escalation_threshold: int | None = None) -> None:
+        # escalation_threshold None never escalates, otherwise transaction holding more than that many locks
+        # directly under one resource has them replaced by one share or exclusive lock on that resource
+        if (escalation_threshold is not None and escalation_threshold < 1):
+            raise ValueError("Lock escalation threshold must be at least 1")
+
+        # Lock table keyed by (transaction id, resource id) so every lookup is a single hash probe
+        self.__locks: dict[tuple[str, str], Lock] = {}
+        self.__resource_locks: dict[str, ResourceLocks] = {}
+        self.__transaction_locks: dict[str, dict[str, Lock]] = {}
+
+        # Ids of resources locked by transaction directly under each parent resource, only kept when escalating
+        self.__escalation_threshold = escalation_threshold
+        self.__child_lock_ids: dict[str, dict[str, dict[str, None]]] = {}
+        self.__escalated_locks: dict[str, dict[str, EscalatedLock]] = {}
+
+        # Resources whose lock was de-escalated are not escalated again by the same transaction
+        self.__deescalated_resource_ids: dict[str, set[str]] = {}
+        self.__escalation_statistics = EscalationStatistics()
+
+        # Queue of lock requests that could not be granted yet, per resource, ordered by priority and then by arrival
+        # Request only waits behind queued requests it is incompatible with, compatible ones never block each other
+        # Transaction waits on at most one resource because its next instructions wait behind the blocked one
+        self.__resource_waiters: dict[str, deque[Lock]] = {}
+        self.__transaction_waits: dict[str, Lock] = {}
+        self.__wait_priorities: dict[str, int | None] = {}
+
+        # Transactions granted a lock on release that have not been resumed yet, in grant order
+        self.__granted_transaction_ids: dict[str, None] = {}
+
+        # Waits-for graph is only kept when deadlocks are detected instead of prevented
+        self.__waits_for_graph: WaitsForGraph | None = WaitsForGraph() if detect_deadlock else None
+
         self.__log_writer = LogWriter("LOCK MANAGER")
-        
-    def __initialize_list_if_not_exist(self, transaction_id: str, resource_id: str):
-        if self.__resource_locks.get(resource_id) is None:
-            self.__resource_locks[resource_id] = []
-        
-        if self.__transaction_locks.get(transaction_id) is None:
-            self.__transaction_locks[transaction_id] = []
+
+    def __add_lock(self, lock: Lock):
+        transaction_id = lock.get_transaction_id()
+        resource_id = lock.get_resource_id()
+        resource_locks = self.__resource_locks.get(resource_id)
+
+        if (resource_locks is None):
+            resource_locks = ResourceLocks()
+            self.__resource_locks[resource_id] = resource_locks
+
+        transaction_locks = self.__transaction_locks.get(transaction_id)
+
+        if (transaction_locks is None):
+            transaction_locks = {}
+            self.__transaction_locks[transaction_id] = transaction_locks
+
+        self.__locks[(transaction_id, resource_id)] = lock
+        resource_locks.add(lock)
+        transaction_locks[resource_id] = lock
+
+        parent_id = resource_id.rpartition(RESOURCE_SEPARATOR)[0]
+
+        if (self.__escalation_threshold is not None and parent_id != ""):
+            self.__child_lock_ids.setdefault(transaction_id, {}).setdefault(parent_id, {})[resource_id] = None
+
+    def __remove_lock(self, lock: Lock):
+        # REMOVE SINGLE LOCK FROM EVERY INDEX OF THE LOCK TABLE
+        transaction_id = lock.get_transaction_id()
+        resource_id = lock.get_resource_id()
+        resource_locks = self.__resource_locks[resource_id]
+
+        self.__locks.pop((transaction_id, resource_id))
+        self.__transaction_locks[transaction_id].pop(resource_id)
+        resource_locks.remove(lock)
+
+        if (resource_locks.is_empty()):
+            self.__resource_locks.pop(resource_id)
+
+        child_lock_ids = self.__child_lock_ids.get(transaction_id, {})
+        parent_id = resource_id.rpartition(RESOURCE_SEPARATOR)[0]
+
+        if (parent_id in child_lock_ids):
+            child_lock_ids[parent_id].pop(resource_id, None)
+
+        child_lock_ids.pop(resource_id, None)
+
+    def __merge_lock(self, transaction_id: str, resource_id: str, type: LockType):
+        # ADD LOCK OR CONVERT EXISTING ONE SO IT COVERS TYPE, WITHOUT CHECKING OTHER TRANSACTIONS
+        lock = self.__get_lock(transaction_id, resource_id)
+
+        if (lock is None):
+            self.__add_lock(Lock(type, transaction_id, resource_id))
+
+        elif (not is_covering(lock.get_type(), type)):
+            self.__resource_locks[resource_id].convert(lock, get_combined_type(lock.get_type(), type))
 
     def __get_lock(self, transaction_id: str, resource_id: str, type: LockType | None = None) -> Lock | None:
-        locks = self.__transaction_locks.get(transaction_id, [])
+        lock = self.__locks.get((transaction_id, resource_id))
 
-        for lock in locks:
-            if (lock.get_resource_id() == resource_id and (type is None or lock.get_type() == type)):
+        if (lock is None or (type is not None and lock.get_type() != type)):
+            return None
+
+        return lock
+
+    def __get_conflict_lock_holders(self, transaction_id: str, resource_id: str, waiter_ids: list[str] | None = None) -> list[str]:
+        # RETURN ALL TRANSACTION IDS  (EXCEPT ITS OWN ID) THAT HOLD LOCK TO CERTAIN RESOURCE, FOLLOWED BY GIVEN WAITERS
+        resource_locks = self.__resource_locks.get(resource_id)
+        conflict_ids = ([] if resource_locks is None else resource_locks.get_holder_ids()) + (waiter_ids or [])
+
+        # Transaction waiting to upgrade is both holder and waiter, so duplicates are dropped
+        return [conflict_id for conflict_id in dict.fromkeys(conflict_ids) if (conflict_id != transaction_id)]
+
+    def __get_request_type(self, request: Lock) -> LockType:
+        # Waiting upgrade needs the combination of the lock it holds and the requested type
+        lock = self.__get_lock(request.get_transaction_id(), request.get_resource_id())
+        return request.get_type() if lock is None else get_combined_type(lock.get_type(), request.get_type())
+
+    def __get_incompatible_waiter_ids(self, type: LockType, waiters) -> list[str]:
+        # RETURN TRANSACTIONS OF GIVEN QUEUED REQUESTS THAT A REQUEST OF TYPE HAS TO WAIT BEHIND
+        return [
+            waiter.get_transaction_id() for waiter in waiters
+            if (not is_compatible(type, self.__get_request_type(waiter)))
+        ]
+
+    def __is_available(self, transaction_id: str, resource_id: str, type: LockType) -> bool:
+        # CHECK IF LOCK TYPE OF CERTAIN RESOURCE IS COMPATIBLE WITH LOCKS OF OTHER TRANSACTIONS
+        resource_locks = self.__resource_locks.get(resource_id)
+        return resource_locks is None or resource_locks.is_available(transaction_id, type)
+
+    def __get_covering_ancestor_lock(self, transaction_id: str, resource_id: str, type: LockType) -> Lock | None:
+        # RETURN LOCK ON AN ANCESTOR THAT ALREADY GIVES RIGHTS OF TYPE ON THE WHOLE SUBTREE, IF ANY
+        for ancestor_id in get_resource_path(resource_id)[:-1]:
+            lock = self.__get_lock(transaction_id, ancestor_id)
+
+            if (lock is not None and lock.get_type() in SUBTREE_LOCK_TYPES and is_covering(SUBTREE_LOCK_TYPES[lock.get_type()], type)):
                 return lock
 
         return None
-    
-    def __get_conflict_lock_holders(self, transaction_id: str, resource_id: str) -> list[str]:
-        # RETURN ALL TRANSACTION IDS  (EXCEPT ITS OWN ID) THAT HOLD LOCK TO CERTAIN RESOURCE
-        locks = self.__resource_locks[resource_id]
-        conflict_ids: list[str] = []
 
-        for lock in locks:
-            conflict_id = lock.get_transaction_id()
-            if (transaction_id != conflict_id):
-                conflict_ids.append(conflict_id)
+    def is_lock_exist(self, transaction_id: str, resource_id: str, type: LockType | None = None):
+        # CHECK IF TRANSACTION HOLDS LOCK THAT GIVES RIGHTS OF TYPE ON RESOURCE, DIRECTLY OR THROUGH AN ANCESTOR
+        # Without type, only checks if any lock is held on the resource itself
+        lock = self.__get_lock(transaction_id, resource_id)
 
-        return conflict_ids
+        if (type is None):
+            return lock is not None
 
-    def __is_sharing_available(self, transaction_id: str, resource_id: str) -> bool:
-        # CHECK IF SHARE-LOCK OF CERTAIN RESOURCE CAN BE ACQUIRED
-        locks = self.__resource_locks.get(resource_id, [])
+        if (lock is not None and is_covering(lock.get_type(), type)):
+            return True
 
-        for lock in locks:
-            if (lock.get_transaction_id() != transaction_id and lock.get_type() == LockType.EXCLUSIVE):
-                return False
+        return self.__get_covering_ancestor_lock(transaction_id, resource_id, type) is not None
 
-        return True
+    def __acquire_resource_lock(self, transaction_id: str, resource_id: str, type: LockType):
+        # ACQUIRE OR CONVERT LOCK OF ONE RESOURCE WITHOUT LOOKING AT ITS ANCESTORS
+        lock = self.__get_lock(transaction_id, resource_id)
 
-    def __is_exclusive_available(self, transaction_id: str, resource_id: str) -> bool:
-        # CHECK IF EXCLUSIVE-LOCK OF CERTAIN RESOURCE CAN BE ACQUIRED
-        locks = self.__resource_locks.get(resource_id, [])
+        if (lock is not None):
+            old_type = lock.get_type()
+            new_type = get_combined_type(old_type, type)
 
-        for lock in locks:
-            if (lock.get_transaction_id() != transaction_id):
-                return False
+            if (new_type == old_type):
+                return
+
+            if (not self.__is_available(transaction_id, resource_id, new_type)):
+                self.__deescalate_conflicts(transaction_id, resource_id, new_type)
+
+            # Conversion does not queue behind waiters because they may be waiting for the lock it holds
+            if (not self.__is_available(transaction_id, resource_id, new_type)):
+                raise LockSharingException(
+                    self.__get_conflict_lock_holders(transaction_id, resource_id),
+                    resource_id,
+                    type
+                )
+
+            self.__resource_locks[resource_id].convert(lock, new_type)
+            self.__record_escalated_access(transaction_id, resource_id, resource_id, type)
+
+            self.__log_writer.console_log("Transaction", transaction_id, "upgraded", LOCK_TYPE_NAMES[old_type], "for resource", resource_id, "to", LOCK_TYPE_NAMES[new_type])
+            return
+
+        # New request is queued behind every waiter it is incompatible with, so those waiters conflict with it as well
+        waiter_ids = self.__get_incompatible_waiter_ids(type, self.__resource_waiters.get(resource_id, ()))
+
+        if (len(waiter_ids) == 0 and not self.__is_available(transaction_id, resource_id, type)):
+            self.__deescalate_conflicts(transaction_id, resource_id, type)
+
+        if (len(waiter_ids) > 0 or not self.__is_available(transaction_id, resource_id, type)):
+            raise LockSharingException(
+                self.__get_conflict_lock_holders(transaction_id, resource_id, waiter_ids),
+                resource_id,
+                type
+            )
+
+        self.__add_lock(Lock(type, transaction_id, resource_id))
+
+        self.__log_writer.console_log("Transaction", transaction_id, "acquired", LOCK_TYPE_NAMES[type], "for resource", resource_id)
+
+    def add_lock(self, transaction_id: str, resource_id: str, type: LockType):
+        # ACQUIRE LOCK TYPE ON RESOURCE AFTER INTENTION LOCKS ON ALL ITS ANCESTORS, FROM THE ROOT DOWN
+        # Nothing is acquired below an ancestor whose lock already covers the whole subtree
+        lock = self.__get_lock(transaction_id, resource_id)
+
+        if (lock is not None and is_covering(lock.get_type(), type)):
+            self.__record_escalated_access(transaction_id, resource_id, resource_id, type)
+            return
+
+        covering_lock = self.__get_covering_ancestor_lock(transaction_id, resource_id, type)
+
+        if (covering_lock is not None):
+            self.__record_escalated_access(transaction_id, covering_lock.get_resource_id(), resource_id, type)
+            return
+
+        intention_type = INTENTION_LOCK_TYPES[type]
+        ancestor_ids = get_resource_path(resource_id)[:-1]
+
+        for ancestor_id in ancestor_ids:
+            self.__acquire_resource_lock(transaction_id, ancestor_id, intention_type)
+
+        self.__acquire_resource_lock(transaction_id, resource_id, type)
+
+        if (self.__escalation_threshold is not None):
+            # New locks were added on every level, so each ancestor may now be over the threshold
+            for ancestor_id in reversed(ancestor_ids):
+                if (self.__escalate(transaction_id, ancestor_id)):
+                    break
+
+    def __escalate(self, transaction_id: str, resource_id: str) -> bool:
+        # REPLACE LOCKS OF TRANSACTION UNDER RESOURCE WITH ONE LOCK ON RESOURCE IF IT HOLDS TOO MANY OF THEM
+        child_lock_ids = self.__child_lock_ids.get(transaction_id, {}).get(resource_id, ())
+
+        if (len(child_lock_ids) <= self.__escalation_threshold or resource_id in self.__deescalated_resource_ids.get(transaction_id, ())):
+            return False
+
+        prefix = resource_id + RESOURCE_SEPARATOR
+        fine_locks = [lock for fine_id, lock in self.__transaction_locks[transaction_id].items() if (fine_id.startswith(prefix))]
+        is_reading = all(lock.get_type() in (LockType.SHARE, LockType.INTENTION_SHARE) for lock in fine_locks)
+
+        lock = self.__locks[(transaction_id, resource_id)]
+        old_type = lock.get_type()
+        new_type = get_combined_type(old_type, LockType.SHARE if is_reading else LockType.EXCLUSIVE)
+
+        # Other transactions hold conflicting locks inside the subtree, fine-grained locks are kept
+        if (not self.__is_available(transaction_id, resource_id, new_type)):
+            return False
+
+        self.__resource_locks[resource_id].convert(lock, new_type)
+        self.__refresh_waits(resource_id)
+
+        for fine_lock in fine_locks:
+            self.__remove_lock(fine_lock)
+
+        escalated_locks = self.__escalated_locks.setdefault(transaction_id, {})
+        escalated_lock = escalated_locks.get(resource_id)
+
+        if (escalated_lock is None):
+            escalated_lock = EscalatedLock(resource_id, old_type, {})
+            escalated_locks[resource_id] = escalated_lock
+
+        for fine_lock in fine_locks:
+            escalated_lock.add_access(fine_lock.get_resource_id(), fine_lock.get_type())
+
+        # Escalated locks inside the subtree are replaced as well, their fine-grained locks move to this one
+        for escalated_id in [escalated_id for escalated_id in escalated_locks if (escalated_id.startswith(prefix))]:
+            escalated_lock.merge(escalated_locks.pop(escalated_id))
+
+        self.__escalation_statistics.add_escalation(fine_locks)
 
+        self.__log_writer.console_log("Transaction", transaction_id, "escalated", len(fine_locks), "locks under resource", resource_id, "to", LOCK_TYPE_NAMES[new_type])
         return True
 
-    def is_lock_exist(self, transaction_id: str, resource_id: str, type: LockType | None = None):
-        return self.__get_lock(transaction_id, resource_id, type) is not None
-    
+    def __record_escalated_access(self, transaction_id: str, escalated_id: str, resource_id: str, type: LockType):
+        # REMEMBER ACCESS COVERED BY ESCALATED LOCK SO IT IS STILL LOCKED AFTER DE-ESCALATION
+        escalated_lock = self.__escalated_locks.get(transaction_id, {}).get(escalated_id)
+
+        if (escalated_lock is not None):
+            escalated_lock.add_access(resource_id, type)
+
+    def __deescalate_conflicts(self, transaction_id: str, resource_id: str, type: LockType):
+        # DE-ESCALATE LOCKS ON RESOURCE WHEN THEY ARE THE ONLY REASON TYPE CAN NOT BE GRANTED
+        resource_locks = self.__resource_locks.get(resource_id)
+
+        if (self.__escalation_threshold is None or resource_locks is None):
+            return
+
+        escalated_holder_ids: list[str] = []
+
+        for holder_id in resource_locks.get_holder_ids():
+            if (holder_id == transaction_id or is_compatible(type, resource_locks.get_lock(holder_id).get_type())):
+                continue
+
+            escalated_lock = self.__escalated_locks.get(holder_id, {}).get(resource_id)
+
+            # Conflict that escalation did not cause stays, de-escalating would not grant the request
+            if (escalated_lock is None or not is_compatible(type, escalated_lock.get_restored_type())):
+                return
+
+            escalated_holder_ids.append(holder_id)
+
+        for holder_id in escalated_holder_ids:
+            self.__deescalate(holder_id, resource_id)
+
+    def __deescalate(self, transaction_id: str, resource_id: str):
+        # PUT BACK FINE-GRAINED LOCKS OF ESCALATED LOCK AND WEAKEN IT TO WHAT THEY NEED
+        # Fine-grained locks were compatible with every lock granted while the coarse lock was held, so no check is needed
+        escalated_lock = self.__escalated_locks[transaction_id].pop(resource_id)
+        lock = self.__locks[(transaction_id, resource_id)]
+        old_type = lock.get_type()
+        depth = len(get_resource_path(resource_id))
+
+        self.__resource_locks[resource_id].downgrade(lock, escalated_lock.get_restored_type())
+
+        for fine_id, fine_type in escalated_lock.get_fine_lock_types().items():
+            fine_path = get_resource_path(fine_id)
+
+            for ancestor_id in fine_path[depth:-1]:
+                self.__merge_lock(transaction_id, ancestor_id, INTENTION_LOCK_TYPES[fine_type])
+
+            self.__merge_lock(transaction_id, fine_id, fine_type)
+            self.__refresh_waits(fine_id)
+
+        self.__deescalated_resource_ids.setdefault(transaction_id, set()).add(resource_id)
+        self.__escalation_statistics.add_deescalation()
+        self.__refresh_waits(resource_id)
+
+        self.__log_writer.console_log(
+            "Transaction", transaction_id,
+            "de-escalated", LOCK_TYPE_NAMES[old_type],
+            "for resource", resource_id,
+            "back to", len(escalated_lock.get_fine_lock_types()), "locks"
+        )
+
     def add_share_lock(self, transaction_id: str, resource_id: str):
         # ACQUIRE SHARE-LOCK OF CERTAIN RESOURCE
-        if (self.__get_lock(transaction_id, resource_id) is not None):
+        if (self.is_lock_exist(transaction_id, resource_id, LockType.SHARE)):
             raise LockAlreadyExistException
-        
-        if (not self.__is_sharing_available(transaction_id, resource_id)):
-            raise LockSharingException(self.__get_conflict_lock_holders(transaction_id, resource_id))
-        
-        lock = Lock(LockType.SHARE, transaction_id, resource_id)
 
-        self.__initialize_list_if_not_exist(transaction_id, resource_id)
-        
-        self.__resource_locks[resource_id].append(lock)
-        self.__transaction_locks[transaction_id].append(lock)
+        self.add_lock(transaction_id, resource_id, LockType.SHARE)
 
-        self.__log_writer.console_log("Transaction", transaction_id, "acquired share-lock for resource", resource_id)
+    def add_or_upgrade_to_exclusive_lock(self, transaction_id: str, resource_id: str):
+        self.add_lock(transaction_id, resource_id, LockType.EXCLUSIVE)
 
-    def __upgrade_lock(self, transaction_id: str, resource_id: str):
-        # UPGRADE LOCK TO EXCLUSIVE-LOCK
-        lock = self.__get_lock(transaction_id, resource_id)
+    def wait_for_lock(self, transaction_id: str, resource_id: str, type: LockType, priority: int | None = None):
+        # PUT LOCK REQUEST IN WAIT QUEUE OF RESOURCE, IT IS GRANTED WHEN CONFLICTING LOCKS ARE RELEASED
+        # Lower priority goes first, request without priority goes behind every other request
+        if (transaction_id in self.__transaction_waits):
+            raise LockAlreadyExistException("Transaction is already waiting for a lock")
 
-        if (lock is None):
-            raise LockNotFoundException()
-        
-        if (not self.__is_exclusive_available(transaction_id, resource_id)):
-            raise LockSharingException(self.__get_conflict_lock_holders(transaction_id, resource_id))
-        
-        lock.upgrade()
+        request = Lock(type, transaction_id, resource_id)
+        waiters = self.__resource_waiters.get(resource_id)
 
-        self.__log_writer.console_log("Transaction", transaction_id, "upgraded share-lock for resource", resource_id, "to exclusive-lock")
+        if (waiters is None):
+            waiters = deque()
+            self.__resource_waiters[resource_id] = waiters
 
-    def add_or_upgrade_to_exclusive_lock(self, transaction_id: str, resource_id: str):
-        old_lock = self.__get_lock(transaction_id, resource_id)
+        if (self.__get_lock(transaction_id, resource_id) is not None):
+            # Upgrade request goes in front so waiters blocked by its share-lock are not waited on
+            waiters.appendleft(request)
+        else:
+            waiters.insert(self.__get_wait_position(waiters, priority), request)
 
-        if (old_lock is not None):
-            self.__upgrade_lock(transaction_id, resource_id)
+        self.__transaction_waits[transaction_id] = request
+        self.__wait_priorities[transaction_id] = priority
 
-        else:
+        self.__log_writer.console_log("Transaction", transaction_id, "is waiting for lock on resource", resource_id)
+
+        # Request may be queued in front of the waiters it conflicted with, then nothing blocks it anymore
+        self.__grant_waiters(resource_id)
+
+    def __get_wait_position(self, waiters: deque[Lock], priority: int | None) -> int:
+        # RETURN POSITION AFTER QUEUED UPGRADES AND REQUESTS WITH NOT HIGHER PRIORITY
+        if (priority is None):
+            return len(waiters)
+
+        for index, waiter in enumerate(waiters):
+            waiter_id = waiter.get_transaction_id()
+
+            if (self.__get_lock(waiter_id, waiter.get_resource_id()) is not None):
+                continue
+
+            waiter_priority = self.__wait_priorities[waiter_id]
+
+            if (waiter_priority is None or waiter_priority > priority):
+                return index
+
+        return len(waiters)
+
+    def __refresh_waits(self, resource_id: str):
+        # RECOMPUTE WAITS-FOR EDGES OF EVERY WAITER OF RESOURCE AFTER ITS HOLDERS OR QUEUE CHANGED
+        # Waiter waits for incompatible holders and for incompatible requests queued in front of it
+        if (self.__waits_for_graph is None):
+            return
+
+        resource_locks = self.__resource_locks.get(resource_id)
+        waiters = self.__resource_waiters.get(resource_id, deque())
+
+        for index, request in enumerate(waiters):
+            transaction_id = request.get_transaction_id()
+            type = self.__get_request_type(request)
+            blocker_ids: list[str] = []
 
-            if (not self.__is_exclusive_available(transaction_id, resource_id)):
-                raise LockSharingException(self.__get_conflict_lock_holders(transaction_id, resource_id))
-                  
-            lock = Lock(LockType.EXCLUSIVE, transaction_id, resource_id)
+            if (resource_locks is not None):
+                for holder_id in resource_locks.get_holder_ids():
+                    if (holder_id != transaction_id and not is_compatible(type, resource_locks.get_lock(holder_id).get_type())):
+                        blocker_ids.append(holder_id)
 
-            self.__initialize_list_if_not_exist(transaction_id, resource_id)
+            blocker_ids.extend(self.__get_incompatible_waiter_ids(type, islice(waiters, index)))
+            self.__waits_for_graph.set_waits(transaction_id, blocker_ids)
 
-            self.__resource_locks[resource_id].append(lock)
-            self.__transaction_locks[transaction_id].append(lock)
+    def __grant_waiters(self, resource_id: str):
+        # GRANT EVERY WAITING REQUEST THAT IS COMPATIBLE WITH HOLDERS AND WITH REQUESTS STILL WAITING IN FRONT OF IT
+        # Request never overtakes one it conflicts with, so no waiter starves behind later compatible requests
+        waiters = self.__resource_waiters.get(resource_id)
 
-            self.__log_writer.console_log("Transaction", transaction_id, "acquired exclusive-lock for resource", resource_id)
+        if (waiters is None):
+            return
+
+        blocked_waiters: list[Lock] = []
+
+        for request in list(waiters):
+            transaction_id = request.get_transaction_id()
+            lock = self.__get_lock(transaction_id, resource_id)
+            type = self.__get_request_type(request)
+
+            if (len(self.__get_incompatible_waiter_ids(type, blocked_waiters)) > 0):
+                blocked_waiters.append(request)
+                continue
+
+            if (not self.__is_available(transaction_id, resource_id, type)):
+                self.__deescalate_conflicts(transaction_id, resource_id, type)
+
+                if (not self.__is_available(transaction_id, resource_id, type)):
+                    blocked_waiters.append(request)
+                    continue
+
+            waiters.remove(request)
+            self.__transaction_waits.pop(transaction_id)
+            self.__wait_priorities.pop(transaction_id)
+            self.__granted_transaction_ids[transaction_id] = None
+
+            if (self.__waits_for_graph is not None):
+                self.__waits_for_graph.remove_waits(transaction_id)
+
+            if (lock is not None):
+                self.__resource_locks[resource_id].convert(lock, type)
+                self.__log_writer.console_log("Transaction", transaction_id, "was granted upgrade to", LOCK_TYPE_NAMES[type], "for resource", resource_id)
+
+            else:
+                self.__add_lock(request)
+                self.__log_writer.console_log("Transaction", transaction_id, "was granted", LOCK_TYPE_NAMES[type], "for resource", resource_id)
+
+        if (len(waiters) == 0):
+            self.__resource_waiters.pop(resource_id)
+
+        self.__refresh_waits(resource_id)
+
+    def __cancel_wait(self, transaction_id: str) -> str | None:
+        # REMOVE WAITING REQUEST OF TRANSACTION AND RETURN THE RESOURCE IT WAS WAITING ON
+        self.__granted_transaction_ids.pop(transaction_id, None)
+        request = self.__transaction_waits.pop(transaction_id, None)
+
+        if (request is None):
+            return None
+
+        self.__wait_priorities.pop(transaction_id)
+        resource_id = request.get_resource_id()
+        waiters = self.__resource_waiters[resource_id]
+        waiters.remove(request)
+
+        if (len(waiters) == 0):
+            self.__resource_waiters.pop(resource_id)
+
+        return resource_id
+
+    def pop_granted_transaction_id(self) -> str | None:
+        # RETURN TRANSACTION THAT WAS GRANTED ITS WAITING LOCK EARLIEST AND FORGET IT
+        if (len(self.__granted_transaction_ids) == 0):
+            return None
+
+        transaction_id = next(iter(self.__granted_transaction_ids))
+        self.__granted_transaction_ids.pop(transaction_id)
+        return transaction_id
+
+    def is_waiting(self, transaction_id: str) -> bool:
+        return transaction_id in self.__transaction_waits
+
+    def get_lock_count(self, transaction_id: str) -> int:
+        return len(self.__transaction_locks.get(transaction_id, ()))
+
+    def get_escalation_statistics(self) -> EscalationStatistics:
+        return self.__escalation_statistics
+
+    def find_new_deadlock(self) -> list[str] | None:
+        # RETURN TRANSACTIONS OF WAITS-FOR CYCLE FORMED BY WAITS ADDED SINCE LAST CHECK, OR NONE
+        if (self.__waits_for_graph is None):
+            return None
+
+        return self.__waits_for_graph.find_new_cycle()
+
+    def find_any_deadlock(self, budget: int | None = None) -> list[str] | None:
+        # RETURN TRANSACTIONS OF ANY WAITS-FOR CYCLE, OR NONE
+        if (self.__waits_for_graph is None):
+            return None
+
+        return self.__waits_for_graph.find_any_cycle(budget)
 
     def unlock_all(self, transaction_id: str):
         # UNLOCK ALL LOCKS HOLD BY TRANSACTION BY CERTAIN ID
-        locks = self.__transaction_locks.pop(transaction_id, [])
+        locks = list(self.__transaction_locks.pop(transaction_id, {}).values())
+        waited_resource_id = self.__cancel_wait(transaction_id)
+
+        self.__child_lock_ids.pop(transaction_id, None)
+        self.__escalated_locks.pop(transaction_id, None)
+        self.__deescalated_resource_ids.pop(transaction_id, None)
+
+        if (self.__waits_for_graph is not None):
+            self.__waits_for_graph.remove_transaction(transaction_id)
 
         self.__log_writer.console_log_separator()
         self.__log_writer.console_log("[ Releasing all locks from transaction", transaction_id, "]")
 
-        lock_string_map = {
-            LockType.EXCLUSIVE: "exclusive-lock",
-            LockType.SHARE: "share-lock"
-        }
-
         for lock in locks:
             resource_id = lock.get_resource_id()
-            resource_lock_list = self.__resource_locks.get(resource_id)
-            if (resource_lock_list is not None):
-                self.__resource_locks[resource_id].remove(lock)
-                lock_string = lock_string_map[lock.get_type()]
-                self.__log_writer.console_log(
-                    "Transaction", transaction_id, 
-                    "released", 
-                    lock_string, 
-                    "on resource", 
-                    resource_id
-                )
-                if (len(self.__resource_locks[resource_id]) == 0):
-                    self.__resource_locks.pop(resource_id)
+            resource_locks = self.__resource_locks[resource_id]
 
-        self.__log_writer.console_log_separator()
+            self.__locks.pop((transaction_id, resource_id))
+            resource_locks.remove(lock)
+
+            lock_string = LOCK_TYPE_NAMES[lock.get_type()]
+            self.__log_writer.console_log(
+                "Transaction", transaction_id, 
+                "released", 
+                lock_string, 
+                "on resource", 
+                resource_id
+            )
+
+            if (resource_locks.is_empty()):
+                self.__resource_locks.pop(resource_id)
 
+        # Only waiters of released resources can become grantable
+        # Resource the transaction was waiting on may unblock requests that were queued behind it
+        for lock in locks:
+            self.__grant_waiters(lock.get_resource_id())
+
+        if (waited_resource_id is not None):
+            self.__grant_waiters(waited_resource_id)
+
+        self.__log_writer.console_log_separator()
@@ -1,20 +1,63 @@
 from cores.InstructionReader import InstructionReader, InstructionLine, InstructionType
 from cores.Instruction import Instruction
-from twophase.instructions import ReadInstructionWithLock, WriteInstructionWithLock, CommitInstructionWithLock
+from twophase.instructions import ReadInstructionWithLock, WriteInstructionWithLock, CommitInstructionWithLock, UpdateInstructionWithLock
 from cores.exceptions import InvalidInstructionLineException
 from twophase.LockManager import LockManager
 from twophase.TwoPhaseResourceHandler import TwoPhaseResourceHandler
 
 class TwoPhaseInstructionReader(InstructionReader):
-    def __init__(self, file_path: str, lock_manager: LockManager, resource_handler: TwoPhaseResourceHandler) -> None:
-        super().__init__(file_path)
+    def __init__(
+            self,
+            file_path: str,
+            lock_manager: LockManager,
+            resource_handler: TwoPhaseResourceHandler,
+            bulk: bool = False,
+            detect_update_intent: bool = False
+        ) -> None:
+
+        # detect_update_intent reads the schedule once beforehand, so reads of resources the same transaction writes get update-lock
+        super().__init__(file_path, bulk)
         self.__lock_manager = lock_manager
         self.__resource_handler = resource_handler
+        self.__update_intents = self.__find_update_intents(file_path, bulk) if detect_update_intent else None
+
+    def __find_update_intents(self, file_path: str, bulk: bool) -> set[tuple[str, str]]:
+        # RETURN (TRANSACTION ID, RESOURCE ID) OF EVERY WRITE IN THE SCHEDULE
+        update_intents: set[tuple[str, str]] = set()
+        source = self._open_source(file_path, bulk)
+
+        try:
+            while True:
+                instruction_line = source.next_line()
+
+                if (instruction_line.instruction_type == InstructionType.W):
+                    update_intents.add((instruction_line.transaction_id, instruction_line.resource_id))
+
+        except (EOFError, InvalidInstructionLineException):
+            # Invalid line is reported again when the schedule itself reaches it
+            pass
+
+        finally:
+            source.close()
+
+        return update_intents
 
     def _get_instruction_from_line(self, instruction_line: InstructionLine) -> Instruction:
         type = instruction_line.instruction_type
 
-        if (type == InstructionType.R):
+        if (type == InstructionType.R and self.__update_intents is not None
+                and (instruction_line.transaction_id, instruction_line.resource_id) in self.__update_intents):
+            type = InstructionType.U
+
+        if (type == InstructionType.U):
+            return UpdateInstructionWithLock(
+                instruction_line.transaction_id,
+                self.__lock_manager,
+                self.__resource_handler,
+                instruction_line.resource_id
+            )
+
+        elif (type == InstructionType.R):
             return ReadInstructionWithLock(
                 instruction_line.transaction_id,
                 self.__lock_manager,
@@ -34,7 +77,12 @@ class TwoPhaseInstructionReader(InstructionReader):
         elif (type == InstructionType.C):
             return CommitInstructionWithLock(
                 instruction_line.transaction_id,
-                self.__lock_manager
+                self.__lock_manager,
+                self.__resource_handler
             )
 
+        elif (type == InstructionType.A):
+            # Only multiversion engine keeps old values to read from
+            raise InvalidInstructionLineException("Read as of instruction is only supported by MVCC")
+
         raise InvalidInstructionLineException()
\ No newline at end of file
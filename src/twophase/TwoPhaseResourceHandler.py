@@ -1,11 +1,19 @@
 from cores.ResourceManager import ResourceManager
 from cores.LogWriter import LogWriter
+from durability.WriteAheadLog import WriteAheadLog
+from durability.Checkpoint import ResourceSnapshot
 
 class TwoPhaseResourceHandler:
-    def __init__(self) -> None:
+    def __init__(self, write_ahead_log: WriteAheadLog | None = None) -> None:
         self.__resource_manager: ResourceManager = ResourceManager()
         self.__log_writer = LogWriter("RESOURCE MANAGER")
 
+        # Resources are updated in place, so every write and every write-back on rollback is logged
+        self.__write_ahead_log = write_ahead_log
+
+        if (write_ahead_log is not None):
+            write_ahead_log.set_snapshot_source(self.get_checkpoint_snapshot)
+
         # History format for certain transaction id: 
         # dictionary with key: resource id and value: tuple of old value, new value
         self.__update_history: dict[str, dict[str, list[tuple[int, int]]]] = {}
@@ -18,6 +26,9 @@ class TwoPhaseResourceHandler:
     def write(self, transaction_id: str, resource_id: str, value: int) -> int:
         # UPDATE THE VALUE OF CERTAIN RESOURCE AND RETURN THE OLD VALUE
         old_value = self.__resource_manager.write(resource_id, value)
+
+        if (self.__write_ahead_log is not None):
+            self.__write_ahead_log.log_update(transaction_id, resource_id, old_value, value)
         
         transaction_history = self.__update_history.get(transaction_id)
 
@@ -47,6 +58,12 @@ class TwoPhaseResourceHandler:
                 self.__log_writer.console_log("Wrote back resource", resource_id, "from", current_value, "to", oldest_value)
                 self.__resource_manager.write(resource_id, oldest_value)
 
+                if (self.__write_ahead_log is not None):
+                    self.__write_ahead_log.log_update(transaction_id, resource_id, current_value, oldest_value)
+
+            if (self.__write_ahead_log is not None):
+                self.__write_ahead_log.log_abort(transaction_id)
+
         else:
             self.__log_writer.console_log("Transaction", transaction_id, "has not updated any resource")
 
@@ -55,6 +72,20 @@ class TwoPhaseResourceHandler:
     def clear_update_history(self, transaction_id: str):
         self.__update_history.pop(transaction_id, [])
 
+    def commit(self, transaction_id: str) -> int | None:
+        # LOG COMMIT OF TRANSACTION AND FORGET ITS UPDATES, RETURN LSN OF COMMIT RECORD IF IT IS LOGGED
+        commit_lsn = None
+
+        if (self.__write_ahead_log is not None):
+            commit_lsn = self.__write_ahead_log.log_commit(transaction_id)
+
+        self.clear_update_history(transaction_id)
+        return commit_lsn
+
+    def get_checkpoint_snapshot(self) -> ResourceSnapshot:
+        # RETURN CURRENT VALUE OF EVERY RESOURCE, SINGLE VERSION RESOURCES HAVE TIMESTAMP 0
+        return {resource_id: (value, 0) for resource_id, value in self.__resource_manager.get_snapshot().items()}
+
     def print_snapshot(self):
         # PRINT ALL RESOURCE VALUE AT THIS MOMENT
         self.__resource_manager.print_snapshot()
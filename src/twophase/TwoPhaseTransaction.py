@@ -4,12 +4,19 @@ from cores.transactions import TransactionStatus
 class TwoPhaseTransaction(StaticTimestampTransaction):
     def __init__(self, id: str) -> None:
         super().__init__(id)
+        self.__abort_count = 0
 
-    def get_timestamp(self) -> float:
+    def get_timestamp(self) -> int:
         return self._get_timestamp()
 
     def is_waiting(self) -> bool:
         return self._get_status() == TransactionStatus.WAITING
     
     def wait(self):
-        self._set_status(TransactionStatus.WAITING)
\ No newline at end of file
+        self._set_status(TransactionStatus.WAITING)
+
+    def add_abort(self):
+        self.__abort_count += 1
+
+    def get_abort_count(self) -> int:
+        return self.__abort_count
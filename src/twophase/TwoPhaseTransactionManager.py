@@ -1,11 +1,17 @@
 from cores.TransactionManager import TransactionManager
+from cores.clocks import Clock
 from twophase.TwoPhaseInstructionReader import TwoPhaseInstructionReader
 from cores.Instruction import Instruction, InstructionType
 from twophase.LockManager import LockManager
 from twophase.TwoPhaseResourceHandler import TwoPhaseResourceHandler
 from collections import deque
 from twophase.TwoPhaseTransaction import TwoPhaseTransaction
+from cores.WaitQueue import WaitQueue
 from twophase.exceptions import LockSharingException
+from twophase.deadlocks import DeadlockPolicy
+from twophase.instructions import CommitInstructionWithLock
+from durability.WriteAheadLog import WriteAheadLog
+from durability.commits import DurableCommitQueue
 
 
 class TwoPhaseTransactionManager(TransactionManager):
@@ -16,29 +22,72 @@ class TwoPhaseTransactionManager(TransactionManager):
 
     # 2. Because of point number 1, it's impossible that instructions in wait-queue of certain transaction is out of order.
 
-    def __init__(self, file_path: str) -> None:
+    # 3. Waiting transaction is blocked on exactly one lock request, which is queued in lock manager on that resource. It only leaves wait-queue when lock manager grants that request
 
-        self.__lock_manager = LockManager()
-        self.__resource_handler = TwoPhaseResourceHandler()
-        instruction_reader = TwoPhaseInstructionReader(file_path, self.__lock_manager, self.__resource_handler)
+    # 4. Transaction whose commit is logged keeps its locks until the commit record is durable, and it is never aborted after that
 
-        super().__init__(instruction_reader)
+    # Deadlock victim is chosen by cost only among cycle members that started in this youngest share of the cycle's age span
+    SIMILAR_AGE_SHARE = 0.25
+
+    def __init__(
+            self, 
+            file_path: str, 
+            clock: Clock | None = None, 
+            bulk_read: bool = False,
+            deadlock_policy: DeadlockPolicy = DeadlockPolicy.WOUND_WAIT,
+            detection_interval: int = 0,
+            detection_budget: int | None = None,
+            escalation_threshold: int | None = None,
+            detect_update_intent: bool = False,
+            write_ahead_log: WriteAheadLog | None = None
+        ) -> None:
+
+        # detection_interval 0 checks for cycle whenever waits-for edges are added, otherwise whole graph is scanned every detection_interval waits
+        # detection_budget limits number of transactions visited by one periodic scan
+        # escalation_threshold is number of locks a transaction may hold under one resource before they become one lock
+        # detect_update_intent reads resources with update-lock when the same transaction writes them later
+        # write_ahead_log records every update and transaction end, caller closes it after the run
+        if (detection_interval < 0):
+            raise ValueError("Deadlock detection interval can not be negative")
+
+        self.__deadlock_policy = deadlock_policy
+        self.__detection_interval = detection_interval
+        self.__detection_budget = detection_budget
+        self.__wait_count_since_detection = 0
+
+        self.__escalation_threshold = escalation_threshold
+
+        self.__lock_manager = LockManager(
+            detect_deadlock=deadlock_policy == DeadlockPolicy.DETECT,
+            escalation_threshold=escalation_threshold
+        )
+        self.__resource_handler = TwoPhaseResourceHandler(write_ahead_log)
+        instruction_reader = TwoPhaseInstructionReader(
+            file_path,
+            self.__lock_manager,
+            self.__resource_handler,
+            bulk_read,
+            detect_update_intent
+        )
+
+        super().__init__(instruction_reader, clock)
 
         self.__transactions: dict[str, TwoPhaseTransaction] = {}
-        self.__wait_queue: deque[Instruction] = deque()
+        self.__wait_queue = WaitQueue()
         self.__rollback_queue: deque[list[Instruction]] = deque()
         self.__done_instruction: dict[str, list[Instruction]] = {}
-        self.__has_transaction_committed: bool = False
-
-    def __is_oldest(self, transaction_id: str, conflict_transaction_ids: list[str]):
-        # CHECK IF TRANSACTION IS THE OLDEST AMONG LOCK HOLDERS OF CERTAIN RESOURCE
-        transaction = self.__transactions[transaction_id]
-        for conflict_transaction_id in conflict_transaction_ids:
-            conflict_transaction = self.__transactions[conflict_transaction_id]
-            if (transaction.get_timestamp() > conflict_transaction.get_timestamp()):
-                return False
-            
-        return True
+        self.__durable_commits: DurableCommitQueue[CommitInstructionWithLock] = DurableCommitQueue(write_ahead_log)
+
+    def __get_younger_transaction_ids(self, transaction_id: str, conflict_transaction_ids: list[str]) -> list[str]:
+        # RETURN CONFLICTING TRANSACTIONS THAT ARE YOUNGER THAN TRANSACTION
+        # Transaction whose commit is logged can not be wounded, it only waits for its log record and then releases its locks
+        timestamp = self.__transactions[transaction_id].get_timestamp()
+
+        return [
+            conflict_transaction_id for conflict_transaction_id in conflict_transaction_ids
+            if (self.__transactions[conflict_transaction_id].get_timestamp() > timestamp
+                and not self.__transactions[conflict_transaction_id].is_committing())
+        ]
     
     def __add_to_done_list(self, instruction: Instruction) -> bool:
         # ADD INSTRUCTION TO DONE LIST FOR ROLLBACK PURPOSE
@@ -54,13 +103,31 @@ class TwoPhaseTransactionManager(TransactionManager):
     def __is_commit_instruction(self, instruction: Instruction) -> bool:
         return instruction.get_transaction_type() == InstructionType.C
     
-    def __handle_after_commit(self, instruction: Instruction) -> bool:
-        # CLEAR DATA OF TRANSACTION AFTER COMMIT IF NECESSARY
+    def __handle_after_commit(self, instruction: CommitInstructionWithLock):
+        # ACKNOWLEDGE LOGGED COMMIT RIGHT AWAY IF ITS RECORD IS ALREADY DURABLE, OTHERWISE WAIT FOR THE LOG
+        transaction_id = instruction.get_transaction_id()
+        commit_lsn = instruction.get_commit_lsn()
+        self.__transactions[transaction_id].start_commit()
+
+        if (self.__durable_commits.is_durable(commit_lsn)):
+            self.__acknowledge_commit(instruction)
+
+        else:
+            self._console_log("Transaction", transaction_id, "waits until its commit record is durable")
+            self.__durable_commits.append(commit_lsn, instruction)
+
+    def __acknowledge_commit(self, instruction: CommitInstructionWithLock):
+        # RELEASE LOCKS AND CLEAR DATA OF TRANSACTION WHOSE COMMIT RECORD IS DURABLE
         transaction_id = instruction.get_transaction_id()
-        self.__has_transaction_committed = True
+        instruction.acknowledge()
+        self.get_statistics().add_commit()
         self.__transactions[transaction_id].commit()
         self.__done_instruction.pop(transaction_id)
-        self.__resource_handler.clear_update_history(transaction_id)
+
+    def __acknowledge_durable_commits(self, force: bool = False):
+        # ACKNOWLEDGE EVERY COMMIT WHOSE RECORD IS DURABLE, FORCE FLUSHES THE LOG FIRST
+        for instruction in self.__durable_commits.pop_durable(force):
+            self.__acknowledge_commit(instruction)
 
     def __execute_instruction(self, instruction: Instruction):
         instruction.execute()
@@ -69,17 +136,9 @@ class TwoPhaseTransactionManager(TransactionManager):
         if (self.__is_commit_instruction(instruction)):
             self.__handle_after_commit(instruction)
 
-    def __pop_instructions_from_queue(self, transaction_id: str):
+    def __pop_instructions_from_queue(self, transaction_id: str) -> list[Instruction]:
         # REMOVE ALL INSTRUCTIONS OF TRANSACTION_ID FROM WAIT QUEUE AND RETURN IT
-        instructions = []
-        for instruction in self.__wait_queue:
-            if (instruction.get_transaction_id() == transaction_id):
-                instructions.append(instruction)
-        
-        for instruction in instructions:
-            self.__wait_queue.remove(instruction)
-
-        return instructions
+        return self.__wait_queue.pop_transaction(transaction_id)
 
     def __abort(self, transaction_id: str):
         # ADD TRANSACTION TO ROLLBACK-QUEUE
@@ -87,8 +146,16 @@ class TwoPhaseTransactionManager(TransactionManager):
         waiting_instructions = self.__pop_instructions_from_queue(transaction_id)
         done_instructions.extend(waiting_instructions)
         self._console_log("Transaction", transaction_id, "is aborting")
+        self.get_statistics().add_abort()
+        self.__transactions[transaction_id].add_abort()
         self.__resource_handler.rollback(transaction_id)
         self.__lock_manager.unlock_all(transaction_id)
+
+        if (len(done_instructions) == 0):
+            # Transaction was granted a lock but has not executed anything yet, so it just continues
+            self.__transactions[transaction_id].reset_status()
+            return
+
         self.__rollback_queue.append(done_instructions)
         self.__transactions[transaction_id].roll_back()
 
@@ -101,21 +168,109 @@ class TwoPhaseTransactionManager(TransactionManager):
         # ROLLBACK TRANSACTION THAT IS IN FRONT OF THE ROLLBACK-QUEUE
         instructions = self.__rollback_queue.popleft()
         transaction_id = instructions[0].get_transaction_id()
+
+        # Instructions received while transaction was waiting for rollback are replayed after the rollback ones
+        instructions.extend(self.__pop_instructions_from_queue(transaction_id))
         self.__transactions[transaction_id].reset_status()
         self._console_log("Trying to rollback transaction", instructions[0].get_transaction_id())
+        self.get_statistics().add_restart()
         return instructions
 
     def __wait(self, instruction: Instruction):
         # ADD INSTRUCTION TO WAIT-QUEUE
         self.__wait_queue.append(instruction)
+        self.get_statistics().record_wait_queue_size(len(self.__wait_queue))
         self.__transactions[instruction.get_transaction_id()].wait()
         self._console_log("Instruction", instruction, "entered wait-queue")
 
-    def __unwait(self) -> Instruction:
-        # TRY TO EXECUTE INSTRUCTION THAT IS IN FRONT OF THE WAIT-QUEUE
-        instruction = self.__wait_queue.popleft()
-        self._console_log("Instruction", instruction, "leave wait-queue")
-        return instruction
+    def __wait_for_lock(self, instruction: Instruction, exception: LockSharingException):
+        # QUEUE LOCK REQUEST ON THE RESOURCE AND ADD INSTRUCTION TO WAIT-QUEUE
+        # Requests are queued by transaction age, so a restarted transaction keeps its place ahead of younger ones
+        self.__lock_manager.wait_for_lock(
+            instruction.get_transaction_id(),
+            exception.get_resource_id(),
+            exception.get_lock_type(),
+            self.__transactions[instruction.get_transaction_id()].get_timestamp()
+        )
+        self.__wait(instruction)
+
+        if (self.__deadlock_policy == DeadlockPolicy.DETECT):
+            self.__wait_count_since_detection += 1
+            self.__detect_deadlock()
+
+    def __get_victim_cost(self, transaction_id: str) -> tuple[int, int, int, int]:
+        # COST OF ABORTING TRANSACTION: TIMES IT WAS ABORTED, DONE INSTRUCTIONS, THEN AGE, THEN NUMBER OF HELD LOCKS
+        # Restarted victims go last so two transactions can not keep aborting each other, negative timestamp makes younger transaction cheaper
+        transaction = self.__transactions[transaction_id]
+        return (
+            transaction.get_abort_count(),
+            len(self.__done_instruction.get(transaction_id, ())),
+            -transaction.get_timestamp(),
+            self.__lock_manager.get_lock_count(transaction_id)
+        )
+
+    def __abort_deadlock_victim(self, cycle: list[str]):
+        # ABORT THE CHEAPEST OF THE YOUNGEST TRANSACTIONS OF WAITS-FOR CYCLE
+        # Oldest transaction is never the victim and keeps its timestamp when restarted, so no transaction starves
+        timestamps = {transaction_id: self.__transactions[transaction_id].get_timestamp() for transaction_id in cycle}
+        oldest_id = min(cycle, key=timestamps.get)
+        youngest_timestamp = max(timestamps.values())
+        similar_age_timestamp = youngest_timestamp - (youngest_timestamp - timestamps[oldest_id]) * self.SIMILAR_AGE_SHARE
+
+        candidate_ids = [
+            transaction_id for transaction_id in cycle
+            if (transaction_id != oldest_id and timestamps[transaction_id] >= similar_age_timestamp)
+        ]
+        victim_id = min(candidate_ids, key=self.__get_victim_cost)
+        self._console_log("Deadlock detected between transactions", ", ".join(cycle) + ",", "choosing", victim_id, "as victim")
+        self.get_statistics().add_deadlock()
+        self.__abort(victim_id)
+
+    def __detect_deadlock(self, force: bool = False) -> bool:
+        # FIND AND BREAK WAITS-FOR CYCLES, RETURN TRUE IF ANY TRANSACTION WAS ABORTED
+        # Force runs full scan without budget regardless of detection interval
+        is_aborted = False
+
+        if (self.__detection_interval == 0 and not force):
+            # Every new cycle goes through a waiter whose edges were added since last check
+            cycle = self.__lock_manager.find_new_deadlock()
+
+            while (cycle is not None):
+                self.__abort_deadlock_victim(cycle)
+                is_aborted = True
+                cycle = self.__lock_manager.find_new_deadlock()
+
+            return is_aborted
+
+        if (not force and self.__wait_count_since_detection < self.__detection_interval):
+            return is_aborted
+
+        self.__wait_count_since_detection = 0
+        budget = None if force else self.__detection_budget
+        cycle = self.__lock_manager.find_any_deadlock(budget)
+
+        while (cycle is not None):
+            self.__abort_deadlock_victim(cycle)
+            is_aborted = True
+            cycle = self.__lock_manager.find_any_deadlock(budget)
+
+        return is_aborted
+
+    def __process_deadlock(self, force: bool = False):
+        # BREAK DEADLOCKS AND RUN ROLLBACK AND GRANTED WAITERS UNTIL NO NEW CYCLE IS FOUND
+        # Releasing and granting locks also changes waits-for edges, so cycles are searched again after that
+        while (self.__detect_deadlock(force)):
+            self.__process_rollback()
+            self.__process_wait()
+
+    def __unwait(self, transaction_id: str) -> list[Instruction]:
+        # TAKE ALL INSTRUCTIONS OF TRANSACTION OUT OF WAIT-QUEUE
+        instructions = self.__pop_instructions_from_queue(transaction_id)
+
+        for instruction in instructions:
+            self._console_log("Instruction", instruction, "leave wait-queue")
+
+        return instructions
     
     def __is_in_queue(self, transaction_id):
         # CHECK IF TRANSACTION IS WAITING OR ROLLING BACK
@@ -129,8 +284,7 @@ class TwoPhaseTransactionManager(TransactionManager):
     def __process_single_instruction(
             self, 
             instruction: Instruction, 
-            process_post_rollback: bool = False, 
-            process_post_commit: bool = False
+            process_post_rollback: bool = False
         ):
         # EXECUTE INSTRUCTION AND HANDLE WAITING AND ROLLING BACK INSTRUCTION AFTER EXECUTION
         instruction_id = instruction.get_transaction_id()
@@ -142,44 +296,45 @@ class TwoPhaseTransactionManager(TransactionManager):
         while True:
             try:
                 self.__execute_instruction(instruction)
-                
-                if (process_post_rollback and len(self.__rollback_queue) > 0):
-                    self.__process_rollback()
-
-                if (process_post_commit and self.__has_transaction_committed):
-                    self.__process_wait()
-
                 break
 
 
             except LockSharingException as e:
-                transaction_ids = e.get_conflict_transaction_ids()
+                if (self.__deadlock_policy == DeadlockPolicy.DETECT):
+                    # Transaction always waits, deadlock is resolved by detection afterwards
+                    self.__wait_for_lock(instruction, e)
+                    break
+
+                # Wound every younger conflicting transaction and only wait for older ones
+                # so waiting transaction always waits for older transactions and wait can not form a cycle
+                transaction_ids = self.__get_younger_transaction_ids(instruction.get_transaction_id(), e.get_conflict_transaction_ids())
 
-                if (self.__is_oldest(instruction.get_transaction_id(), transaction_ids)):
+                if (len(transaction_ids) > 0):
                     self.__abort_all(transaction_ids)
                 
                 else:
-                    self.__wait(instruction)
+                    self.__wait_for_lock(instruction, e)
                     break
 
-    def __process_wait(self):
-        # EXECUTE ALL INSTRUCTION IN WAIT-QUEUE AND HANDLE ROLLBACK-QUEUE
-        while self.__has_transaction_committed:
-            self.__has_transaction_committed = False
-            first_waiting_instruction_occurrence: dict[str, bool] = {}
-
-            count = len(self.__wait_queue)
+        if (process_post_rollback and len(self.__rollback_queue) > 0):
+            # Rollback is also processed after waiting because waiting may abort deadlock victims
+            self.__process_rollback()
 
-            for _ in range(count):
-                instruction = self.__unwait()
-                transaction_id = instruction.get_transaction_id()
+    def __process_wait(self):
+        # RESUME TRANSACTIONS WHOSE WAITING LOCK REQUEST WAS GRANTED AND HANDLE ROLLBACK-QUEUE
+        # Only granted transactions are retried, other waiters stay untouched in wait-queue
+        transaction_id = self.__lock_manager.pop_granted_transaction_id()
 
-                if (not first_waiting_instruction_occurrence.get(transaction_id)):
-                    first_waiting_instruction_occurrence[transaction_id] = True
-                    self.__transactions[transaction_id].reset_status()
+        while (transaction_id is not None):
+            instructions = self.__unwait(transaction_id)
+            self.__transactions[transaction_id].reset_status()
 
+            # If transaction waits or aborts again, the rest of instructions go back to wait-queue in order
+            for instruction in instructions:
                 self.__process_single_instruction(instruction, process_post_rollback=True)
 
+            transaction_id = self.__lock_manager.pop_granted_transaction_id()
+
     def __process_rollback(self):
         # EXECUTE ALL ROLLBACK INSTRUCTIONS
         while(len(self.__rollback_queue) > 0):
@@ -198,10 +353,16 @@ class TwoPhaseTransactionManager(TransactionManager):
             
         self.__process_single_instruction(
             instruction, 
-            process_post_rollback=True,
-            process_post_commit=True
+            process_post_rollback=True
         )
 
+        # Group commit delay may have passed even if nothing was logged, acknowledged commits release locks to waiters
+        self.__acknowledge_durable_commits()
+        self.__process_wait()
+
+        if (self.__deadlock_policy == DeadlockPolicy.DETECT):
+            self.__process_deadlock()
+
     def _print_all_transactions_status(self):
 
         transactions = list(self.__transactions.values())
@@ -223,7 +384,27 @@ class TwoPhaseTransactionManager(TransactionManager):
         for instruction in self.__wait_queue:
             self._console_log("Instruction", instruction, "is in wait-queue")
 
+        if (self.__escalation_threshold is not None):
+            escalation_statistics = self.__lock_manager.get_escalation_statistics()
+
+            self._console_log(
+                "Lock escalation happened", escalation_statistics.get_escalation_count(), "times,",
+                "replacing", escalation_statistics.get_released_lock_count(), "locks",
+                "(about", escalation_statistics.get_released_lock_memory(), "bytes), and was undone",
+                escalation_statistics.get_deescalation_count(), "times"
+            )
+
         self.__resource_handler.print_snapshot()
 
     def _is_finish_or_stop(self) -> bool:
-        return True
\ No newline at end of file
+        # No more instruction will come, so buffered commits are forced to disk and their locks go to waiting transactions
+        while True:
+            self.__acknowledge_durable_commits(force=True)
+            self.__process_wait()
+
+            if (self.__deadlock_policy == DeadlockPolicy.DETECT):
+                # Periodic detection may not have scanned the last waits yet
+                self.__process_deadlock(force=True)
+
+            if (len(self.__durable_commits) == 0):
+                return True
\ No newline at end of file
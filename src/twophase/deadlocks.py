@@ -0,0 +1,156 @@
+from enum import Enum
+
+class DeadlockPolicy(Enum):
+    # WOUND_WAIT: older transaction aborts younger conflicting transactions, so waits never form a cycle
+    # DETECT: transactions always wait, waits-for graph is checked for cycles and one victim is aborted per cycle
+    WOUND_WAIT = 0
+    DETECT = 1
+
+class WaitsForGraph:
+    # Directed graph where edge A -> B means transaction A waits for transaction B
+    # Dicts are used as ordered sets so cycle search is deterministic
+
+    def __init__(self) -> None:
+        self.__edges: dict[str, dict[str, None]] = {}
+        self.__reverse_edges: dict[str, dict[str, None]] = {}
+        self.__scan_position = 0
+
+        # Waiters that got new outgoing edges since they were last checked, any new cycle goes through one of them
+        self.__changed_waiter_ids: dict[str, None] = {}
+
+    def add_edges(self, waiter_id: str, holder_ids: list[str]):
+        # ADD EDGES FROM WAITER TO EVERY TRANSACTION IT WAITS FOR
+        edges = self.__edges.setdefault(waiter_id, {})
+
+        for holder_id in holder_ids:
+            if (holder_id == waiter_id or holder_id in edges):
+                continue
+
+            edges[holder_id] = None
+            self.__changed_waiter_ids[waiter_id] = None
+            self.__reverse_edges.setdefault(holder_id, {})[waiter_id] = None
+
+        if (len(edges) == 0):
+            self.__edges.pop(waiter_id)
+
+    def remove_waits(self, waiter_id: str):
+        # REMOVE ALL OUTGOING EDGES OF TRANSACTION THAT STOPPED WAITING
+        self.__changed_waiter_ids.pop(waiter_id, None)
+
+        for holder_id in self.__edges.pop(waiter_id, {}):
+            waiters = self.__reverse_edges[holder_id]
+            waiters.pop(waiter_id)
+
+            if (len(waiters) == 0):
+                self.__reverse_edges.pop(holder_id)
+
+    def set_waits(self, waiter_id: str, holder_ids: list[str]):
+        # REPLACE OUTGOING EDGES OF WAITER, ONLY EDGES THAT DID NOT EXIST BEFORE MARK IT AS CHANGED
+        old_holder_ids = self.__edges.get(waiter_id, {})
+
+        for holder_id in [holder_id for holder_id in old_holder_ids if (holder_id not in holder_ids)]:
+            self.__remove_edge(waiter_id, holder_id)
+
+        self.add_edges(waiter_id, holder_ids)
+
+    def __remove_edge(self, waiter_id: str, holder_id: str):
+        edges = self.__edges[waiter_id]
+        edges.pop(holder_id)
+
+        if (len(edges) == 0):
+            self.__edges.pop(waiter_id)
+
+        waiters = self.__reverse_edges[holder_id]
+        waiters.pop(waiter_id)
+
+        if (len(waiters) == 0):
+            self.__reverse_edges.pop(holder_id)
+
+    def remove_transaction(self, transaction_id: str):
+        # REMOVE TRANSACTION AND EVERY EDGE FROM OR TO IT
+        self.remove_waits(transaction_id)
+
+        for waiter_id in self.__reverse_edges.pop(transaction_id, {}):
+            edges = self.__edges[waiter_id]
+            edges.pop(transaction_id)
+
+            if (len(edges) == 0):
+                self.__edges.pop(waiter_id)
+
+    def find_new_cycle(self) -> list[str] | None:
+        # RETURN CYCLE CREATED BY EDGES ADDED SINCE LAST CALL, OR NONE
+        while (len(self.__changed_waiter_ids) > 0):
+            waiter_id = next(iter(self.__changed_waiter_ids))
+            cycle = self.find_cycle(waiter_id)
+
+            if (cycle is not None):
+                # Waiter stays marked because it may be in another cycle after this one is broken
+                return cycle
+
+            self.__changed_waiter_ids.pop(waiter_id)
+
+        return None
+
+    def get_waits(self, waiter_id: str) -> list[str]:
+        return list(self.__edges.get(waiter_id, ()))
+
+    def get_edge_count(self) -> int:
+        return sum(len(edges) for edges in self.__edges.values())
+
+    def find_cycle(self, start_id: str, budget: int | None = None) -> list[str] | None:
+        # RETURN TRANSACTIONS OF A CYCLE THAT GOES THROUGH START, OR NONE
+        # Budget limits number of visited transactions, search gives up when it runs out
+        path: list[str] = [start_id]
+        iterators = [iter(self.__edges.get(start_id, ()))]
+        visited: set[str] = {start_id}
+
+        while (iterators):
+            next_id = next(iterators[-1], None)
+
+            if (next_id is None):
+                iterators.pop()
+                path.pop()
+                continue
+
+            if (next_id == start_id):
+                return list(path)
+
+            if (next_id in visited):
+                continue
+
+            if (budget is not None and len(visited) >= budget):
+                return None
+
+            visited.add(next_id)
+            path.append(next_id)
+            iterators.append(iter(self.__edges.get(next_id, ())))
+
+        return None
+
+    def find_any_cycle(self, budget: int | None = None) -> list[str] | None:
+        # RETURN ANY CYCLE IN THE GRAPH, OR NONE
+        # Search starts where previous periodic scan stopped so every waiter is eventually checked under a budget
+        waiter_ids = list(self.__edges)
+
+        if (len(waiter_ids) == 0):
+            return None
+
+        remaining = budget
+
+        for offset in range(len(waiter_ids)):
+            index = (self.__scan_position + offset) % len(waiter_ids)
+            cycle = self.find_cycle(waiter_ids[index], remaining)
+
+            if (cycle is not None):
+                self.__scan_position = index
+                return cycle
+
+            if (remaining is not None):
+                remaining -= len(self.__edges.get(waiter_ids[index], ())) + 1
+
+                if (remaining <= 0):
+                    self.__scan_position = index + 1
+                    return None
+
+        self.__scan_position = 0
+        return None
@@ -0,0 +1,88 @@
+import sys
+from twophase.locks import Lock, LockType, INTENTION_LOCK_TYPES, get_combined_type
+
+class EscalatedLock:
+    # Coarse lock of one transaction that replaced its fine-grained locks under the resource
+    # Replaced lock types, and later accesses the coarse lock covered, are kept so it can be de-escalated
+
+    def __init__(self, resource_id: str, previous_type: LockType, fine_lock_types: dict[str, LockType]) -> None:
+        self.__resource_id = resource_id
+        self.__previous_type = previous_type
+        self.__fine_lock_types = fine_lock_types
+
+    def get_resource_id(self) -> str:
+        return self.__resource_id
+
+    def get_previous_type(self) -> LockType:
+        return self.__previous_type
+
+    def get_fine_lock_types(self) -> dict[str, LockType]:
+        return self.__fine_lock_types
+
+    def add_access(self, resource_id: str, type: LockType):
+        # REMEMBER LOCK TYPE THAT WOULD HAVE BEEN ACQUIRED ON RESOURCE WITHOUT THE COARSE LOCK
+        if (resource_id == self.__resource_id):
+            self.__previous_type = get_combined_type(self.__previous_type, type)
+            return
+
+        fine_type = self.__fine_lock_types.get(resource_id)
+        self.__fine_lock_types[resource_id] = type if fine_type is None else get_combined_type(fine_type, type)
+
+    def merge(self, escalated_lock: "EscalatedLock"):
+        # TAKE OVER FINE-GRAINED LOCKS OF ESCALATED LOCK ON A DESCENDANT THAT IS REPLACED BY THIS ONE
+        self.add_access(escalated_lock.get_resource_id(), escalated_lock.get_previous_type())
+
+        for resource_id, type in escalated_lock.get_fine_lock_types().items():
+            self.add_access(resource_id, type)
+
+    def get_restored_type(self) -> LockType:
+        # RETURN TYPE OF LOCK ON THE RESOURCE ONCE FINE-GRAINED LOCKS ARE BACK
+        restored_type = self.__previous_type
+
+        for type in self.__fine_lock_types.values():
+            restored_type = get_combined_type(restored_type, INTENTION_LOCK_TYPES[type])
+
+        return restored_type
+
+def get_lock_memory(lock: Lock) -> int:
+    # ESTIMATE BYTES TAKEN BY LOCK OBJECT AND ITS ATTRIBUTES
+    return sys.getsizeof(lock) + sys.getsizeof(vars(lock))
+
+class EscalationStatistics:
+    # Counters of lock escalation kept by lock manager
+
+    def __init__(self) -> None:
+        self.__escalation_count = 0
+        self.__deescalation_count = 0
+        self.__released_lock_count = 0
+        self.__released_lock_memory = 0
+
+    def add_escalation(self, released_locks: list[Lock]):
+        self.__escalation_count += 1
+        self.__released_lock_count += len(released_locks)
+        self.__released_lock_memory += sum(get_lock_memory(lock) for lock in released_locks)
+
+    def add_deescalation(self):
+        self.__deescalation_count += 1
+
+    def get_escalation_count(self) -> int:
+        return self.__escalation_count
+
+    def get_deescalation_count(self) -> int:
+        return self.__deescalation_count
+
+    def get_released_lock_count(self) -> int:
+        # NUMBER OF LOCK TABLE ENTRIES REPLACED BY COARSE LOCKS
+        return self.__released_lock_count
+
+    def get_released_lock_memory(self) -> int:
+        # ESTIMATED BYTES OF LOCK OBJECTS REPLACED BY COARSE LOCKS
+        return self.__released_lock_memory
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "escalations": self.__escalation_count,
+            "deescalations": self.__deescalation_count,
+            "escalated_locks": self.__released_lock_count,
+            "escalated_lock_memory": self.__released_lock_memory
+        }
@@ -1,3 +1,8 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from twophase.locks import LockType
+
 class LockUpgradeException(Exception):
     def __init__(self, message="Lock upgrade can only be done to share-lock"):
         super().__init__(message)
@@ -11,10 +16,26 @@ class LockNotFoundException(Exception):
         super().__init__(message)
 
 class LockSharingException(Exception):
-    def __init__(self, conflict_transaction_ids: list[str], message="Lock can not be shared"):
+    def __init__(
+            self, 
+            conflict_transaction_ids: list[str], 
+            resource_id: str | None = None, 
+            lock_type: "LockType | None" = None, 
+            message="Lock can not be shared"
+        ):
+
         self.__conflict_transaction_ids = conflict_transaction_ids
+        self.__resource_id = resource_id
+        self.__lock_type = lock_type
         super().__init__(message)
 
     def get_conflict_transaction_ids(self) -> list[str]:
         return self.__conflict_transaction_ids
+
+    def get_resource_id(self) -> str | None:
+        # RESOURCE THE FAILED LOCK REQUEST WAS MADE ON
+        return self.__resource_id
+
+    def get_lock_type(self) -> "LockType | None":
+        return self.__lock_type
     
\ No newline at end of file
@@ -56,8 +56,8 @@ class WriteInstructionWithLock(AccessInstructionWithLock):
         resource_id = self._get_resource_id()
         resource_handler = self._get_resource_handler()
 
-        if (not lock_manager.is_lock_exist(transaction_id, resource_id, LockType.EXCLUSIVE)):
-            lock_manager.add_or_upgrade_to_exclusive_lock(transaction_id, resource_id)
+        # Lock manager skips locks that are already held, but still sees accesses covered by an escalated lock
+        lock_manager.add_or_upgrade_to_exclusive_lock(transaction_id, resource_id)
         
         old_value = resource_handler.write(transaction_id, resource_id, self.__update_value)
 
@@ -82,27 +82,59 @@ class ReadInstructionWithLock(AccessInstructionWithLock):
         return f"R({self._get_resource_id()}) from transaction {self.get_transaction_id()}"
 
     def execute(self, **kwargs):
-        # GET SHARE LOCK IF ANY LOCK IS NOT HOLD AND READ THE RESOURCE
+        # GET SHARE LOCK IF NO HELD LOCK COVERS IT AND READ THE RESOURCE
         lock_manager = self._get_lock_manager()
         transaction_id = self.get_transaction_id()
         resource_id = self._get_resource_id()
         resource_handler = self._get_resource_handler()
 
-        if (not lock_manager.is_lock_exist(transaction_id, resource_id)):
-            lock_manager.add_share_lock(transaction_id, resource_id)
+        lock_manager.add_lock(transaction_id, resource_id, LockType.SHARE)
         
         value = resource_handler.read(resource_id)
 
         self._console_log("Transaction", transaction_id, "read resource", resource_id, "with value", value)
 
+class UpdateInstructionWithLock(AccessInstructionWithLock):
+    def __init__(
+            self, 
+            transaction_id: str, 
+            lock_manager: LockManager, 
+            resource_handler: TwoPhaseResourceHandler, 
+            resource_id: str
+        ) -> None:
+
+        super().__init__(transaction_id, lock_manager, resource_handler, resource_id)
+    
+    def get_transaction_type(self) -> InstructionType:
+        return InstructionType.U
+    
+    def __str__(self) -> str:
+        return f"U({self._get_resource_id()}) from transaction {self.get_transaction_id()}"
+
+    def execute(self, **kwargs):
+        # GET UPDATE LOCK IF NO HELD LOCK COVERS IT AND READ THE RESOURCE THAT WILL BE WRITTEN LATER
+        lock_manager = self._get_lock_manager()
+        transaction_id = self.get_transaction_id()
+        resource_id = self._get_resource_id()
+        resource_handler = self._get_resource_handler()
+
+        lock_manager.add_lock(transaction_id, resource_id, LockType.UPDATE)
+        
+        value = resource_handler.read(resource_id)
+
+        self._console_log("Transaction", transaction_id, "read resource", resource_id, "for update with value", value)
+
 class CommitInstructionWithLock(InstructionWithLock):
     def __init__(
             self, 
             transaction_id: str, 
-            lock_manager: LockManager
+            lock_manager: LockManager,
+            resource_handler: TwoPhaseResourceHandler
         ) -> None:
 
         super().__init__(transaction_id, lock_manager)
+        self.__resource_handler = resource_handler
+        self.__commit_lsn: int | None = None
 
     def get_transaction_type(self) -> InstructionType:
         return InstructionType.C
@@ -111,7 +143,15 @@ class CommitInstructionWithLock(InstructionWithLock):
         return f"commit from transaction {self.get_transaction_id()}"
     
     def execute(self, **kwargs):
-        # UNLOCK ALL LOCKS 
+        # LOG COMMIT, LOCKS ARE KEPT UNTIL TRANSACTION MANAGER ACKNOWLEDGES IT
+        self.__commit_lsn = self.__resource_handler.commit(self.get_transaction_id())
+
+    def get_commit_lsn(self) -> int | None:
+        # LSN OF COMMIT RECORD, NONE IF NOTHING IS LOGGED
+        return self.__commit_lsn
+
+    def acknowledge(self):
+        # UNLOCK ALL LOCKS ONCE COMMIT RECORD IS DURABLE
         lock_manager = self._get_lock_manager()
         transaction_id = self.get_transaction_id()
 
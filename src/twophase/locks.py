@@ -4,6 +4,87 @@ from twophase.exceptions import LockUpgradeException
 class LockType(Enum):
     SHARE = 0
     EXCLUSIVE = 1
+    INTENTION_SHARE = 2
+    INTENTION_EXCLUSIVE = 3
+    SHARE_INTENTION_EXCLUSIVE = 4
+    UPDATE = 5
+
+# Resource ids are hierarchical, "table.page.row" is a row inside page "table.page" inside table "table"
+RESOURCE_SEPARATOR = "."
+
+LOCK_TYPE_NAMES: dict[LockType, str] = {
+    LockType.SHARE: "share-lock",
+    LockType.EXCLUSIVE: "exclusive-lock",
+    LockType.INTENTION_SHARE: "intention-share-lock",
+    LockType.INTENTION_EXCLUSIVE: "intention-exclusive-lock",
+    LockType.SHARE_INTENTION_EXCLUSIVE: "share-intention-exclusive-lock",
+    LockType.UPDATE: "update-lock"
+}
+
+# Lock types that can be held by other transactions on the same resource at the same time
+# Update-lock is a share-lock that only one transaction can hold, so two readers that will write
+# the resource are serialized when they read instead of blocking each other when they upgrade
+LOCK_COMPATIBILITY: dict[LockType, frozenset[LockType]] = {
+    LockType.INTENTION_SHARE: frozenset({
+        LockType.INTENTION_SHARE, LockType.INTENTION_EXCLUSIVE, LockType.SHARE, LockType.SHARE_INTENTION_EXCLUSIVE, LockType.UPDATE
+    }),
+    LockType.INTENTION_EXCLUSIVE: frozenset({LockType.INTENTION_SHARE, LockType.INTENTION_EXCLUSIVE}),
+    LockType.SHARE: frozenset({LockType.INTENTION_SHARE, LockType.SHARE, LockType.UPDATE}),
+    LockType.UPDATE: frozenset({LockType.INTENTION_SHARE, LockType.SHARE}),
+    LockType.SHARE_INTENTION_EXCLUSIVE: frozenset({LockType.INTENTION_SHARE}),
+    LockType.EXCLUSIVE: frozenset()
+}
+
+# Lock types whose rights are included in the key lock type, ordered from weakest key to strongest
+LOCK_COVERAGE: dict[LockType, frozenset[LockType]] = {
+    LockType.INTENTION_SHARE: frozenset({LockType.INTENTION_SHARE}),
+    LockType.INTENTION_EXCLUSIVE: frozenset({LockType.INTENTION_SHARE, LockType.INTENTION_EXCLUSIVE}),
+    LockType.SHARE: frozenset({LockType.INTENTION_SHARE, LockType.SHARE}),
+    LockType.UPDATE: frozenset({LockType.INTENTION_SHARE, LockType.SHARE, LockType.UPDATE}),
+    LockType.SHARE_INTENTION_EXCLUSIVE: frozenset({
+        LockType.INTENTION_SHARE, LockType.INTENTION_EXCLUSIVE, LockType.SHARE, LockType.SHARE_INTENTION_EXCLUSIVE
+    }),
+    LockType.EXCLUSIVE: frozenset(LockType)
+}
+
+# Intention lock needed on every ancestor before lock type can be acquired on a resource
+# Update-lock takes intention-exclusive-lock right away so its later upgrade does not convert the ancestors
+INTENTION_LOCK_TYPES: dict[LockType, LockType] = {
+    LockType.INTENTION_SHARE: LockType.INTENTION_SHARE,
+    LockType.SHARE: LockType.INTENTION_SHARE,
+    LockType.UPDATE: LockType.INTENTION_EXCLUSIVE,
+    LockType.INTENTION_EXCLUSIVE: LockType.INTENTION_EXCLUSIVE,
+    LockType.SHARE_INTENTION_EXCLUSIVE: LockType.INTENTION_EXCLUSIVE,
+    LockType.EXCLUSIVE: LockType.INTENTION_EXCLUSIVE
+}
+
+# Lock type implicitly held on every descendant of resource locked with key lock type
+SUBTREE_LOCK_TYPES: dict[LockType, LockType] = {
+    LockType.SHARE: LockType.SHARE,
+    LockType.SHARE_INTENTION_EXCLUSIVE: LockType.SHARE,
+    LockType.UPDATE: LockType.UPDATE,
+    LockType.EXCLUSIVE: LockType.EXCLUSIVE
+}
+
+def is_compatible(type: LockType, other_type: LockType) -> bool:
+    return other_type in LOCK_COMPATIBILITY[type]
+
+def is_covering(type: LockType, other_type: LockType) -> bool:
+    # CHECK IF HOLDING TYPE ALREADY GIVES EVERY RIGHT OF OTHER_TYPE
+    return other_type in LOCK_COVERAGE[type]
+
+def get_combined_type(type: LockType, other_type: LockType) -> LockType:
+    # RETURN WEAKEST LOCK TYPE THAT COVERS BOTH TYPES, E.G. SHARE AND INTENTION-EXCLUSIVE BECOME SHARE-INTENTION-EXCLUSIVE
+    for combined_type in LOCK_COVERAGE:
+        if (is_covering(combined_type, type) and is_covering(combined_type, other_type)):
+            return combined_type
+
+    return LockType.EXCLUSIVE
+
+def get_resource_path(resource_id: str) -> list[str]:
+    # RETURN IDS FROM THE ROOT ANCESTOR DOWN TO THE RESOURCE ITSELF
+    parts = resource_id.split(RESOURCE_SEPARATOR)
+    return [RESOURCE_SEPARATOR.join(parts[:index + 1]) for index in range(len(parts))]
 
 class Lock:
     def __init__(self, type: LockType, transaction_id: str, resource_id: str) -> None:
@@ -13,15 +94,81 @@ class Lock:
 
     def get_type(self) -> LockType:
         return self.__type
-    
+
     def get_transaction_id(self) -> str:
         return self.__transaction_id
-    
+
     def get_resource_id(self) -> str:
         return self.__resourc_id
-    
-    def upgrade(self):
-        if (self.__type != LockType.SHARE):
-            raise LockUpgradeException()
-        
-        self.__type = LockType.EXCLUSIVE
\ No newline at end of file
+
+    def convert(self, type: LockType):
+        # CONVERT LOCK TO STRONGER TYPE THAT STILL COVERS THE CURRENT ONE
+        if (not is_covering(type, self.__type)):
+            raise LockUpgradeException("Lock can only be converted to type that covers it")
+
+        self.__type = type
+
+    def downgrade(self, type: LockType):
+        # CONVERT LOCK TO WEAKER TYPE THAT IS COVERED BY THE CURRENT ONE
+        if (not is_covering(self.__type, type)):
+            raise LockUpgradeException("Lock can only be downgraded to type that it covers")
+
+        self.__type = type
+
+class ResourceLocks:
+    # All locks on one resource, indexed by holder transaction id with holder count per lock type
+
+    def __init__(self) -> None:
+        self.__holders: dict[str, Lock] = {}
+        self.__type_counts: dict[LockType, int] = {type: 0 for type in LockType}
+
+    def get_lock(self, transaction_id: str) -> Lock | None:
+        return self.__holders.get(transaction_id)
+
+    def get_count(self, type: LockType) -> int:
+        return self.__type_counts[type]
+
+    def get_holder_count(self) -> int:
+        return len(self.__holders)
+
+    def get_holder_ids(self) -> list[str]:
+        return list(self.__holders)
+
+    def is_empty(self) -> bool:
+        return len(self.__holders) == 0
+
+    def is_available(self, transaction_id: str, type: LockType) -> bool:
+        # CHECK IF TYPE IS COMPATIBLE WITH LOCKS HELD BY OTHER TRANSACTIONS
+        # Only one count per lock type is checked so cost does not depend on number of holders
+        own_lock = self.__holders.get(transaction_id)
+
+        for held_type, count in self.__type_counts.items():
+            if (own_lock is not None and own_lock.get_type() == held_type):
+                count -= 1
+
+            if (count > 0 and not is_compatible(type, held_type)):
+                return False
+
+        return True
+
+    def add(self, lock: Lock):
+        self.__holders[lock.get_transaction_id()] = lock
+        self.__type_counts[lock.get_type()] += 1
+
+    def remove(self, lock: Lock):
+        self.__holders.pop(lock.get_transaction_id())
+        self.__type_counts[lock.get_type()] -= 1
+
+    def convert(self, lock: Lock, type: LockType):
+        # CONVERT LOCK TO STRONGER TYPE AND KEEP TYPE COUNTS IN SYNC
+        old_type = lock.get_type()
+        lock.convert(type)
+        self.__type_counts[old_type] -= 1
+        self.__type_counts[type] += 1
+
+    def downgrade(self, lock: Lock, type: LockType):
+        # CONVERT LOCK TO WEAKER TYPE AND KEEP TYPE COUNTS IN SYNC
+        old_type = lock.get_type()
+        lock.downgrade(type)
+        self.__type_counts[old_type] -= 1
+        self.__type_counts[type] += 1